@@ -2,57 +2,142 @@
 # Copyright (c) 2025, Mayank Mishra
 # **************************************************
 
-from .cute_inductor import CuteInductor
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .cutotune import (
     CutoTuneConfig,
     CutoTuneParameter,
+    FixedIterationsBenchmark,
+    LogSpacedBucket,
+    MultipleOfBucket,
+    NearestNeighbourPredictor,
+    NextPowerOf2Bucket,
+    SuccessiveHalvingBenchmark,
     cutotune,
+    flush_cutotune,
     get_cartesian_product_cutotune_configs,
     get_cutotune_cache,
+    get_cutotune_telemetry,
+    ignore_cutotune_budgets,
+    prune_stale_cutotune_cache_entries,
+    register_cutotune_swap_hook,
 )
 from .inductor import init_inductor
 from .kernel_backend import KernelBackend
-from .kernels import (
-    MoE_Torch,
-    MoE_Triton,
-    add_scalar_cute,
-    add_scalar_torch,
-    add_tensor_cute,
-    add_tensor_torch,
-    bmm_cute,
-    bmm_torch,
-    continuous_count_cute,
-    continuous_count_torch,
-    cross_entropy_cute,
-    cross_entropy_torch,
-    fused_linear_cross_entropy_cute,
-    fused_linear_cross_entropy_torch,
-    fused_residual_add_rmsnorm_cute,
-    fused_residual_add_rmsnorm_torch,
-    gemm_cute,
-    gemm_torch,
-    gru_cute,
-    gru_torch,
-    linear_cute,
-    linear_torch,
-    matrix_transpose_cute,
-    matrix_transpose_torch,
-    pack_sequence_cute,
-    pack_sequence_torch,
-    rmsnorm_cute,
-    rmsnorm_torch,
-    rnn_cute,
-    rnn_torch,
-    softmax_cute,
-    softmax_torch,
-    swiglu_cute,
-    swiglu_packed_cute,
-    swiglu_packed_torch,
-    swiglu_torch,
-    unpack_sequence_cute,
-    unpack_sequence_torch,
-)
 from .math import ceil_divide, divide_if_divisible, get_powers_of_2
-from .modules import GRU, RNN
-from .tensor import CuteTensor
+from .precompile import precompile
 from .utils import device_synchronize, get_ptx_from_triton_kernel, get_triton_num_warps, set_seed
+
+
+if TYPE_CHECKING:
+    from .cute_inductor import CuteInductor
+    from .kernels import (
+        MoE_Torch,
+        MoE_Triton,
+        add_scalar_cute,
+        add_scalar_torch,
+        add_tensor_cute,
+        add_tensor_torch,
+        bmm_cute,
+        bmm_torch,
+        continuous_count_cute,
+        continuous_count_torch,
+        cross_entropy_cute,
+        cross_entropy_torch,
+        fused_linear_cross_entropy_cute,
+        fused_linear_cross_entropy_torch,
+        fused_residual_add_rmsnorm_cute,
+        fused_residual_add_rmsnorm_torch,
+        gemm_cute,
+        gemm_torch,
+        gru_cute,
+        gru_torch,
+        linear_cute,
+        linear_torch,
+        matrix_transpose_cute,
+        matrix_transpose_torch,
+        pack_sequence_cute,
+        pack_sequence_torch,
+        rmsnorm_cute,
+        rmsnorm_torch,
+        rnn_cute,
+        rnn_torch,
+        softmax_cute,
+        softmax_torch,
+        swiglu_cute,
+        swiglu_packed_cute,
+        swiglu_packed_torch,
+        swiglu_torch,
+        unpack_sequence_cute,
+        unpack_sequence_torch,
+    )
+    from .modules import GRU, RNN, RMSNorm, TorchCompatibleRNN, patch_model
+    from .tensor import CuteTensor
+
+
+# the kernels (and everything that depends on them) are imported on first use, importing them defines every triton
+# kernel and registers every custom op which is slow and not needed by tools that only use a few ops. CuteTensor is
+# deferred since it imports torch._dynamo
+_LAZY_IMPORTS = {
+    "CuteInductor": ".cute_inductor",
+    "MoE_Torch": ".kernels",
+    "MoE_Triton": ".kernels",
+    "add_scalar_cute": ".kernels",
+    "add_scalar_torch": ".kernels",
+    "add_tensor_cute": ".kernels",
+    "add_tensor_torch": ".kernels",
+    "bmm_cute": ".kernels",
+    "bmm_torch": ".kernels",
+    "continuous_count_cute": ".kernels",
+    "continuous_count_torch": ".kernels",
+    "cross_entropy_cute": ".kernels",
+    "cross_entropy_torch": ".kernels",
+    "fused_linear_cross_entropy_cute": ".kernels",
+    "fused_linear_cross_entropy_torch": ".kernels",
+    "fused_residual_add_rmsnorm_cute": ".kernels",
+    "fused_residual_add_rmsnorm_torch": ".kernels",
+    "gemm_cute": ".kernels",
+    "gemm_torch": ".kernels",
+    "gru_cute": ".kernels",
+    "gru_torch": ".kernels",
+    "linear_cute": ".kernels",
+    "linear_torch": ".kernels",
+    "matrix_transpose_cute": ".kernels",
+    "matrix_transpose_torch": ".kernels",
+    "pack_sequence_cute": ".kernels",
+    "pack_sequence_torch": ".kernels",
+    "rmsnorm_cute": ".kernels",
+    "rmsnorm_torch": ".kernels",
+    "rnn_cute": ".kernels",
+    "rnn_torch": ".kernels",
+    "softmax_cute": ".kernels",
+    "softmax_torch": ".kernels",
+    "swiglu_cute": ".kernels",
+    "swiglu_packed_cute": ".kernels",
+    "swiglu_packed_torch": ".kernels",
+    "swiglu_torch": ".kernels",
+    "unpack_sequence_cute": ".kernels",
+    "unpack_sequence_torch": ".kernels",
+    "GRU": ".modules",
+    "RNN": ".modules",
+    "RMSNorm": ".modules",
+    "TorchCompatibleRNN": ".modules",
+    "patch_model": ".modules",
+    "CuteTensor": ".tensor",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name, None)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
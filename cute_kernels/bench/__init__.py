@@ -0,0 +1,8 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from . import ops
+from .registry import Benchmark, get_benchmarks, register_benchmark
+from .results import compare_results, load_results, save_results
+from .runner import run_benchmarks
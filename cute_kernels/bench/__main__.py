@@ -0,0 +1,113 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import json
+import sys
+from argparse import ArgumentParser, Namespace
+
+import torch
+from tabulate import tabulate
+
+from . import compare_results, get_benchmarks, load_results, run_benchmarks, save_results
+
+
+def _parse_grid_value(value: str) -> int | str:
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def _parse_grid(grid: list[str]) -> dict[str, list]:
+    result = {}
+    for item in grid:
+        symbol, values = item.split("=", 1)
+        result[symbol] = [_parse_grid_value(value) for value in values.split(",")]
+
+    return result
+
+
+def get_args() -> Namespace:
+    parser = ArgumentParser(description="benchmark the cute ops against their torch references")
+    parser.add_argument("benchmarks", type=str, nargs="*", help="benchmarks to run, all of them are run if not passed")
+    parser.add_argument("--list", action="store_true", help="list the registered benchmarks and exit")
+    parser.add_argument("--device", type=str, default=None, help="device to run on")
+    parser.add_argument(
+        "--grid",
+        type=str,
+        action="append",
+        default=[],
+        help="overrides the values of a symbol in the grids, e.g. --grid num_tokens=1024,2048 --grid dtype=bfloat16",
+    )
+    parser.add_argument("--warmup-iterations", type=int, default=5, help="untimed iterations before timing")
+    parser.add_argument("--benchmark-iterations", type=int, default=20, help="timed iterations")
+    parser.add_argument("--output", type=str, default=None, help="JSON file to write the results to")
+    parser.add_argument("--baseline", type=str, default=None, help="JSON file of results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="relative slowdown against the baseline that is a regression"
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = get_args()
+
+    if args.list:
+        for name, benchmark in get_benchmarks().items():
+            print(f"{name}: {benchmark.cute_function} vs {benchmark.torch_function}")
+        return
+
+    results = run_benchmarks(
+        names=None if len(args.benchmarks) == 0 else args.benchmarks,
+        device=None if args.device is None else torch.device(args.device),
+        grid=_parse_grid(args.grid),
+        warmup_iterations=args.warmup_iterations,
+        benchmark_iterations=args.benchmark_iterations,
+    )
+
+    table = [
+        [
+            result["benchmark"],
+            json.dumps(result["point"]),
+            result["implementation"],
+            result["median_ms"],
+            result["tflops"],
+            result["error"],
+        ]
+        for result in results
+    ]
+    print(tabulate(table, headers=["benchmark", "point", "implementation", "median ms", "TFLOPs", "error"]))
+
+    if args.output is not None:
+        save_results(args.output, results)
+
+    if args.baseline is not None:
+        comparisons = compare_results(results, load_results(args.baseline), threshold=args.threshold)
+        regressions = [comparison for comparison in comparisons if comparison["regression"]]
+
+        table = [
+            [
+                comparison["benchmark"],
+                json.dumps(comparison["point"]),
+                comparison["implementation"],
+                comparison["baseline_median_ms"],
+                comparison["median_ms"],
+                comparison["ratio"],
+                "REGRESSION" if comparison["regression"] else "",
+            ]
+            for comparison in comparisons
+        ]
+        print()
+        print(
+            tabulate(
+                table,
+                headers=["benchmark", "point", "implementation", "baseline median ms", "median ms", "ratio", ""],
+            )
+        )
+
+        if len(regressions) > 0:
+            print(f"{len(regressions)} regressions above {args.threshold:.0%} against {args.baseline}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
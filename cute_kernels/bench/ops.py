@@ -0,0 +1,299 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from functools import partial
+
+import torch
+
+from .registry import Benchmark, register_benchmark
+
+
+# the ops are referenced by their import path so that registering the benchmarks doesn't import the kernels
+
+_DTYPES = ["float32", "float16", "bfloat16"]
+_HALF_DTYPES = ["float16", "bfloat16"]
+
+
+def _get_cu_seqlens(point: dict, device: torch.device, dtype: torch.dtype) -> torch.Tensor:
+    # deterministic sequence lengths between S / 2 and S so that every implementation sees the same batch
+    B, S = point["batch_size"], point["sequence_length"]
+    seqlens = [S - (S // 2) * i // max(B - 1, 1) for i in range(B)]
+
+    return torch.tensor([0] + seqlens, device=device).cumsum(dim=0).to(dtype)
+
+
+def _get_packed_sequence(point: dict, device: torch.device) -> torch.Tensor:
+    num_tokens = _get_cu_seqlens(point, torch.device("cpu"), torch.int64)[-1].item()
+    return torch.randn(
+        num_tokens, point["num_heads"], point["head_dim"], dtype=getattr(torch, point["dtype"]), device=device
+    )
+
+
+def _get_padded_shape(point: dict, device: torch.device) -> tuple[int]:
+    return (point["batch_size"], point["sequence_length"], point["num_heads"], point["head_dim"])
+
+
+register_benchmark(
+    Benchmark(
+        name="add_scalar",
+        cute_function="cute_kernels.add_scalar_cute",
+        torch_function="cute_kernels.add_scalar_torch",
+        grid={"num_elements": [104857600], "dtype": _DTYPES},
+        arguments={"x": {"shape": ["num_elements"], "dtype": "dtype"}, "y": 0.42},
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="add_tensor",
+        cute_function="cute_kernels.add_tensor_cute",
+        torch_function="cute_kernels.add_tensor_torch",
+        grid={"num_elements": [104857600], "dtype": _DTYPES},
+        arguments={
+            "x": {"shape": ["num_elements"], "dtype": "dtype"},
+            "y": {"shape": ["num_elements"], "dtype": "dtype"},
+        },
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="bmm",
+        cute_function="cute_kernels.bmm_cute",
+        torch_function="cute_kernels.bmm_torch",
+        grid={"batch_size": [16], "M": [2048], "K": [2048], "N": [2048], "dtype": _DTYPES},
+        arguments={
+            "A": {"shape": ["batch_size", "M", "K"], "dtype": "dtype"},
+            "B": {"shape": ["batch_size", "K", "N"], "dtype": "dtype"},
+            "C": None,
+            "beta": 0,
+        },
+        flops=lambda point: 2 * point["batch_size"] * point["M"] * point["K"] * point["N"],
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="continuous_count",
+        cute_function="cute_kernels.continuous_count_cute",
+        torch_function="cute_kernels.continuous_count_torch",
+        grid={"num_elements": [16777216], "size": [64, 1024]},
+        arguments={"x": {"shape": ["num_elements"], "dtype": "int64", "high": "size"}, "size": "size"},
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="cross_entropy",
+        cute_function="cute_kernels.cross_entropy_cute",
+        torch_function="cute_kernels.cross_entropy_torch",
+        grid={"num_tokens": [8192], "vocab_size": [50304], "dtype": _DTYPES},
+        arguments={
+            "x": {"shape": ["num_tokens", "vocab_size"], "dtype": "dtype"},
+            "labels": {"shape": ["num_tokens"], "dtype": "int64", "high": "vocab_size"},
+        },
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="fused_linear_cross_entropy",
+        cute_function="cute_kernels.fused_linear_cross_entropy_cute",
+        torch_function="cute_kernels.fused_linear_cross_entropy_torch",
+        grid={"num_tokens": [8192], "hidden_size": [4096], "vocab_size": [50304], "dtype": _HALF_DTYPES},
+        arguments={
+            "x": {"shape": ["num_tokens", "hidden_size"], "dtype": "dtype"},
+            "weight": {"shape": ["vocab_size", "hidden_size"], "dtype": "dtype"},
+            "labels": {"shape": ["num_tokens"], "dtype": "int64", "high": "vocab_size"},
+        },
+        flops=lambda point: 2 * point["num_tokens"] * point["hidden_size"] * point["vocab_size"],
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="fused_residual_add_rmsnorm",
+        cute_function="cute_kernels.fused_residual_add_rmsnorm_cute",
+        torch_function="cute_kernels.fused_residual_add_rmsnorm_torch",
+        grid={"num_tokens": [16384], "hidden_size": [4096], "dtype": _DTYPES},
+        arguments={
+            "x": {"shape": ["num_tokens", "hidden_size"], "dtype": "dtype"},
+            "residual": {"shape": ["num_tokens", "hidden_size"], "dtype": "dtype"},
+            "weight": {"shape": ["hidden_size"], "dtype": "dtype"},
+            "eps": 1e-5,
+        },
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="gemm",
+        cute_function="cute_kernels.gemm_cute",
+        torch_function="cute_kernels.gemm_torch",
+        grid={"M": [4096], "K": [4096], "N": [4096], "dtype": _DTYPES},
+        arguments={
+            "A": {"shape": ["M", "K"], "dtype": "dtype"},
+            "B": {"shape": ["K", "N"], "dtype": "dtype"},
+            "C": None,
+            "beta": 0,
+        },
+        cute_arguments={
+            kernel_backend: {"kernel_backend": kernel_backend}
+            for kernel_backend in [
+                "triton",
+                "naive_cuda",
+                "shared_memory_cuda",
+                "cutlass",
+                "cutlass_tensorcore_mma_gemm_cuda",
+            ]
+        },
+        flops=lambda point: 2 * point["M"] * point["K"] * point["N"],
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="gru",
+        cute_function="cute_kernels.gru_cute",
+        torch_function="cute_kernels.gru_torch",
+        grid={"batch_size": [4], "sequence_length": [128], "num_heads": [16], "head_dim": [16], "dtype": ["float32"]},
+        arguments={
+            name: {"shape": shape, "dtype": "dtype"}
+            for name, shape in [
+                ("input", ["batch_size", "sequence_length", "num_heads", "head_dim"]),
+                ("weight", ["num_heads", "head_dim", "head_dim"]),
+                ("forget_input", ["batch_size", "sequence_length", "num_heads", "head_dim"]),
+                ("forget_weight", ["num_heads", "head_dim", "head_dim"]),
+                ("reset_input", ["batch_size", "sequence_length", "num_heads", "head_dim"]),
+                ("reset_weight", ["num_heads", "head_dim", "head_dim"]),
+            ]
+        },
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="linear",
+        cute_function="cute_kernels.linear_cute",
+        torch_function="cute_kernels.linear_torch",
+        grid={"num_tokens": [8192], "in_features": [4096], "out_features": [4096], "dtype": _HALF_DTYPES},
+        arguments={
+            "input": {"shape": ["num_tokens", "in_features"], "dtype": "dtype"},
+            "weight": {"shape": ["out_features", "in_features"], "dtype": "dtype"},
+        },
+        flops=lambda point: 2 * point["num_tokens"] * point["in_features"] * point["out_features"],
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="matrix_transpose",
+        cute_function="cute_kernels.matrix_transpose_cute",
+        torch_function="cute_kernels.matrix_transpose_torch",
+        grid={"M": [8192], "N": [8192], "dtype": _DTYPES},
+        arguments={"x": {"shape": ["M", "N"], "dtype": "dtype"}},
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="pack_sequence",
+        cute_function="cute_kernels.pack_sequence_cute",
+        torch_function="cute_kernels.pack_sequence_torch",
+        grid={
+            "batch_size": [8],
+            "sequence_length": [4096],
+            "num_heads": [32],
+            "head_dim": [128],
+            "dtype": ["float32"],
+        },
+        arguments={
+            "inputs": {"shape": ["batch_size", "sequence_length", "num_heads", "head_dim"], "dtype": "dtype"},
+            "cu_seqlens": partial(_get_cu_seqlens, dtype=torch.int64),
+        },
+        # the CUDA kernel expects unsigned offsets
+        cute_arguments={"cuda": {"cu_seqlens": partial(_get_cu_seqlens, dtype=torch.uint32)}},
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="rmsnorm",
+        cute_function="cute_kernels.rmsnorm_cute",
+        torch_function="cute_kernels.rmsnorm_torch",
+        grid={"num_tokens": [16384], "hidden_size": [4096], "dtype": _DTYPES},
+        arguments={
+            "x": {"shape": ["num_tokens", "hidden_size"], "dtype": "dtype"},
+            "weight": {"shape": ["hidden_size"], "dtype": "dtype"},
+            "eps": 1e-5,
+        },
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="rnn",
+        cute_function="cute_kernels.rnn_cute",
+        torch_function="cute_kernels.rnn_torch",
+        grid={"batch_size": [4], "sequence_length": [128], "num_heads": [16], "head_dim": [16], "dtype": ["float32"]},
+        arguments={
+            "input": {"shape": ["batch_size", "sequence_length", "num_heads", "head_dim"], "dtype": "dtype"},
+            "weight": {"shape": ["num_heads", "head_dim", "head_dim"], "dtype": "dtype"},
+        },
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="softmax",
+        cute_function="cute_kernels.softmax_cute",
+        torch_function="cute_kernels.softmax_torch",
+        grid={"num_tokens": [8192], "hidden_size": [50304], "dtype": _DTYPES},
+        arguments={"x": {"shape": ["num_tokens", "hidden_size"], "dtype": "dtype"}},
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="swiglu",
+        cute_function="cute_kernels.swiglu_cute",
+        torch_function="cute_kernels.swiglu_torch",
+        grid={"num_tokens": [16384], "hidden_size": [8192], "dtype": _DTYPES},
+        arguments={
+            "gate": {"shape": ["num_tokens", "hidden_size"], "dtype": "dtype"},
+            "up": {"shape": ["num_tokens", "hidden_size"], "dtype": "dtype"},
+        },
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="swiglu_packed",
+        cute_function="cute_kernels.swiglu_packed_cute",
+        torch_function="cute_kernels.swiglu_packed_torch",
+        grid={"num_tokens": [16384], "hidden_size": [8192], "dtype": _DTYPES},
+        arguments={"x": {"shape": ["num_tokens", "2 * hidden_size"], "dtype": "dtype"}},
+    )
+)
+
+register_benchmark(
+    Benchmark(
+        name="unpack_sequence",
+        cute_function="cute_kernels.unpack_sequence_cute",
+        torch_function="cute_kernels.unpack_sequence_torch",
+        grid={
+            "batch_size": [8],
+            "sequence_length": [4096],
+            "num_heads": [32],
+            "head_dim": [128],
+            "dtype": ["float32"],
+        },
+        arguments={
+            "inputs": _get_packed_sequence,
+            "cu_seqlens": partial(_get_cu_seqlens, dtype=torch.int64),
+            "desired_shape": _get_padded_shape,
+        },
+        cute_arguments={"cuda": {"cu_seqlens": partial(_get_cu_seqlens, dtype=torch.uint32)}},
+    )
+)
@@ -0,0 +1,96 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from typing import Any, Callable
+
+
+class Benchmark:
+    def __init__(
+        self,
+        name: str,
+        cute_function: str,
+        torch_function: str,
+        grid: dict[str, list],
+        arguments: dict[str, Any],
+        cute_arguments: dict[str, dict] = {},
+        backward: bool = False,
+        flops: Callable[[dict], float] | None = None,
+    ) -> None:
+        """benchmark of a cute op against its torch reference
+
+        Args:
+            name (str): unique name of the benchmark
+            cute_function (str): import path of the cute op
+            torch_function (str): import path of the torch reference
+            grid (dict[str, list]): symbols, the benchmark runs over their cartesian product
+            arguments (dict[str, Any]): arguments of both functions in the format of the cutotune sweep manifest,
+                callables are called with the grid point and the device and return the argument
+            cute_arguments (dict[str, dict], optional): name -> extra arguments of the cute op in the same format as
+                `arguments`, they override `arguments` and every entry is timed as a separate implementation. Defaults
+                to {} which times the cute op with its default arguments.
+            backward (bool, optional): also time the backward of the outputs. Defaults to False.
+            flops (Callable[[dict], float] | None, optional): number of floating point operations at a grid point,
+                used to report the throughput. Defaults to None.
+        """
+
+        self.name = name
+        self.cute_function = cute_function
+        self.torch_function = torch_function
+        self.grid = grid
+        self.arguments = arguments
+        self.cute_arguments = cute_arguments
+        self.backward = backward
+        self.flops = flops
+
+    def get_implementations(self) -> dict[str, tuple[str, dict]]:
+        """returns the implementations that are timed
+
+        Returns:
+            dict[str, tuple[str, dict]]: implementation name -> import path of the function and its extra arguments
+        """
+
+        implementations = {"torch": (self.torch_function, {})}
+
+        if len(self.cute_arguments) == 0:
+            implementations["cute"] = (self.cute_function, {})
+        else:
+            for name, extra_arguments in self.cute_arguments.items():
+                implementations[f"cute:{name}"] = (self.cute_function, extra_arguments)
+
+        return implementations
+
+    def __repr__(self) -> str:
+        return (
+            f"Benchmark(name = {self.name}, cute_function = {self.cute_function}, "
+            f"torch_function = {self.torch_function})"
+        )
+
+
+_ALL_BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def register_benchmark(benchmark: Benchmark) -> Benchmark:
+    """registers a benchmark so that it is run by `run_benchmarks` and the command line interface
+
+    Args:
+        benchmark (Benchmark): the benchmark
+
+    Returns:
+        Benchmark: the same benchmark
+    """
+
+    assert benchmark.name not in _ALL_BENCHMARKS, f"a benchmark named ({benchmark.name}) is already registered"
+    _ALL_BENCHMARKS[benchmark.name] = benchmark
+
+    return benchmark
+
+
+def get_benchmarks() -> dict[str, Benchmark]:
+    """returns the registered benchmarks
+
+    Returns:
+        dict[str, Benchmark]: benchmark name -> benchmark
+    """
+
+    return dict(_ALL_BENCHMARKS)
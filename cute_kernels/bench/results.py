@@ -0,0 +1,107 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import json
+import os
+import platform
+import time
+from typing import Any
+
+import torch
+
+from ..utils import atomic_write
+
+
+def _get_metadata(device_type: str | None) -> dict[str, Any]:
+    device_name = None
+    if device_type == "cuda" and torch.cuda.is_available():
+        device_name = torch.cuda.get_device_name()
+    elif device_type == "cpu":
+        device_name = platform.processor() or platform.machine()
+
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "torch_version": torch.__version__,
+        "cuda_version": torch.version.cuda,
+        "device_name": device_name,
+    }
+
+
+def save_results(filename: str, results: list[dict[str, Any]]) -> None:
+    """writes benchmark results to a JSON file along with the versions and the device they were measured with
+
+    Args:
+        filename (str): JSON file
+        results (list[dict[str, Any]]): results of `run_benchmarks`
+    """
+
+    device_type = results[0]["device"] if len(results) > 0 else None
+
+    with atomic_write(os.path.abspath(filename)) as f:
+        json.dump({"metadata": _get_metadata(device_type), "results": results}, f, indent=2)
+        f.write("\n")
+
+
+def load_results(filename: str) -> list[dict[str, Any]]:
+    """reads benchmark results written by `save_results`
+
+    Args:
+        filename (str): JSON file
+
+    Returns:
+        list[dict[str, Any]]: the results
+    """
+
+    with open(filename, "r") as f:
+        return json.load(f)["results"]
+
+
+def _get_result_key(result: dict[str, Any]) -> tuple[str, str, str, str]:
+    return (
+        result["benchmark"],
+        result["implementation"],
+        result["device"],
+        json.dumps(result["point"], sort_keys=True),
+    )
+
+
+def compare_results(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float = 0.1
+) -> list[dict[str, Any]]:
+    """compares the median times of benchmark results to a baseline, only results that were timed in both are compared
+
+    Args:
+        results (list[dict[str, Any]]): new results
+        baseline (list[dict[str, Any]]): baseline results
+        threshold (float, optional): relative slowdown above which a result is a regression. Defaults to 0.1.
+
+    Returns:
+        list[dict[str, Any]]: one comparison per result with the baseline and the new median times, their ratio and
+            whether it is a regression
+    """
+
+    baseline = {_get_result_key(result): result for result in baseline}
+    comparisons = []
+
+    for result in results:
+        baseline_result = baseline.get(_get_result_key(result), None)
+        if baseline_result is None or result["median_ms"] is None or baseline_result["median_ms"] is None:
+            continue
+
+        ratio = result["median_ms"] / baseline_result["median_ms"]
+
+        comparisons.append(
+            {
+                "benchmark": result["benchmark"],
+                "implementation": result["implementation"],
+                "point": result["point"],
+                "device": result["device"],
+                "baseline_median_ms": baseline_result["median_ms"],
+                "median_ms": result["median_ms"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+
+    return comparisons
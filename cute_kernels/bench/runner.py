@@ -0,0 +1,159 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from typing import Any, Callable
+
+import torch
+
+from ..cutotune.benchmark import TimingStatistics
+from ..cutotune.sweep import _get_grid_points, _import_object, _make_argument, _run_backward
+from ..cutotune.timer import get_default_device, get_timer
+from ..cutotune.tuner import _format_error
+from ..utils import set_seed
+from .registry import Benchmark, get_benchmarks
+
+
+_SEED = 42
+
+
+def _make_arguments(arguments: dict, point: dict, device: torch.device) -> dict:
+    # callables build arguments that can't be described by a shape and a dtype
+    return {
+        variable_name: spec(point, device) if callable(spec) else _make_argument(spec, point, device)
+        for variable_name, spec in arguments.items()
+    }
+
+
+def _time_function(
+    function: Callable,
+    kwargs: dict,
+    device: torch.device,
+    backward: bool,
+    warmup_iterations: int,
+    benchmark_iterations: int,
+) -> TimingStatistics:
+    def _run() -> None:
+        output = function(**kwargs)
+        if backward:
+            _run_backward(output)
+
+    # the warmup also absorbs compilation and the tuning of @cutotune functions
+    for _ in range(warmup_iterations):
+        _run()
+
+    timer = get_timer(device)
+    elapsed_times = []
+
+    for _ in range(benchmark_iterations):
+        timer.start()
+        _run()
+        timer.stop()
+        elapsed_times.append(timer.get_elapsed_time())
+
+    return TimingStatistics(elapsed_times)
+
+
+def _run_implementation(
+    benchmark: Benchmark,
+    function_path: str,
+    extra_arguments: dict,
+    point: dict,
+    device: torch.device,
+    warmup_iterations: int,
+    benchmark_iterations: int,
+) -> dict[str, Any]:
+    result = {"median_ms": None, "min_ms": None, "mean_ms": None, "num_samples": 0, "tflops": None, "error": None}
+
+    try:
+        function = _import_object(function_path)
+
+        # every implementation sees the same inputs
+        set_seed(_SEED)
+        kwargs = _make_arguments({**benchmark.arguments, **extra_arguments}, point, device)
+
+        statistics = _time_function(
+            function,
+            kwargs=kwargs,
+            device=device,
+            backward=benchmark.backward,
+            warmup_iterations=warmup_iterations,
+            benchmark_iterations=benchmark_iterations,
+        )
+    except Exception as error:
+        # unsupported devices, dtypes or backends only fail this implementation
+        result["error"] = _format_error(error)
+
+        if isinstance(error, torch.OutOfMemoryError):
+            torch.cuda.empty_cache()
+
+        return result
+
+    result["median_ms"] = statistics.median
+    result["min_ms"] = statistics.samples[0]
+    result["mean_ms"] = statistics.mean
+    result["num_samples"] = statistics.num_samples
+
+    if benchmark.flops is not None:
+        result["tflops"] = benchmark.flops(point) / (statistics.median * 1e-3) / 1e12
+
+    return result
+
+
+def run_benchmarks(
+    names: list[str] | None = None,
+    device: torch.device | None = None,
+    grid: dict[str, list] = {},
+    warmup_iterations: int = 5,
+    benchmark_iterations: int = 20,
+) -> list[dict[str, Any]]:
+    """times the registered cute ops and their torch references over the grids of the benchmarks
+
+    Args:
+        names (list[str] | None, optional): benchmarks to run, None runs all of them. Defaults to None.
+        device (torch.device | None, optional): device to run on, None uses the default accelerator. Defaults to None.
+        grid (dict[str, list], optional): overrides the values of these symbols in the grid of every benchmark that
+            uses them. Defaults to {}.
+        warmup_iterations (int, optional): untimed iterations before timing. Defaults to 5.
+        benchmark_iterations (int, optional): timed iterations, every iteration is one sample. Defaults to 20.
+
+    Returns:
+        list[dict[str, Any]]: one result per benchmark, grid point and implementation. Implementations that raise
+            have an `error` and no timings.
+    """
+
+    if device is None:
+        device = get_default_device()
+
+    benchmarks = get_benchmarks()
+
+    if names is None:
+        names = list(benchmarks.keys())
+
+    for name in names:
+        assert name in benchmarks, f"unknown benchmark ({name})"
+
+    results = []
+
+    for name in names:
+        benchmark = benchmarks[name]
+        benchmark_grid = {symbol: grid.get(symbol, values) for symbol, values in benchmark.grid.items()}
+
+        for point in _get_grid_points(benchmark_grid):
+            for implementation, (function_path, extra_arguments) in benchmark.get_implementations().items():
+                result = {"benchmark": name, "implementation": implementation, "point": point, "device": device.type}
+                result.update(
+                    _run_implementation(
+                        benchmark,
+                        function_path=function_path,
+                        extra_arguments=extra_arguments,
+                        point=point,
+                        device=device,
+                        warmup_iterations=warmup_iterations,
+                        benchmark_iterations=benchmark_iterations,
+                    )
+                )
+
+                results.append(result)
+
+    return results
@@ -2,4 +2,7 @@
 # Copyright (c) 2025, Mayank Mishra
 # **************************************************
 
+from . import fused_linear_cross_entropy, fused_residual_add_rmsnorm, rmsnorm, swiglu_packed
+from .benchmark import benchmark_replacement
 from .compiler import CuteInductor
+from .pattern import CutePattern, get_cute_patterns, register_cute_pattern, replace_cute_patterns
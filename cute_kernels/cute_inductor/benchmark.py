@@ -0,0 +1,224 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from typing import Any, Callable
+
+import torch
+from torch.fx import GraphModule, Node
+
+from ..cutotune import FixedIterationsBenchmark, get_cutotune_cache
+from ..cutotune.benchmark import _BenchmarkStrategy
+from ..cutotune.config import CutoTuneConfig
+from ..cutotune.fingerprint import get_cutotune_fingerprint
+from ..cutotune.sweep import _run_backward
+from ..cutotune.timer import get_default_device, get_timer
+from ..cutotune.tuner import _format_error, _get_config_errors
+from ..utils import device_synchronize
+from .constants import PLACEHOLDER
+from .pattern import CutePattern, _get_tensor_metadata
+
+
+# the decision is cached like a tuned config with the original subgraph and the replacement as the two candidates
+_ORIGINAL = CutoTuneConfig({"replace": False})
+_REPLACEMENT = CutoTuneConfig({"replace": True})
+
+
+def _get_tensor_info(metadata: Any) -> tuple | None:
+    if not isinstance(getattr(metadata, "dtype", None), torch.dtype):
+        return None
+
+    # fake tensors have a stride method while the metadata of `ShapeProp` has a stride tuple
+    stride = metadata.stride() if callable(metadata.stride) else metadata.stride
+    shape = tuple(metadata.shape)
+
+    # inputs with symbolic shapes can't be materialized
+    if not all(isinstance(size, int) for size in shape + tuple(stride)):
+        return None
+
+    return metadata.dtype, shape, tuple(stride), metadata.requires_grad
+
+
+def _get_example_input(tensor_info: tuple, device: torch.device) -> torch.Tensor:
+    dtype, shape, stride, requires_grad = tensor_info
+    tensor = torch.empty_strided(shape, stride, dtype=dtype, device=device)
+
+    # integer inputs are usually indices, 0 is valid for any of them
+    if dtype.is_floating_point:
+        tensor.normal_()
+    else:
+        tensor.zero_()
+
+    if requires_grad and dtype.is_floating_point:
+        tensor.requires_grad_()
+
+    return tensor
+
+
+def _get_lookup_key(variant_index: int, tensor_infos: list[tuple], kwargs: dict, compiled: bool) -> str:
+    lookup_key = [f"variant = {variant_index}", f"compiled = {compiled}"]
+    lookup_key.extend(f"input_{i} = {tensor_info}" for i, tensor_info in enumerate(tensor_infos))
+    lookup_key.extend(f"{key} = {value}" for key, value in kwargs.items() if not isinstance(value, Node))
+
+    return str(lookup_key)[1:-1]
+
+
+def benchmark_replacement(
+    pattern: CutePattern,
+    variant_index: int,
+    subgraph: GraphModule,
+    kwargs: dict,
+    compile_original: Callable | None = None,
+    benchmark_strategy: _BenchmarkStrategy | None = None,
+) -> dict[str, Any]:
+    """times a matched subgraph against the replacement of the pattern on inputs with the shapes, strides and dtypes
+    of the graph, the decision is cached in the cutotune cache
+
+    Args:
+        pattern (CutePattern): matched pattern
+        variant_index (int): index of the matched variant of the pattern
+        subgraph (GraphModule): standalone copy of the matched subgraph
+        kwargs (dict): arguments of the replacement in terms of the placeholders of `subgraph`
+        compile_original (Callable | None, optional): backend that compiles `subgraph` before it is timed, None times
+            it eagerly. Defaults to None.
+        benchmark_strategy (_BenchmarkStrategy | None, optional): strategy used to time the two candidates, None runs
+            5 warmup and 10 timed iterations. Defaults to None.
+
+    Returns:
+        dict[str, Any]: report of the decision, `replaced` is True only if the replacement was measured to be faster
+    """
+
+    report = {
+        "pattern": pattern.name,
+        "variant": variant_index,
+        "lookup_key": None,
+        "original_ms": None,
+        "replacement_ms": None,
+        "replaced": False,
+        "cached": False,
+        "error": None,
+    }
+
+    placeholders = [node for node in subgraph.graph.nodes if node.op == PLACEHOLDER]
+    tensor_infos = [_get_tensor_info(_get_tensor_metadata(node)) for node in placeholders]
+
+    # without static shapes the subgraph can't be timed and it is left in the graph
+    if any(tensor_info is None for tensor_info in tensor_infos):
+        report["error"] = "the inputs of the subgraph don't have static shapes"
+        return report
+
+    function_hash = f"cute_inductor->{pattern.name}"
+    lookup_key = _get_lookup_key(variant_index, tensor_infos, kwargs, compiled=compile_original is not None)
+    fingerprint = get_cutotune_fingerprint(pattern.replacement, [_ORIGINAL, _REPLACEMENT])
+    report["lookup_key"] = lookup_key
+
+    cache = get_cutotune_cache()
+    config = cache.get_config(function_hash, lookup_key, fingerprint)
+
+    if config is not None:
+        report["cached"] = True
+        report["replaced"] = config.get_key_values()["replace"]
+
+        for key_values, elapsed_time in cache.get_timed_configs(function_hash, fingerprint).get(lookup_key, []):
+            report["replacement_ms" if key_values["replace"] else "original_ms"] = elapsed_time
+
+        failed_configs = cache.get_failed_configs(function_hash, lookup_key)
+        if len(failed_configs) > 0:
+            report["error"] = failed_configs[0][1]
+
+        return report
+
+    devices = [getattr(_get_tensor_metadata(node), "device", None) for node in placeholders]
+    devices = [device for device in devices if device is not None]
+    device = devices[0] if len(devices) > 0 else get_default_device()
+
+    inputs = [_get_example_input(tensor_info, device) for tensor_info in tensor_infos]
+    replacement_kwargs = {
+        key: torch.fx.node.map_arg(value, lambda node: inputs[placeholders.index(node)])
+        for key, value in kwargs.items()
+    }
+
+    # the backward is timed as well when the graph trains any of the inputs
+    backward = any(tensor_info[-1] for tensor_info in tensor_infos)
+    errors = {}
+    # index -> error that isn't a property of the candidate (a bug or a sticky CUDA error)
+    unexpected_errors = {}
+
+    # index -> function that runs the candidate, the original is compiled on its first measurement
+    functions = {1: lambda: pattern.replacement(**replacement_kwargs)}
+
+    def _measure(index: int, warmup_iterations: int, benchmark_iterations: int, per_iteration: bool) -> list[float]:
+        # nothing is run after an unexpected error, the device may not be usable anymore
+        if index in errors or len(unexpected_errors) > 0:
+            return [float("inf")] * max(benchmark_iterations, 1)
+
+        try:
+            if index not in functions:
+                original = subgraph if compile_original is None else compile_original(subgraph, inputs)
+                functions[index] = lambda: original(*inputs)
+
+            candidate = functions[index]
+
+            def _run() -> None:
+                output = candidate()
+                if backward:
+                    _run_backward(output)
+
+            device_synchronize(device)
+
+            for _ in range(warmup_iterations):
+                _run()
+
+            timer = get_timer(device)
+            elapsed_times = []
+
+            for _ in range(benchmark_iterations):
+                timer.start()
+                _run()
+                timer.stop()
+                elapsed_times.append(timer.get_elapsed_time())
+        except _get_config_errors() as error:
+            errors[index] = _format_error(error)
+
+            if isinstance(error, torch.OutOfMemoryError):
+                torch.cuda.empty_cache()
+
+            return [float("inf")] * max(benchmark_iterations, 1)
+        except Exception as error:
+            unexpected_errors[index] = _format_error(error)
+            return [float("inf")] * max(benchmark_iterations, 1)
+
+        return elapsed_times if per_iteration else [sum(elapsed_times) / benchmark_iterations]
+
+    if benchmark_strategy is None:
+        benchmark_strategy = FixedIterationsBenchmark()
+
+    with torch.enable_grad() if backward else torch.no_grad():
+        timed_candidates = benchmark_strategy.run(2, _measure)
+
+    # the original is kept but the decision isn't cached so that it is benchmarked again by the next compilation
+    if len(unexpected_errors) > 0:
+        report["error"] = next(iter(unexpected_errors.values()))
+        return report
+
+    elapsed_times = {index: benchmark_strategy.get_time(statistics) for index, statistics in timed_candidates}
+    candidates = [_ORIGINAL, _REPLACEMENT]
+
+    # the original is kept on ties and when either candidate fails so that a rewrite never makes the graph slower
+    replaced = len(errors) == 0 and elapsed_times[1] < elapsed_times[0]
+
+    cache.add_config(
+        function_hash=function_hash,
+        lookup_key=lookup_key,
+        config=_REPLACEMENT if replaced else _ORIGINAL,
+        timed_configs=[(candidates[index], elapsed_times[index]) for index in elapsed_times if index not in errors],
+        fingerprint=fingerprint,
+        failed_configs=[(candidates[index], error) for index, error in errors.items()] if len(errors) > 0 else None,
+    )
+
+    report["original_ms"] = None if 0 in errors else elapsed_times[0]
+    report["replacement_ms"] = None if 1 in errors else elapsed_times[1]
+    report["replaced"] = replaced
+    report["error"] = next(iter(errors.values()), None)
+
+    return report
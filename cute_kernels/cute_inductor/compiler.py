@@ -2,27 +2,80 @@
 # Copyright (c) 2025, Mayank Mishra
 # **************************************************
 
+from collections import Counter
 from typing import Callable
 
 import torch
+import torch._functorch.config
 from torch._dynamo import lookup_backend
 
 from ..utils import enable_cute_tracing, get_boolean_env_variable
-from .rmsnorm import replace_rmsnorm
-from .swiglu_packed import replace_swiglu_unchunked
+from .benchmark import benchmark_replacement
+from .pattern import CutePattern, get_cute_patterns, replace_cute_patterns
 
 
 _DEBUG_CUTEINDUCTOR = get_boolean_env_variable("DEBUG_CUTEINDUCTOR", True)
 
 
+def _compile_with_inductor(gm: torch.fx.GraphModule, example_inputs: list[torch.Tensor]) -> Callable:
+    # the backward would be compiled on the first backward pass otherwise, which fails while the graph that contains
+    # the subgraph is still being compiled
+    with torch._functorch.config.patch(force_non_lazy_backward_lowering=True):
+        return lookup_backend("inductor")(gm, example_inputs)
+
+
 class CuteInductor:
     def __init__(
         self,
         use_torch_inductor_after_cute_inductor: bool = True,
-        replace_functions=[replace_rmsnorm, replace_swiglu_unchunked],
+        patterns: list[str] | None = None,
+        benchmark_replacements: bool = False,
     ) -> None:
+        """torch.compile backend that replaces subgraphs with cute ops
+
+        Args:
+            use_torch_inductor_after_cute_inductor (bool, optional): compile the rewritten graph with inductor.
+                Defaults to True.
+            patterns (list[str] | None, optional): names of the registered patterns to apply, None applies the ones
+                that are enabled by default. Defaults to None.
+            benchmark_replacements (bool, optional): time every match against its replacement with the shapes of the
+                graph and only replace it if the cute op is faster, the original subgraph is compiled with inductor
+                for the comparison if the rewritten graph is. Defaults to False.
+        """
+
         self.use_torch_inductor_after_cute_inductor = use_torch_inductor_after_cute_inductor
-        self.replace_functions = replace_functions
+        self.benchmark_replacements = benchmark_replacements
+
+        all_patterns = get_cute_patterns()
+        if patterns is None:
+            patterns = [name for name, pattern in all_patterns.items() if pattern.enabled_by_default]
+
+        for name in patterns:
+            assert name in all_patterns, f"unknown pattern ({name})"
+
+        self.patterns = [all_patterns[name] for name in patterns]
+        # pattern name -> number of replacements over all the compiled graphs
+        self.pattern_hits = Counter()
+        # one entry per benchmarked match with the timings and whether it was replaced
+        self.compile_report = []
+
+    def _should_replace(
+        self, pattern: CutePattern, variant_index: int, subgraph: torch.fx.GraphModule, kwargs: dict
+    ) -> bool:
+        report = benchmark_replacement(
+            pattern,
+            variant_index,
+            subgraph,
+            kwargs,
+            compile_original=_compile_with_inductor if self.use_torch_inductor_after_cute_inductor else None,
+        )
+
+        self.compile_report.append(report)
+
+        if _DEBUG_CUTEINDUCTOR:
+            print(f"benchmarked pattern: {report}")
+
+        return report["replaced"]
 
     def compiler(self, gm: torch.fx.GraphModule, example_inputs: list[torch.Tensor]) -> Callable:
         with enable_cute_tracing():
@@ -30,11 +83,13 @@ class CuteInductor:
                 print("graph before cute inductor")
                 gm.print_readable()
 
-            for replace_function in self.replace_functions:
-                for node in gm.graph.nodes:
-                    replace_function(gm, node)
+            hits = replace_cute_patterns(
+                gm, self.patterns, should_replace=self._should_replace if self.benchmark_replacements else None
+            )
+            self.pattern_hits.update(hits)
 
             if _DEBUG_CUTEINDUCTOR:
+                print(f"replaced patterns: {hits}")
                 print("graph after cute inductor")
                 gm.print_readable()
 
@@ -4,3 +4,5 @@
 
 CALL_FUNCTION = "call_function"
 CALL_METHOD = "call_method"
+OUTPUT = "output"
+PLACEHOLDER = "placeholder"
@@ -0,0 +1,135 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from itertools import product
+from typing import Callable
+
+import torch
+import torch.nn.functional as F
+
+from ..kernels import fused_linear_cross_entropy_cute
+from .pattern import CutePattern, _get_tensor_metadata, register_cute_pattern
+
+
+def _get_variant(multiply: bool, upcast: bool, flatten: str | None, explicit_vocab_size: bool) -> Callable:
+    def _loss(
+        x: torch.Tensor,
+        weight: torch.Tensor,
+        multiplier: float | None,
+        labels: torch.Tensor,
+        reduction: str,
+        vocab_size: int | None,
+    ) -> torch.Tensor:
+        logits = F.linear(x, weight)
+
+        if multiply:
+            logits = logits * multiplier
+
+        if upcast:
+            logits = logits.float()
+
+        if flatten == "flatten":
+            logits = logits.flatten(0, -2)
+        elif flatten is not None:
+            logits = getattr(logits, flatten)(-1, vocab_size if explicit_vocab_size else logits.size(-1))
+
+        return F.cross_entropy(logits, labels, reduction=reduction)
+
+    # the arguments of the traced function are the placeholders of the pattern so every variant needs its own signature
+    if multiply and explicit_vocab_size:
+
+        def _pattern(
+            x: torch.Tensor,
+            weight: torch.Tensor,
+            multiplier: float,
+            labels: torch.Tensor,
+            reduction: str,
+            vocab_size: int,
+        ) -> torch.Tensor:
+            return _loss(x, weight, multiplier, labels, reduction, vocab_size)
+
+    elif multiply:
+
+        def _pattern(
+            x: torch.Tensor, weight: torch.Tensor, multiplier: float, labels: torch.Tensor, reduction: str
+        ) -> torch.Tensor:
+            return _loss(x, weight, multiplier, labels, reduction, None)
+
+    elif explicit_vocab_size:
+
+        def _pattern(
+            x: torch.Tensor, weight: torch.Tensor, labels: torch.Tensor, reduction: str, vocab_size: int
+        ) -> torch.Tensor:
+            return _loss(x, weight, None, labels, reduction, vocab_size)
+
+    else:
+
+        def _pattern(x: torch.Tensor, weight: torch.Tensor, labels: torch.Tensor, reduction: str) -> torch.Tensor:
+            return _loss(x, weight, None, labels, reduction, None)
+
+    return _pattern
+
+
+def _get_variants() -> list[Callable]:
+    # logits that aren't flattened are 2 dimensional already, the vocab size of a view or a reshape is a constant in
+    # graphs with static shapes and read from the logits otherwise
+    flattens = [
+        (None, False),
+        ("flatten", False),
+        ("view", False),
+        ("view", True),
+        ("reshape", False),
+        ("reshape", True),
+    ]
+
+    return [
+        _get_variant(multiply, upcast, flatten, explicit_vocab_size)
+        for multiply, upcast, (flatten, explicit_vocab_size) in product([False, True], [False, True], flattens)
+    ]
+
+
+def _is_supported(bindings: dict) -> bool:
+    if bindings["reduction"] not in ["sum", "mean"]:
+        return False
+
+    # the kernel takes the multiplier as a scalar
+    multiplier = bindings.get("multiplier", None)
+    if multiplier is not None and (not isinstance(multiplier, (int, float)) or isinstance(multiplier, bool)):
+        return False
+
+    # class indices for 2 dimensional logits, probabilities as targets and unbatched logits aren't supported
+    labels = _get_tensor_metadata(bindings["labels"])
+    return labels is not None and len(labels.shape) == 1 and not labels.dtype.is_floating_point
+
+
+def _fused_linear_cross_entropy(
+    x: torch.Tensor,
+    weight: torch.Tensor,
+    labels: torch.Tensor,
+    reduction: str,
+    logits_multiplier: float | None = None,
+) -> torch.Tensor:
+    # the logits are flattened to 2 dimensions before the loss so the hidden states are flattened the same way
+    return fused_linear_cross_entropy_cute(x.reshape(-1, x.size(-1)), weight, labels, reduction, logits_multiplier)
+
+
+# the [tokens, vocab] logits are never materialized. The kernel doesn't support ignore_index so labels equal to -100
+# (the default ignore_index of cross_entropy) would be read out of bounds instead of being skipped, the pattern needs
+# to be enabled explicitly for models that don't mask labels.
+register_cute_pattern(
+    CutePattern(
+        name="fused_linear_cross_entropy",
+        pattern=_get_variants(),
+        replacement=_fused_linear_cross_entropy,
+        arguments={
+            "x": "x",
+            "weight": "weight",
+            "labels": "labels",
+            "reduction": "reduction",
+            "logits_multiplier": "multiplier",
+        },
+        condition=_is_supported,
+        enabled_by_default=False,
+    )
+)
@@ -0,0 +1,58 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import torch
+
+from ..kernels import fused_residual_add_rmsnorm_cute
+from .pattern import CutePattern, register_cute_pattern
+
+
+def _residual_add_rmsnorm(
+    x: torch.Tensor, residual: torch.Tensor, normalized_shape: list[int], weight: torch.Tensor, eps: float
+) -> tuple[torch.Tensor, torch.Tensor]:
+    residual = x + residual
+    return torch.rms_norm(residual, normalized_shape, weight, eps), residual
+
+
+def _residual_add_rmsnorm_with_multiplier(
+    x: torch.Tensor,
+    multiplier: float,
+    residual: torch.Tensor,
+    normalized_shape: list[int],
+    weight: torch.Tensor,
+    eps: float,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    residual = x * multiplier + residual
+    return torch.rms_norm(residual, normalized_shape, weight, eps), residual
+
+
+def _is_last_dimension(bindings: dict) -> bool:
+    normalized_shape = bindings["normalized_shape"]
+    return isinstance(normalized_shape, (tuple, list)) and len(normalized_shape) == 1
+
+
+# the sum is the residual stream of the next layer, the fused kernel returns it along with the normalized output so
+# that it is only written once
+register_cute_pattern(
+    CutePattern(
+        name="fused_residual_add_rmsnorm",
+        pattern=_residual_add_rmsnorm,
+        replacement=fused_residual_add_rmsnorm_cute,
+        arguments={"x": "x", "residual": "residual", "weight": "weight", "eps": "eps"},
+        condition=_is_last_dimension,
+    )
+)
+
+register_cute_pattern(
+    CutePattern(
+        name="fused_residual_add_rmsnorm_with_multiplier",
+        pattern=_residual_add_rmsnorm_with_multiplier,
+        replacement=fused_residual_add_rmsnorm_cute,
+        arguments={"x": "x", "residual": "residual", "weight": "weight", "eps": "eps", "multiplier": "multiplier"},
+        # the kernel takes the multiplier as a scalar
+        condition=lambda bindings: _is_last_dimension(bindings)
+        and isinstance(bindings["multiplier"], (int, float))
+        and not isinstance(bindings["multiplier"], bool),
+    )
+)
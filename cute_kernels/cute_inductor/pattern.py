@@ -0,0 +1,435 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import inspect
+import operator
+from collections import defaultdict
+from typing import Any, Callable
+
+import torch
+import torch.nn.functional as F
+from torch.fx import Graph, Node
+from torch.fx.graph_module import GraphModule
+from torch.fx.operator_schemas import normalize_function
+
+from .constants import CALL_FUNCTION, CALL_METHOD, OUTPUT, PLACEHOLDER
+
+
+# functions that are traced under different names but compute the same thing
+_TARGET_ALIASES = {
+    F.rms_norm: torch.rms_norm,
+    operator.add: torch.add,
+    operator.mul: torch.mul,
+}
+
+# the operands of these can be swapped
+_COMMUTATIVE_TARGETS = {torch.add, torch.mul}
+
+
+class _PatternGraph:
+    def __init__(self, name: str, function: Callable) -> None:
+        graph = torch.fx.symbolic_trace(function).graph
+
+        for node in graph.nodes:
+            if node.op == PLACEHOLDER:
+                assert len(node.users) > 0, f"argument ({node.target}) of the pattern ({name}) is unused"
+
+        (output,) = [node for node in graph.nodes if node.op == OUTPUT]
+        outputs = list(output.args[0]) if isinstance(output.args[0], (tuple, list)) else [output.args[0]]
+        assert all(isinstance(node, Node) for node in outputs), f"the pattern ({name}) should return tensors"
+
+        # matching starts at the output that every other node of the pattern feeds into and walks towards the inputs
+        nodes = {node for node in graph.nodes if node.op not in [PLACEHOLDER, OUTPUT]}
+        anchors = [node for node in outputs if _get_ancestors(node) | {node} == nodes]
+        assert len(anchors) > 0, f"one of the outputs of the pattern ({name}) should depend on all of its nodes"
+
+        self.anchor = anchors[0]
+        self.outputs = outputs
+        self.num_nodes = len(nodes)
+
+
+class CutePattern:
+    def __init__(
+        self,
+        name: str,
+        pattern: Callable | list[Callable],
+        replacement: Callable,
+        arguments: dict[str, str] | None = None,
+        condition: Callable[[dict[str, Any]], bool] | None = None,
+        enabled_by_default: bool = True,
+    ) -> None:
+        """a rewrite of the subgraph computed by an eager reference function to a cute op
+
+        Args:
+            name (str): unique name of the pattern
+            pattern (Callable | list[Callable]): eager reference function or a list of its variants, they are traced
+                with `torch.fx.symbolic_trace` and return a tensor or a tuple of tensors. Their arguments match
+                anything in the graph. Only the returned values can be used outside of the matched subgraph.
+            replacement (Callable): function that replaces the matched subgraph, it returns the same number of
+                outputs as `pattern` in the same order
+            arguments (dict[str, str] | None, optional): argument of `replacement` -> argument of `pattern`, None
+                passes every argument of `pattern` by name. Arguments missing from the matched variant are not
+                passed. Defaults to None.
+            condition (Callable[[dict[str, Any]], bool] | None, optional): called with the values (nodes or constants)
+                bound to the arguments of `pattern`, the match is skipped if it returns False. Defaults to None.
+            enabled_by_default (bool, optional): whether the pattern is applied when the patterns aren't chosen
+                explicitly. Defaults to True.
+        """
+
+        self.name = name
+        self.pattern = pattern
+        self.replacement = replacement
+        self.condition = condition
+        self.enabled_by_default = enabled_by_default
+
+        functions = pattern if isinstance(pattern, list) else [pattern]
+        assert len(functions) > 0, f"the pattern ({name}) has no variants"
+
+        pattern_arguments = []
+        for function in functions:
+            for argument in inspect.signature(function).parameters.keys():
+                if argument not in pattern_arguments:
+                    pattern_arguments.append(argument)
+
+        if arguments is None:
+            arguments = {argument: argument for argument in pattern_arguments}
+
+        for argument in arguments.values():
+            assert argument in pattern_arguments, f"({argument}) is not an argument of the pattern ({name})"
+
+        self.arguments = arguments
+
+        self._functions = functions
+        self._variants = None
+
+    @property
+    def variants(self) -> list[_PatternGraph]:
+        # the variants are traced on first use
+        if self._variants is None:
+            self._variants = [_PatternGraph(self.name, function) for function in self._functions]
+
+        return self._variants
+
+    def __repr__(self) -> str:
+        return f"CutePattern(name = {self.name}, replacement = {self.replacement.__name__})"
+
+
+_ALL_CUTE_PATTERNS: dict[str, CutePattern] = {}
+
+
+def register_cute_pattern(pattern: CutePattern) -> CutePattern:
+    """registers a pattern so that `CuteInductor` applies it
+
+    Args:
+        pattern (CutePattern): the pattern
+
+    Returns:
+        CutePattern: the same pattern
+    """
+
+    assert pattern.name not in _ALL_CUTE_PATTERNS, f"a pattern named ({pattern.name}) is already registered"
+    _ALL_CUTE_PATTERNS[pattern.name] = pattern
+
+    return pattern
+
+
+def get_cute_patterns() -> dict[str, CutePattern]:
+    """returns the registered patterns
+
+    Returns:
+        dict[str, CutePattern]: pattern name -> pattern
+    """
+
+    return dict(_ALL_CUTE_PATTERNS)
+
+
+def _get_ancestors(node: Node) -> set[Node]:
+    ancestors = set()
+    stack = list(node.all_input_nodes)
+
+    while len(stack) > 0:
+        input_node = stack.pop()
+        if input_node.op != PLACEHOLDER and input_node not in ancestors:
+            ancestors.add(input_node)
+            stack.extend(input_node.all_input_nodes)
+
+    return ancestors
+
+
+def _get_target(node: Node) -> Any:
+    if node.op == CALL_FUNCTION:
+        target = node.target
+    elif node.op == CALL_METHOD:
+        # tensor methods take the same arguments as the torch functions of the same name with self as the input
+        target = getattr(torch, node.target, None)
+        if not callable(target):
+            return (CALL_METHOD, node.target)
+    else:
+        return None
+
+    return _TARGET_ALIASES.get(target, target)
+
+
+def _get_arguments(node: Node, target: Any) -> dict:
+    try:
+        normalized = normalize_function(target, node.args, node.kwargs, normalize_to_only_use_kwargs=True)
+    except Exception:
+        # overloads that can't be told apart without the argument types
+        normalized = None
+
+    if normalized is not None:
+        return normalized.kwargs
+
+    arguments = dict(enumerate(node.args))
+    arguments.update(node.kwargs)
+
+    return arguments
+
+
+def _get_tensor_metadata(value: Any) -> Any:
+    if not isinstance(value, Node):
+        return None
+
+    # set by dynamo, by fake tensor propagation and by `ShapeProp` respectively
+    for key in ["example_value", "val", "tensor_meta"]:
+        metadata = value.meta.get(key, None)
+        if metadata is not None:
+            return metadata
+
+    return None
+
+
+def _is_same(x: Any, y: Any) -> bool:
+    if isinstance(x, Node) or isinstance(y, Node):
+        return x is y
+
+    try:
+        return bool(x == y)
+    except Exception:
+        return False
+
+
+class _Match:
+    def __init__(self) -> None:
+        self.bindings = {}
+        # pattern node -> graph node
+        self.nodes = {}
+
+    def copy(self) -> "_Match":
+        match = _Match()
+        match.bindings = dict(self.bindings)
+        match.nodes = dict(self.nodes)
+        return match
+
+
+def _match(pattern_value: Any, graph_value: Any, match: _Match) -> _Match | None:
+    if isinstance(pattern_value, Node):
+        if pattern_value.op == PLACEHOLDER:
+            name = pattern_value.target
+            if name in match.bindings:
+                return match if _is_same(match.bindings[name], graph_value) else None
+
+            match.bindings[name] = graph_value
+            return match
+
+        if pattern_value in match.nodes:
+            return match if match.nodes[pattern_value] is graph_value else None
+
+        if not isinstance(graph_value, Node) or graph_value in match.nodes.values():
+            return None
+
+        target = _get_target(pattern_value)
+        if target is None or _get_target(graph_value) != target:
+            return None
+
+        match.nodes[pattern_value] = graph_value
+
+        pattern_arguments = _get_arguments(pattern_value, target)
+        graph_arguments = _get_arguments(graph_value, target)
+
+        if pattern_arguments.keys() != graph_arguments.keys():
+            return None
+
+        candidates = [graph_arguments]
+        if target in _COMMUTATIVE_TARGETS and graph_arguments.keys() == {0, 1}:
+            candidates.append({0: graph_arguments[1], 1: graph_arguments[0]})
+
+        for candidate in candidates:
+            result = match.copy()
+
+            for key, value in pattern_arguments.items():
+                result = _match(value, candidate[key], result)
+                if result is None:
+                    break
+
+            if result is not None:
+                return result
+
+        return None
+
+    if isinstance(pattern_value, (tuple, list)):
+        if not isinstance(graph_value, (tuple, list)) or len(pattern_value) != len(graph_value):
+            return None
+
+        for pattern_item, graph_item in zip(pattern_value, graph_value):
+            match = _match(pattern_item, graph_item, match)
+            if match is None:
+                return None
+
+        return match
+
+    return match if _is_same(pattern_value, graph_value) else None
+
+
+def _try_pattern(pattern: CutePattern, variant: _PatternGraph, node: Node) -> _Match | None:
+    match = _match(variant.anchor, node, _Match())
+    if match is None:
+        return None
+
+    # intermediate values can't be replaced if anything outside of the subgraph uses them
+    matched_nodes = set(match.nodes.values())
+    output_nodes = {match.nodes[output] for output in variant.outputs}
+
+    for graph_node in matched_nodes - output_nodes:
+        if not set(graph_node.users).issubset(matched_nodes):
+            return None
+
+    if pattern.condition is not None and not pattern.condition(match.bindings):
+        return None
+
+    return match
+
+
+def _get_insertion_point(graph: Graph, variant: _PatternGraph, match: _Match, kwargs: dict) -> Node | None:
+    anchor = match.nodes[variant.anchor]
+    if len(variant.outputs) == 1:
+        return anchor
+
+    # the replacement goes before the first use of any of its outputs, outputs other than the anchor can be used
+    # before the anchor so all of its inputs need to be available at that point
+    position = {node: i for i, node in enumerate(graph.nodes)}
+    matched_nodes = set(match.nodes.values())
+
+    users = [anchor]
+    for output in variant.outputs:
+        users.extend(user for user in match.nodes[output].users if user not in matched_nodes)
+
+    insertion_point = min(users, key=position.get)
+
+    for value in kwargs.values():
+        if isinstance(value, Node) and position[value] >= position[insertion_point]:
+            return None
+
+    return insertion_point
+
+
+def _get_subgraph(gm: GraphModule, variant: _PatternGraph, match: _Match, kwargs: dict) -> tuple[GraphModule, dict]:
+    # standalone copy of the matched nodes, the values they read from the rest of the graph become placeholders
+    graph = Graph()
+    environment = {}
+    matched_nodes = set(match.nodes.values())
+
+    for node in gm.graph.nodes:
+        if node not in matched_nodes:
+            continue
+
+        for input_node in node.all_input_nodes:
+            if input_node not in matched_nodes and input_node not in environment:
+                placeholder = graph.placeholder(f"input_{len(environment)}")
+                placeholder.meta = dict(input_node.meta)
+                environment[input_node] = placeholder
+
+        environment[node] = graph.node_copy(node, lambda input_node: environment[input_node])
+
+    outputs = [environment[match.nodes[output]] for output in variant.outputs]
+    graph.output(outputs[0] if len(outputs) == 1 else tuple(outputs))
+
+    kwargs = {key: torch.fx.node.map_arg(value, lambda node: environment[node]) for key, value in kwargs.items()}
+
+    return GraphModule(gm, graph), kwargs
+
+
+def replace_cute_patterns(
+    gm: GraphModule,
+    patterns: list[CutePattern] | None = None,
+    should_replace: Callable[[CutePattern, int, GraphModule, dict], bool] | None = None,
+) -> dict[str, int]:
+    """replaces the subgraphs matched by the patterns in a single traversal of the graph
+
+    Args:
+        gm (GraphModule): graph module, it is modified in place and recompiled
+        patterns (list[CutePattern] | None, optional): patterns to apply, None applies the registered patterns that
+            are enabled by default. Defaults to None.
+        should_replace (Callable[[CutePattern, int, GraphModule, dict], bool] | None, optional): called for every
+            match with the pattern, the index of the matched variant, a standalone copy of the matched subgraph and
+            the arguments of the replacement in terms of the placeholders of that copy. The match is left in the graph
+            if it returns False. Defaults to None.
+
+    Returns:
+        dict[str, int]: pattern name -> number of replacements
+    """
+
+    if patterns is None:
+        patterns = [pattern for pattern in _ALL_CUTE_PATTERNS.values() if pattern.enabled_by_default]
+
+    variants = [(pattern, index, variant) for pattern in patterns for index, variant in enumerate(pattern.variants)]
+
+    variants_by_target = defaultdict(list)
+    # larger patterns are tried first so that a fusion wins against the patterns of its parts
+    for pattern, index, variant in sorted(variants, key=lambda item: item[2].num_nodes, reverse=True):
+        variants_by_target[_get_target(variant.anchor)].append((pattern, index, variant))
+
+    graph = gm.graph
+    erased_nodes = set()
+    hits = defaultdict(int)
+
+    # walking from the outputs to the inputs matches the largest subgraph ending at a node before its parts
+    for node in reversed(list(graph.nodes)):
+        if node in erased_nodes:
+            continue
+
+        for pattern, index, variant in variants_by_target.get(_get_target(node), []):
+            match = _try_pattern(pattern, variant, node)
+            if match is None:
+                continue
+
+            kwargs = {
+                replacement_argument: match.bindings[pattern_argument]
+                for replacement_argument, pattern_argument in pattern.arguments.items()
+                if pattern_argument in match.bindings
+            }
+
+            insertion_point = _get_insertion_point(graph, variant, match, kwargs)
+            if insertion_point is None:
+                continue
+
+            if should_replace is not None and not should_replace(
+                pattern, index, *_get_subgraph(gm, variant, match, kwargs)
+            ):
+                continue
+
+            with graph.inserting_before(insertion_point):
+                new_node = graph.call_function(pattern.replacement, kwargs=kwargs)
+
+                if len(variant.outputs) == 1:
+                    match.nodes[variant.anchor].replace_all_uses_with(new_node)
+                else:
+                    for i, output in enumerate(variant.outputs):
+                        match.nodes[output].replace_all_uses_with(graph.call_function(operator.getitem, (new_node, i)))
+
+            # every matched node is unused now, they are erased from the outputs towards the inputs
+            matched_nodes = set(match.nodes.values())
+            while len(matched_nodes) > 0:
+                for matched_node in [matched_node for matched_node in matched_nodes if len(matched_node.users) == 0]:
+                    graph.erase_node(matched_node)
+                    matched_nodes.remove(matched_node)
+                    erased_nodes.add(matched_node)
+
+            hits[pattern.name] += 1
+            break
+
+    graph.lint()
+    gm.recompile()
+
+    return dict(hits)
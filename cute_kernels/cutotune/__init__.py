@@ -2,7 +2,17 @@
 # Copyright (c) 2025, Mayank Mishra
 # **************************************************
 
+from .background import flush_cutotune, register_cutotune_swap_hook
+from .benchmark import FixedIterationsBenchmark, SuccessiveHalvingBenchmark, TimingStatistics
+from .bucket import LogSpacedBucket, MultipleOfBucket, NextPowerOf2Bucket
+from .budget import ignore_cutotune_budgets
 from .cache import get_cutotune_cache
 from .config import CutoTuneConfig, get_cartesian_product_cutotune_configs
 from .parameter import CutoTuneParameter
-from .tuner import cutotune
+from .predictor import NearestNeighbourPredictor
+from .telemetry import TuningRecord, get_cutotune_telemetry
+from .tuner import cutotune, prune_stale_cutotune_cache_entries
+
+
+# cutotune.flush() is an alias for flush_cutotune()
+cutotune.flush = flush_cutotune
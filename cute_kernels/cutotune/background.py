@@ -0,0 +1,147 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import queue
+import threading
+import traceback
+import warnings
+from typing import Any, Callable
+
+import torch
+
+from .config import CutoTuneConfig
+
+
+BACKGROUND = "background"
+DEFERRED = "deferred"
+ASYNC_TUNING_MODES = [BACKGROUND, DEFERRED]
+
+_LOCK = threading.Lock()
+_DEFERRED_JOBS = []
+_BACKGROUND_QUEUE = None
+_SWAP_HOOKS = []
+
+
+class _TuningJob:
+    def __init__(self, run: Callable, device: torch.device) -> None:
+        self.run = run
+        self.device = device
+
+        # the arguments were cloned on the current stream of the caller, the tuning stream has to wait for them
+        self.ready_event = None
+        if device.type == "cuda":
+            self.ready_event = torch.cuda.Event()
+            self.ready_event.record()
+
+    def __call__(self) -> None:
+        if self.ready_event is None:
+            self.run()
+            return
+
+        stream = torch.cuda.Stream(self.device)
+        stream.wait_event(self.ready_event)
+
+        with torch.cuda.stream(stream):
+            self.run()
+
+        stream.synchronize()
+
+
+def clone_arguments(value: Any) -> Any:
+    # the caller is free to modify or free its tensors once the call returns, tuning runs on private copies
+    if isinstance(value, torch.Tensor):
+        return value.detach().clone()
+    elif isinstance(value, (list, tuple)):
+        return type(value)(clone_arguments(i) for i in value)
+    elif isinstance(value, dict):
+        return {key: clone_arguments(i) for key, i in value.items()}
+
+    return value
+
+
+def _run_job(job: _TuningJob) -> None:
+    try:
+        job()
+    except Exception:
+        warnings.warn(f"asynchronous cutotune job failed, the default config stays in use\n{traceback.format_exc()}")
+
+
+def _background_worker(job_queue: queue.Queue) -> None:
+    while True:
+        job = job_queue.get()
+
+        try:
+            _run_job(job)
+        finally:
+            job_queue.task_done()
+
+
+def submit_tuning_job(job: _TuningJob, mode: str) -> None:
+    global _BACKGROUND_QUEUE
+
+    with _LOCK:
+        if mode == DEFERRED:
+            _DEFERRED_JOBS.append(job)
+            return
+
+        if _BACKGROUND_QUEUE is None:
+            _BACKGROUND_QUEUE = queue.Queue()
+            threading.Thread(
+                target=_background_worker, args=(_BACKGROUND_QUEUE,), name="cutotune", daemon=True
+            ).start()
+
+        job_queue = _BACKGROUND_QUEUE
+
+    job_queue.put(job)
+
+
+def flush_cutotune() -> None:
+    """runs all the deferred cutotune jobs in the calling thread and waits for the background jobs to finish, the
+    tuned configs are swapped in when this returns
+    """
+
+    while True:
+        with _LOCK:
+            if len(_DEFERRED_JOBS) == 0:
+                job_queue = _BACKGROUND_QUEUE
+                break
+
+            job = _DEFERRED_JOBS.pop(0)
+
+        _run_job(job)
+
+    if job_queue is not None:
+        job_queue.join()
+
+
+def register_cutotune_swap_hook(hook: Callable) -> Callable:
+    """registers a hook that is called when an asynchronously tuned config replaces the default config
+
+    Args:
+        hook (Callable): called as `hook(function_hash, lookup_key, old_config, new_config)` from the thread that ran
+            the tuning
+
+    Returns:
+        Callable: call it to remove the hook
+    """
+
+    with _LOCK:
+        _SWAP_HOOKS.append(hook)
+
+    def remove() -> None:
+        with _LOCK:
+            if hook in _SWAP_HOOKS:
+                _SWAP_HOOKS.remove(hook)
+
+    return remove
+
+
+def run_swap_hooks(
+    function_hash: str, lookup_key: str, old_config: CutoTuneConfig | None, new_config: CutoTuneConfig
+) -> None:
+    with _LOCK:
+        hooks = list(_SWAP_HOOKS)
+
+    for hook in hooks:
+        hook(function_hash, lookup_key, old_config, new_config)
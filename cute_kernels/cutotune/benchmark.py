@@ -0,0 +1,173 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import math
+from abc import ABC, abstractmethod
+from typing import Callable
+
+
+class TimingStatistics:
+    def __init__(self, samples: list[float], trim_fraction: float = 0.1, z: float = 1.96) -> None:
+        assert len(samples) > 0, "no timing samples"
+
+        self.samples = sorted(samples)
+        self.trim_fraction = trim_fraction
+        self.z = z
+        # set for configs that were dropped early, they never win against a config that wasn't
+        self.pruned = False
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return sum(self.samples) / self.num_samples
+
+    @property
+    def median(self) -> float:
+        n = self.num_samples
+        middle = n // 2
+        return self.samples[middle] if n % 2 == 1 else (self.samples[middle - 1] + self.samples[middle]) / 2
+
+    @property
+    def trimmed_mean(self) -> float:
+        num_trimmed = int(self.num_samples * self.trim_fraction)
+        samples = self.samples[num_trimmed : self.num_samples - num_trimmed]
+        return sum(samples) / len(samples)
+
+    @property
+    def confidence_interval(self) -> tuple[float, float]:
+        # distribution free confidence interval of the median using order statistics, robust to the long tail of
+        # outliers that kernel timings usually have
+        n = self.num_samples
+        half_width = self.z * math.sqrt(n) / 2
+
+        lower = max(math.floor(n / 2 - half_width), 0)
+        upper = min(math.ceil(n / 2 + half_width), n - 1)
+
+        return self.samples[lower], self.samples[upper]
+
+    def __repr__(self) -> str:
+        lower, upper = self.confidence_interval
+        return (
+            f"median = {self.median}, trimmed_mean = {self.trimmed_mean}, mean = {self.mean}, "
+            f"confidence_interval = ({lower}, {upper}), num_samples = {self.num_samples}, pruned = {self.pruned}"
+        )
+
+
+class _BenchmarkStrategy(ABC):
+    @abstractmethod
+    def run(self, num_configs: int, measure: Callable) -> list[tuple[int, TimingStatistics]]:
+        """benchmarks the candidate configs
+
+        Args:
+            num_configs (int): number of candidate configs
+            measure (Callable): `measure(index, warmup_iterations, benchmark_iterations, per_iteration)` runs the
+                config at `index` and returns the timing samples in milliseconds, `per_iteration = False` returns a
+                single sample with the average over all iterations. It returns no samples once the tuning budget is
+                exhausted and benchmarking should stop.
+
+        Returns:
+            list[tuple[int, TimingStatistics]]: index of the config and its timing statistics for every config that
+                was benchmarked
+        """
+
+    @abstractmethod
+    def get_time(self, statistics: TimingStatistics) -> float: ...
+
+
+class FixedIterationsBenchmark(_BenchmarkStrategy):
+    """runs a fixed number of warmup and timed iterations for every config and compares the mean time"""
+
+    def __init__(self, warmup_iterations: int = 5, benchmark_iterations: int = 10) -> None:
+        self.warmup_iterations = warmup_iterations
+        self.benchmark_iterations = benchmark_iterations
+
+    def run(self, num_configs: int, measure: Callable) -> list[tuple[int, TimingStatistics]]:
+        result = []
+
+        for index in range(num_configs):
+            samples = measure(index, self.warmup_iterations, self.benchmark_iterations, False)
+            if len(samples) == 0:
+                break
+
+            result.append((index, TimingStatistics(samples)))
+
+        return result
+
+    def get_time(self, statistics: TimingStatistics) -> float:
+        return statistics.mean
+
+
+class SuccessiveHalvingBenchmark(_BenchmarkStrategy):
+    """benchmarks configs in rounds and compares them on the median of per-iteration timings. After every round only
+    the best `1 / reduction_factor` fraction of the configs survive and configs whose confidence interval lies
+    entirely above the confidence interval of the current best config are dropped as well. The number of timed
+    iterations grows by `reduction_factor` every round so the budget is spent on the close contenders.
+    """
+
+    def __init__(
+        self,
+        warmup_iterations: int = 1,
+        initial_iterations: int = 2,
+        max_iterations_per_round: int = 16,
+        reduction_factor: int = 2,
+        trim_fraction: float = 0.1,
+        z: float = 1.96,
+    ) -> None:
+        assert reduction_factor > 1, "reduction_factor should be greater than 1"
+
+        self.warmup_iterations = warmup_iterations
+        self.initial_iterations = initial_iterations
+        self.max_iterations_per_round = max_iterations_per_round
+        self.reduction_factor = reduction_factor
+        self.trim_fraction = trim_fraction
+        self.z = z
+
+    def run(self, num_configs: int, measure: Callable) -> list[tuple[int, TimingStatistics]]:
+        samples = {index: [] for index in range(num_configs)}
+        statistics = {}
+
+        survivors = list(range(num_configs))
+        iterations = self.initial_iterations
+
+        while len(survivors) > 0:
+            for index in survivors:
+                warmup_iterations = self.warmup_iterations if len(samples[index]) == 0 else 0
+                new_samples = measure(index, warmup_iterations, iterations, True)
+
+                # the budget is exhausted, configs that were never measured are left out
+                if len(new_samples) == 0:
+                    return [(index, statistics[index]) for index in range(num_configs) if index in statistics]
+
+                samples[index].extend(new_samples)
+                statistics[index] = TimingStatistics(samples[index], trim_fraction=self.trim_fraction, z=self.z)
+
+            pruned = set(survivors)
+            survivors = self._prune(survivors, statistics)
+            pruned.difference_update(survivors)
+
+            for index in pruned:
+                statistics[index].pruned = True
+
+            if len(survivors) == 1:
+                break
+
+            iterations = min(iterations * self.reduction_factor, self.max_iterations_per_round)
+
+        return [(index, statistics[index]) for index in range(num_configs)]
+
+    def get_time(self, statistics: TimingStatistics) -> float:
+        return statistics.median
+
+    def _prune(self, survivors: list[int], statistics: dict[int, TimingStatistics]) -> list[int]:
+        survivors = sorted(survivors, key=lambda index: statistics[index].median)
+        _, best_upper = statistics[survivors[0]].confidence_interval
+
+        num_survivors = math.ceil(len(survivors) / self.reduction_factor)
+        survivors = survivors[:num_survivors]
+
+        # clearly losing configs are dropped even if they are in the top fraction
+        return [index for index in survivors if statistics[index].confidence_interval[0] <= best_upper]
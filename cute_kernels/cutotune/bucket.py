@@ -0,0 +1,88 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+from ..math import ceil_divide, get_next_power_of_2
+
+
+class _Bucket(ABC):
+    @abstractmethod
+    def __call__(self, value: int) -> int: ...
+
+    # the repr is a part of the persistent lookup key, the default one contains the memory address of the object
+    @abstractmethod
+    def __repr__(self) -> str: ...
+
+
+class NextPowerOf2Bucket(_Bucket):
+    """rounds a value up to the next power of 2, values smaller than `minimum` share a bucket"""
+
+    def __init__(self, minimum: int = 1) -> None:
+        self.minimum = minimum
+
+    def __call__(self, value: int) -> int:
+        return get_next_power_of_2(max(value, self.minimum))
+
+    def __repr__(self) -> str:
+        return f"next_power_of_2(minimum={self.minimum})"
+
+
+class LogSpacedBucket(_Bucket):
+    """rounds a value up to the next bucket boundary where boundaries grow by `growth_factor`, finer than powers of 2
+    for `growth_factor < 2`
+    """
+
+    def __init__(self, growth_factor: float = 1.5, minimum: int = 1) -> None:
+        assert growth_factor > 1, "growth_factor should be greater than 1"
+        assert minimum > 0, "minimum should be positive"
+
+        self.growth_factor = growth_factor
+        self.minimum = minimum
+
+    def __call__(self, value: int) -> int:
+        boundary = self.minimum
+        while boundary < value:
+            boundary = math.ceil(boundary * self.growth_factor)
+
+        return boundary
+
+    def __repr__(self) -> str:
+        return f"log_spaced(growth_factor={self.growth_factor}, minimum={self.minimum})"
+
+
+class MultipleOfBucket(_Bucket):
+    """rounds a value up to a multiple of `multiple`"""
+
+    def __init__(self, multiple: int) -> None:
+        assert multiple > 0, "multiple should be positive"
+        self.multiple = multiple
+
+    def __call__(self, value: int) -> int:
+        return ceil_divide(value, self.multiple) * self.multiple
+
+    def __repr__(self) -> str:
+        return f"multiple_of({self.multiple})"
+
+
+def get_bucket_name(bucket: Callable) -> str:
+    # the name is a part of the persistent lookup key, so it can't contain the memory address of the object
+    if isinstance(bucket, _Bucket):
+        return repr(bucket)
+
+    return getattr(bucket, "__qualname__", type(bucket).__qualname__)
+
+
+def apply_bucket(bucket: Callable, value: Any) -> Any:
+    # sizes and strides are bucketed per dimension, everything that is not an integer is left as is
+    if isinstance(value, bool):
+        return value
+    elif isinstance(value, int):
+        return bucket(value)
+    elif isinstance(value, tuple):
+        return tuple(apply_bucket(bucket, i) for i in value)
+
+    return value
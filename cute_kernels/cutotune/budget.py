@@ -0,0 +1,120 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import os
+import time
+from contextlib import contextmanager
+
+
+def _get_optional_env_variable(name: str, dtype: type) -> int | float | None:
+    value = os.getenv(name, "")
+    return dtype(value) if value != "" else None
+
+
+_MAX_CUTOTUNE_TIME = _get_optional_env_variable("MAX_CUTOTUNE_TIME", float)
+_MAX_CUTOTUNE_CONFIGS = _get_optional_env_variable("MAX_CUTOTUNE_CONFIGS", int)
+_MAX_CUTOTUNE_ITERATIONS = _get_optional_env_variable("MAX_CUTOTUNE_ITERATIONS", int)
+
+_IGNORE_BUDGETS = False
+
+
+def _get_tighter_limit(x: int | float | None, y: int | float | None) -> int | float | None:
+    if x is None:
+        return y
+    elif y is None:
+        return x
+
+    return min(x, y)
+
+
+class _TuningBudget:
+    """limits for tuning a single lookup key, None means unlimited. The global limits from the `MAX_CUTOTUNE_TIME`
+    (seconds), `MAX_CUTOTUNE_CONFIGS` and `MAX_CUTOTUNE_ITERATIONS` environment variables apply on top of the limits
+    of every function.
+    """
+
+    def __init__(
+        self, max_time: float | None = None, max_configs: int | None = None, max_iterations: int | None = None
+    ) -> None:
+        self.max_time = _get_tighter_limit(max_time, _MAX_CUTOTUNE_TIME)
+        self.max_configs = _get_tighter_limit(max_configs, _MAX_CUTOTUNE_CONFIGS)
+        self.max_iterations = _get_tighter_limit(max_iterations, _MAX_CUTOTUNE_ITERATIONS)
+
+        assert self.max_configs is None or self.max_configs > 0, "max_configs should be positive"
+        assert self.max_iterations is None or self.max_iterations > 0, "max_iterations should be positive"
+
+    def is_unlimited(self) -> bool:
+        return self.max_time is None and self.max_configs is None and self.max_iterations is None
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(max_time = {self.max_time}, max_configs = {self.max_configs}, "
+            f"max_iterations = {self.max_iterations})"
+        )
+
+
+class _BudgetTracker:
+    """tracks the budget spent on tuning a lookup key, the first config is always benchmarked so that there is a
+    config to return
+    """
+
+    def __init__(self, budget: _TuningBudget | None) -> None:
+        self.budget = budget
+        self.start = time.perf_counter()
+        self.measured_indices = set()
+        self.num_iterations = 0
+        self.exhausted = False
+
+    def acquire(self, index: int, warmup_iterations: int, benchmark_iterations: int) -> int | None:
+        # returns the number of timed iterations that can be run for the config at index, None once the budget is
+        # exhausted
+        if self.budget is None:
+            return benchmark_iterations
+
+        if not self.exhausted and len(self.measured_indices) > 0:
+            budget = self.budget
+
+            if (
+                (budget.max_time is not None and time.perf_counter() - self.start >= budget.max_time)
+                or (
+                    budget.max_configs is not None
+                    and index not in self.measured_indices
+                    and len(self.measured_indices) >= budget.max_configs
+                )
+                or (budget.max_iterations is not None and self.num_iterations >= budget.max_iterations)
+            ):
+                self.exhausted = True
+
+        if self.exhausted:
+            return None
+
+        if self.budget.max_iterations is not None:
+            remaining_iterations = self.budget.max_iterations - self.num_iterations - warmup_iterations
+            benchmark_iterations = max(min(benchmark_iterations, remaining_iterations), 1)
+
+        self.measured_indices.add(index)
+        self.num_iterations += warmup_iterations + benchmark_iterations
+
+        return benchmark_iterations
+
+
+def are_budgets_ignored() -> bool:
+    return _IGNORE_BUDGETS
+
+
+@contextmanager
+def ignore_cutotune_budgets():
+    """tunes every config inside the context irrespective of the tuning budgets, provisional configs in the cache that
+    were picked when a budget ran out are tuned again
+    """
+
+    global _IGNORE_BUDGETS
+
+    previous = _IGNORE_BUDGETS
+    _IGNORE_BUDGETS = True
+
+    try:
+        yield
+    finally:
+        _IGNORE_BUDGETS = previous
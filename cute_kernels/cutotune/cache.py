@@ -2,65 +2,628 @@
 # Copyright (c) 2025, Mayank Mishra
 # **************************************************
 
+import atexit
+import hashlib
+import importlib
+import json
 import os
+import re
+import threading
+import time
+import warnings
+import weakref
+from enum import Enum
+from functools import wraps
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable
 
-import yaml
+import torch
 
-from ..utils import get_boolean_env_variable
+from ..utils import atomic_write, file_lock, get_boolean_env_variable
 from .config import CutoTuneConfig
 
 
 _LOAD_CUTOTUNE_CACHE = get_boolean_env_variable("LOAD_CUTOTUNE_CACHE", True)
-_CUTOTUNE_CACHE_FILENAME = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache.yml")
+_SAVE_CUTOTUNE_CACHE = get_boolean_env_variable("SAVE_CUTOTUNE_CACHE", True)
+_CUTOTUNE_CACHE_SAVE_INTERVAL = float(os.getenv("CUTOTUNE_CACHE_SAVE_INTERVAL", 30))
+_CUTOTUNE_CACHE_DIRECTORY = os.getenv(
+    "CUTOTUNE_CACHE_DIR",
+    os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "cute_kernels", "cutotune"
+    ),
+)
+_CUTOTUNE_CACHE_EXTENSION = ".jsonl"
+
+
+def _get_package_version(package_name: str) -> str:
+    try:
+        return version(package_name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_cutotune_cache_namespace() -> str:
+    """returns the namespace used to separate cutotune caches, tuned configs are only reused on the same device type
+    with the same torch, triton and cute-kernels versions
+
+    Returns:
+        str: namespace of the cutotune cache
+    """
+
+    if torch.cuda.is_available():
+        major, minor = torch.cuda.get_device_capability()
+        device = f"{torch.cuda.get_device_name()}-{major}.{minor}"
+    elif hasattr(torch, "xpu") and torch.xpu.is_available():
+        device = torch.xpu.get_device_name()
+    else:
+        device = "cpu"
+
+    namespace = (
+        f"{device}_torch-{torch.__version__}_triton-{_get_package_version('triton')}_"
+        f"cute-kernels-{_get_package_version('cute-kernels')}"
+    )
+
+    return re.sub(r"[^a-zA-Z0-9._+-]", "_", namespace)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return {"enum": f"{value.__class__.__module__}.{value.__class__.__qualname__}", "value": value.value}
+
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "enum" in value:
+        module_name, class_name = value["enum"].rsplit(".", 1)
+        enum_class = getattr(importlib.import_module(module_name), class_name)
+        return enum_class(value["value"])
+
+    return value
+
+
+def _load_entry(line: str, filename: str) -> dict | None:
+    # a crash in the middle of an append leaves a torn line, it is skipped instead of breaking every later lookup
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        entry = None
+
+    if not isinstance(entry, dict) or "lookup_key" not in entry or "config" not in entry:
+        warnings.warn(f"skipping a corrupt line of the cutotune cache file ({filename}): {line[:64]!r}")
+        return None
+
+    return entry
+
+
+def _get_file_id(stat: os.stat_result) -> tuple[int, int]:
+    return stat.st_dev, stat.st_ino
+
+
+def _synchronized(method: Callable) -> Callable:
+    # configs can be tuned in a background thread while the main thread looks them up
+    @wraps(method)
+    def inner(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return inner
+
+
+def _save_at_exit(cache_reference: weakref.ref) -> None:
+    # the cache is only weakly referenced so that caches that are no longer used aren't kept alive until exit
+    cache = cache_reference()
+    if cache is None or len(cache.unsaved_cache) == 0:
+        return
+
+    try:
+        cache.save()
+    except Exception as error:
+        warnings.warn(f"failed to save the cutotune cache at exit: {error}")
 
 
 class _CutoTuneCache:
-    def __init__(self) -> None:
+    """on-disk cache of tuned configs, every function gets its own JSON-lines file inside the namespace directory so
+    that only the entries of the functions that are actually called get deserialized. New entries are appended to the
+    file, later lines override earlier lines with the same lookup key. With autosave, new entries are appended in
+    batches at most every `save_interval` seconds and when the interpreter exits so that the first call with every new
+    lookup key doesn't take the file lock, a `save_interval` of 0 appends every entry as soon as it is added.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        namespace: str | None = None,
+        load: bool = _LOAD_CUTOTUNE_CACHE,
+        autosave: bool = _SAVE_CUTOTUNE_CACHE,
+        save_interval: float = _CUTOTUNE_CACHE_SAVE_INTERVAL,
+    ) -> None:
+        if directory is None:
+            directory = _CUTOTUNE_CACHE_DIRECTORY
+
+        if namespace is None:
+            namespace = get_cutotune_cache_namespace()
+
+        self.directory = os.path.join(directory, namespace)
+        self.load = load
+        self.autosave = autosave
+        self.save_interval = save_interval
+        self.last_save_time = time.perf_counter()
+        self.lock = threading.RLock()
+
+        # function_hash -> lookup_key -> config, only populated for the functions that were accessed
         self.cache = {}
+        # function_hash -> lookup_key -> config for the entries known to be in the file
+        self.saved_cache = {}
+        # number of bytes of the function file that are already read and the file they were read from, compact and
+        # prune replace the file so a different file means the offset is meaningless
+        self.file_offsets = {}
+        self.file_ids = {}
+        # entries added by this process that still need to be appended to the file
+        self.unsaved_cache = {}
+        # function_hash -> lookup_key -> [(key values of the config, time)] for the entries that were benchmarked
+        self.timed_configs = {}
+        # function_hash -> lookup_key -> fingerprint of the code and config space the entry was tuned with
+        self.fingerprints = {}
+        self.saved_fingerprints = {}
+        # function_hash -> lookup_key -> [(key values of the config, error)] for the configs that raised while tuning
+        self.failed_configs = {}
+        # function_hash -> lookup_key -> whether the config was picked after the tuning budget ran out
+        self.provisional = {}
+        self.saved_provisional = {}
 
-        if _LOAD_CUTOTUNE_CACHE and os.path.exists(_CUTOTUNE_CACHE_FILENAME):
-            cache = yaml.load(open(_CUTOTUNE_CACHE_FILENAME, "r"), yaml.SafeLoader)
-            self.cache = self._deserialize(cache)
+        if self.autosave:
+            atexit.register(_save_at_exit, weakref.ref(self))
 
-    def add_config(self, function_hash: str, lookup_key: str, config: CutoTuneConfig) -> None:
-        if function_hash not in self.cache:
-            self.cache[function_hash] = {}
+    @_synchronized
+    def add_config(
+        self,
+        function_hash: str,
+        lookup_key: str,
+        config: CutoTuneConfig,
+        timed_configs: list[tuple[CutoTuneConfig, float]] | None = None,
+        fingerprint: str | None = None,
+        failed_configs: list[tuple[CutoTuneConfig, str]] | None = None,
+        provisional: bool = False,
+    ) -> None:
+        self._get_function_cache(function_hash)[lookup_key] = config
+        self.fingerprints[function_hash][lookup_key] = fingerprint
+        self.provisional[function_hash][lookup_key] = provisional
 
-        self.cache[function_hash][lookup_key] = config
+        if failed_configs is None:
+            self.failed_configs[function_hash].pop(lookup_key, None)
+        else:
+            self.failed_configs[function_hash][lookup_key] = [
+                (failed_config.get_key_values(), error) for failed_config, error in failed_configs
+            ]
 
-    def get_config(self, function_hash: str, lookup_key: str) -> CutoTuneConfig:
-        if function_hash in self.cache:
-            function_cache = self.cache[function_hash]
-            return function_cache.get(lookup_key, None)
+        if timed_configs is None:
+            self.timed_configs[function_hash].pop(lookup_key, None)
+        else:
+            self.timed_configs[function_hash][lookup_key] = [
+                (timed_config.get_key_values(), time) for timed_config, time in timed_configs
+            ]
 
-        return None
+        if function_hash not in self.unsaved_cache:
+            self.unsaved_cache[function_hash] = {}
+
+        self.unsaved_cache[function_hash][lookup_key] = config
+
+        if self.autosave and time.perf_counter() - self.last_save_time >= self.save_interval:
+            self.save()
+
+    @_synchronized
+    def get_config(self, function_hash: str, lookup_key: str, fingerprint: str | None = None) -> CutoTuneConfig:
+        function_cache = self._get_function_cache(function_hash)
+        config = function_cache.get(lookup_key, None)
+
+        # the key might have been tuned by another process since the file was last read
+        if config is None and self.load:
+            self._read_new_entries(function_hash)
+            config = function_cache.get(lookup_key, None)
+
+        # entries tuned with different code or a different config space are stale
+        if fingerprint is not None and self.fingerprints[function_hash].get(lookup_key, None) != fingerprint:
+            config = None
+
+        return config
+
+    @_synchronized
+    def get_timed_configs(
+        self, function_hash: str, fingerprint: str | None = None
+    ) -> dict[str, list[tuple[dict, float]]]:
+        """returns the benchmark timings of all the lookup keys of a function that were tuned with timings
+
+        Args:
+            function_hash (str): hash of the function
+            fingerprint (str | None, optional): only return the entries with this fingerprint, None returns all the
+                entries. Defaults to None.
+
+        Returns:
+            dict[str, list[tuple[dict, float]]]: lookup key -> list of key values of the config and its time
+        """
+
+        self._get_function_cache(function_hash)
+        if self.load:
+            self._read_new_entries(function_hash)
+
+        timed_configs = self.timed_configs[function_hash]
+        if fingerprint is None:
+            return timed_configs
+
+        fingerprints = self.fingerprints[function_hash]
+        return {
+            lookup_key: value
+            for lookup_key, value in timed_configs.items()
+            if fingerprints.get(lookup_key, None) == fingerprint
+        }
+
+    @_synchronized
+    def is_provisional(self, function_hash: str, lookup_key: str) -> bool:
+        self._get_function_cache(function_hash)
+        return self.provisional[function_hash].get(lookup_key, False)
+
+    @_synchronized
+    def get_failed_configs(self, function_hash: str, lookup_key: str) -> list[tuple[dict, str]]:
+        """returns the configs that raised while tuning a lookup key, the fingerprint is ignored since a config that
+        runs out of resources keeps failing across small code changes
+
+        Args:
+            function_hash (str): hash of the function
+            lookup_key (str): lookup key
+
+        Returns:
+            list[tuple[dict, str]]: key values of the failed configs and their errors
+        """
+
+        self._get_function_cache(function_hash)
+        if self.load:
+            self._read_new_entries(function_hash)
+
+        return self.failed_configs[function_hash].get(lookup_key, [])
+
+    @_synchronized
+    def get_stale_lookup_keys(self, function_hash: str, fingerprint: str) -> list[str]:
+        """returns the lookup keys of a function whose entries were tuned with a different fingerprint
+
+        Args:
+            function_hash (str): hash of the function
+            fingerprint (str): current fingerprint of the function
+
+        Returns:
+            list[str]: stale lookup keys
+        """
+
+        function_cache = self._get_function_cache(function_hash)
+        if self.load:
+            self._read_new_entries(function_hash)
+
+        fingerprints = self.fingerprints[function_hash]
+        return sorted(lookup_key for lookup_key in function_cache if fingerprints.get(lookup_key, None) != fingerprint)
 
+    @_synchronized
+    def prune(self, function_hash: str, fingerprint: str) -> list[str]:
+        """removes the entries of a function that were tuned with a different fingerprint from the cache file
+
+        Args:
+            function_hash (str): hash of the function
+            fingerprint (str): current fingerprint of the function
+
+        Returns:
+            list[str]: lookup keys that were removed
+        """
+
+        self.save()
+
+        filename = self._get_filename(function_hash)
+        if not os.path.exists(filename):
+            return []
+
+        # the file is append only, a key that was tuned again has its stale entries earlier in the file
+        is_stale = {}
+
+        with file_lock(f"{filename}.lock"):
+            lines = []
+            with open(filename, "r") as f:
+                for line in f:
+                    entry = _load_entry(line, filename)
+                    if entry is None:
+                        continue
+
+                    is_stale[entry["lookup_key"]] = entry.get("fingerprint", None) != fingerprint
+
+                    if not is_stale[entry["lookup_key"]]:
+                        lines.append(line)
+
+            with atomic_write(filename) as f:
+                f.write("".join(lines))
+
+        # the entries of the function are read again from the pruned file
+        for cache in [
+            self.cache,
+            self.saved_cache,
+            self.file_offsets,
+            self.file_ids,
+            self.timed_configs,
+            self.fingerprints,
+            self.saved_fingerprints,
+            self.failed_configs,
+            self.provisional,
+            self.saved_provisional,
+        ]:
+            cache.pop(function_hash, None)
+
+        return sorted(lookup_key for lookup_key, stale in is_stale.items() if stale)
+
+    @_synchronized
     def save(self) -> None:
-        yaml.dump(self._serialize(self.cache), open(_CUTOTUNE_CACHE_FILENAME, "w"))
+        for function_hash, unsaved_function_cache in self.unsaved_cache.items():
+            filename = self._get_filename(function_hash)
+
+            # the lock serializes appends across processes, entries tuned by other processes are merged in first so
+            # that entries which are already on disk are not appended again
+            with file_lock(f"{filename}.lock"):
+                self._read_new_entries(function_hash)
+                saved_function_cache = self.saved_cache[function_hash]
+
+                saved_fingerprints = self.saved_fingerprints[function_hash]
+                fingerprints = self.fingerprints[function_hash]
+                saved_provisional = self.saved_provisional[function_hash]
+                provisional = self.provisional[function_hash]
+
+                lines = []
+                for lookup_key, config in unsaved_function_cache.items():
+                    saved_config = saved_function_cache.get(lookup_key, None)
+                    fingerprint = fingerprints.get(lookup_key, None)
+
+                    if (
+                        saved_config is None
+                        or saved_config.get_key_values() != config.get_key_values()
+                        or saved_fingerprints.get(lookup_key, None) != fingerprint
+                        or saved_provisional.get(lookup_key, False) != provisional.get(lookup_key, False)
+                    ):
+                        lines.append(
+                            self._serialize(
+                                lookup_key=lookup_key,
+                                config=config,
+                                timed_configs=self.timed_configs[function_hash].get(lookup_key, None),
+                                fingerprint=fingerprint,
+                                failed_configs=self.failed_configs[function_hash].get(lookup_key, None),
+                                provisional=provisional.get(lookup_key, False),
+                            )
+                        )
+                        saved_function_cache[lookup_key] = config
+                        saved_fingerprints[lookup_key] = fingerprint
+                        saved_provisional[lookup_key] = provisional.get(lookup_key, False)
+
+                if len(lines) > 0:
+                    with open(filename, "a") as f:
+                        f.write("".join(lines))
+
+                    stat = os.stat(filename)
+                    self.file_offsets[function_hash] = stat.st_size
+                    self.file_ids[function_hash] = _get_file_id(stat)
+
+        self.unsaved_cache = {}
+        self.last_save_time = time.perf_counter()
+
+    @_synchronized
+    def compact(self) -> None:
+        """rewrites all the cache files in the namespace directory keeping only the latest entry for every lookup key"""
+
+        self.save()
+
+        if not os.path.isdir(self.directory):
+            return
+
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(_CUTOTUNE_CACHE_EXTENSION):
+                continue
+
+            filename = os.path.join(self.directory, filename)
+
+            with file_lock(f"{filename}.lock"):
+                entries = {}
+                with open(filename, "r") as f:
+                    for line in f:
+                        entry = _load_entry(line, filename)
+                        if entry is not None:
+                            entries[entry["lookup_key"]] = line
+
+                with atomic_write(filename) as f:
+                    f.write("".join(entries.values()))
+
+        self.cache = {}
+        self.saved_cache = {}
+        self.file_offsets = {}
+        self.file_ids = {}
+        self.timed_configs = {}
+        self.fingerprints = {}
+        self.saved_fingerprints = {}
+        self.failed_configs = {}
+        self.provisional = {}
+        self.saved_provisional = {}
+
+    def _get_filename(self, function_hash: str) -> str:
+        # the readable prefix is just for debugging, the digest keeps filenames unique
+        readable_name = re.sub(r"[^a-zA-Z0-9]+", "_", function_hash).strip("_")
+        digest = hashlib.sha256(function_hash.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{readable_name}-{digest}{_CUTOTUNE_CACHE_EXTENSION}")
+
+    def _get_function_cache(self, function_hash: str) -> dict:
+        function_cache = self.cache.get(function_hash, None)
+
+        if function_cache is None:
+            function_cache = {}
+            self.cache[function_hash] = function_cache
+            self.saved_cache[function_hash] = {}
+            self.file_offsets[function_hash] = 0
+            self.file_ids[function_hash] = None
+            self.timed_configs[function_hash] = {}
+            self.fingerprints[function_hash] = {}
+            self.saved_fingerprints[function_hash] = {}
+            self.failed_configs[function_hash] = {}
+            self.provisional[function_hash] = {}
+            self.saved_provisional[function_hash] = {}
+
+            if self.load:
+                self._read_new_entries(function_hash)
+
+        return function_cache
+
+    def _read_new_entries(self, function_hash: str) -> None:
+        function_cache = self._get_function_cache(function_hash)
+        filename = self._get_filename(function_hash)
+
+        try:
+            f = open(filename, "rb")
+        except FileNotFoundError:
+            return
+
+        # the file is identified through the open handle so that a concurrent rewrite can't slip in between
+        with f:
+            stat = os.fstat(f.fileno())
+            offset = self.file_offsets[function_hash]
+            file_id = _get_file_id(stat)
+
+            # another process compacted or pruned the file, the offset points into the old file so the new one is read
+            # from the start. The size check catches a rewrite that reused the inode of the old file.
+            if self.file_ids[function_hash] not in [None, file_id] or stat.st_size < offset:
+                self._forget_saved_entries(function_hash)
+                offset = 0
+
+            self.file_offsets[function_hash] = offset
+            self.file_ids[function_hash] = file_id
+
+            if stat.st_size <= offset:
+                return
+
+            f.seek(offset)
+            data = f.read()
+
+        # only consume complete lines, a concurrent writer might still be appending the last one
+        data = data[: data.rfind(b"\n") + 1]
+        self.file_offsets[function_hash] = offset + len(data)
+
+        unsaved_function_cache = self.unsaved_cache.get(function_hash, {})
+
+        for line in data.decode(errors="replace").splitlines():
+            entry = _load_entry(line, filename)
+            if entry is None:
+                continue
+
+            lookup_key, config, timed_configs, fingerprint, failed_configs, provisional = self._deserialize(entry)
+            if config is None:
+                continue
+
+            self.saved_cache[function_hash][lookup_key] = config
+            self.saved_fingerprints[function_hash][lookup_key] = fingerprint
+            self.saved_provisional[function_hash][lookup_key] = provisional
+
+            # entries that this process is about to write take precedence
+            if self.load and lookup_key not in unsaved_function_cache:
+                function_cache[lookup_key] = config
+                self.fingerprints[function_hash][lookup_key] = fingerprint
+                self.provisional[function_hash][lookup_key] = provisional
+
+                if timed_configs is None:
+                    self.timed_configs[function_hash].pop(lookup_key, None)
+                else:
+                    self.timed_configs[function_hash][lookup_key] = timed_configs
+
+                if failed_configs is None:
+                    self.failed_configs[function_hash].pop(lookup_key, None)
+                else:
+                    self.failed_configs[function_hash][lookup_key] = failed_configs
+
+    def _forget_saved_entries(self, function_hash: str) -> None:
+        # entries that were removed from the file are dropped as well, the ones that this process still needs to write
+        # are kept. The dicts are cleared in place since callers hold references to them.
+        unsaved_function_cache = self.unsaved_cache.get(function_hash, {})
+
+        for cache in [self.cache, self.timed_configs, self.fingerprints, self.failed_configs, self.provisional]:
+            function_cache = cache[function_hash]
+            for lookup_key in list(function_cache):
+                if lookup_key not in unsaved_function_cache:
+                    del function_cache[lookup_key]
+
+        for cache in [self.saved_cache, self.saved_fingerprints, self.saved_provisional]:
+            cache[function_hash].clear()
+
+    def _serialize(
+        self,
+        lookup_key: str,
+        config: CutoTuneConfig,
+        timed_configs: list[tuple[dict, float]] | None,
+        fingerprint: str | None,
+        failed_configs: list[tuple[dict, str]] | None = None,
+        provisional: bool = False,
+    ) -> str:
+        entry = {
+            "lookup_key": lookup_key,
+            "config": {key: _encode_value(value) for key, value in config.get_key_values().items()},
+        }
+
+        if fingerprint is not None:
+            entry["fingerprint"] = fingerprint
+
+        if provisional:
+            entry["provisional"] = True
 
-    def _serialize(self, x: dict) -> dict:
-        result = {}
+        if timed_configs is not None:
+            entry["timed_configs"] = [
+                {"config": {key: _encode_value(value) for key, value in key_values.items()}, "time": time}
+                for key_values, time in timed_configs
+            ]
 
-        for function_hash in x:
-            function_cache = x[function_hash]
-            result[function_hash] = {}
+        if failed_configs is not None:
+            entry["failed_configs"] = [
+                {"config": {key: _encode_value(value) for key, value in key_values.items()}, "error": error}
+                for key_values, error in failed_configs
+            ]
 
-            for lookup_key, config in function_cache.items():
-                result[function_hash][lookup_key] = {key: value for key, value in config.get_key_values().items()}
+        return json.dumps(entry) + "\n"
 
-        return result
+    def _deserialize(
+        self, entry: dict
+    ) -> tuple[
+        str, CutoTuneConfig | None, list[tuple[dict, float]] | None, str | None, list[tuple[dict, str]] | None, bool
+    ]:
+        try:
+            config = CutoTuneConfig({key: _decode_value(value) for key, value in entry["config"].items()})
+            timed_configs = entry.get("timed_configs", None)
 
-    def _deserialize(self, x: dict) -> dict:
-        result = {}
+            if timed_configs is not None:
+                timed_configs = [
+                    (
+                        {key: _decode_value(value) for key, value in timed_config["config"].items()},
+                        timed_config["time"],
+                    )
+                    for timed_config in timed_configs
+                ]
 
-        for function_hash in x:
-            function_cache = x[function_hash]
-            result[function_hash] = {}
+            failed_configs = entry.get("failed_configs", None)
 
-            for lookup_key, config in function_cache.items():
-                result[function_hash][lookup_key] = CutoTuneConfig({key: value for key, value in config.items()})
+            if failed_configs is not None:
+                failed_configs = [
+                    (
+                        {key: _decode_value(value) for key, value in failed_config["config"].items()},
+                        failed_config["error"],
+                    )
+                    for failed_config in failed_configs
+                ]
+        except (AttributeError, ImportError, ValueError):
+            # config refers to a value that no longer exists in the code
+            return entry["lookup_key"], None, None, None, None, False
 
-        return result
+        return (
+            entry["lookup_key"],
+            config,
+            timed_configs,
+            entry.get("fingerprint", None),
+            failed_configs,
+            entry.get("provisional", False),
+        )
 
 
 _CUTOTUNE_CACHE = None
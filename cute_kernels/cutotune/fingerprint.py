@@ -0,0 +1,125 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import hashlib
+import inspect
+import types
+from typing import Any, Callable
+
+from .cache import _encode_value
+from .config import CutoTuneConfig
+
+
+_PACKAGE_NAME = __name__.split(".")[0]
+_MAX_DEPTH = 4
+
+
+def _get_source(obj: Any) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        # no source available (for example in an interactive session), fall back to the bytecode
+        code = getattr(obj, "__code__", None)
+        return "" if code is None else code.co_code.hex()
+
+
+def _get_referenced_names(code: types.CodeType) -> set[str]:
+    names = set(code.co_names)
+
+    # nested functions and lambdas have their own code objects
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names.update(_get_referenced_names(constant))
+
+    return names
+
+
+def _get_python_function(obj: Any) -> Callable | None:
+    # triton kernels keep the python function in fn, @triton.autotune and @triton.heuristics wrap the jitted kernel so
+    # there can be several levels of them
+    while not inspect.isfunction(obj):
+        obj = getattr(obj, "fn", None)
+        if obj is None:
+            return None
+
+    return obj
+
+
+def _is_discoverable(obj: Any, root_module: str) -> bool:
+    # @triton.autotune and @triton.heuristics report the module of triton, the module of the kernel is what matters
+    function = _get_python_function(obj)
+    module = getattr(obj if function is None else function, "__module__", None)
+    if not isinstance(module, str):
+        return False
+
+    return module == root_module or module == _PACKAGE_NAME or module.startswith(f"{_PACKAGE_NAME}.")
+
+
+def _update_with_object(digest: Any, obj: Any, root_module: str, visited: set[int], depth: int) -> None:
+    if id(obj) in visited or depth > _MAX_DEPTH:
+        return
+
+    visited.add(id(obj))
+
+    # cute_op and cpp_jit wrappers expose the wrapped function, cpp_jit also exposes the C++/CUDA sources
+    while True:
+        for filename in sorted(getattr(obj, "source_files", [])):
+            digest.update(filename.encode())
+
+            try:
+                with open(filename, "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                pass
+
+        wrapped = getattr(obj, "__wrapped__", None)
+        if wrapped is None:
+            break
+
+        obj = wrapped
+
+    function = _get_python_function(obj)
+    if function is None:
+        if inspect.isclass(obj):
+            digest.update(_get_source(obj).encode())
+
+        return
+
+    digest.update(_get_source(function).encode())
+
+    for name in sorted(_get_referenced_names(function.__code__)):
+        referenced_obj = function.__globals__.get(name, None)
+
+        if referenced_obj is None or not _is_discoverable(referenced_obj, root_module):
+            continue
+
+        # jitted and autotuned triton kernels are launched with kernel[grid](...) and aren't callable themselves
+        if callable(referenced_obj) or _get_python_function(referenced_obj) is not None:
+            _update_with_object(digest, referenced_obj, root_module, visited, depth + 1)
+
+
+def get_cutotune_fingerprint(function: Callable, configs: list[CutoTuneConfig]) -> str:
+    """fingerprints a @cutotune function, changes to its source, the source of the kernels it dispatches to (functions,
+    triton kernels and C++/CUDA sources that are referenced from this package or the module of the function) and its
+    config space change the fingerprint
+
+    Args:
+        function (Callable): the function that is tuned
+        configs (list[CutoTuneConfig]): candidate configs
+
+    Returns:
+        str: the fingerprint
+    """
+
+    digest = hashlib.sha256()
+    _update_with_object(digest, function, root_module=function.__module__, visited=set(), depth=0)
+
+    for config in configs:
+        key_values = sorted((key, repr(_encode_value(value))) for key, value in config.get_key_values().items())
+        digest.update(repr(key_values).encode())
+
+        if config.condition is not None:
+            digest.update(_get_source(config.condition).encode())
+
+    return digest.hexdigest()[:16]
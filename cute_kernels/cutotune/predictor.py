@@ -0,0 +1,161 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import math
+import re
+
+
+# integers that are not a part of a name, the digits in torch.bfloat16 are not features
+_INTEGER_PATTERN = re.compile(r"(?<![\w.-])-?\d+(?![\w.])")
+
+
+def get_lookup_key_features(lookup_key: str) -> tuple[str, tuple[int]]:
+    # the integers in the lookup key (sizes, strides, scalar triggers) are the features, everything else (dtypes,
+    # names of the triggers) has to match exactly for 2 lookup keys to be comparable
+    features = tuple(int(feature) for feature in _INTEGER_PATTERN.findall(lookup_key))
+    signature = _INTEGER_PATTERN.sub("#", lookup_key)
+    return signature, features
+
+
+class NearestNeighbourPredictor:
+    """predicts configs for a new lookup key from the benchmark timings of the closest lookup keys that were already
+    tuned. Lookup keys are only comparable if they only differ in their integers, the distance between them is the L1
+    distance of the log2 of their integers so that 1024 vs 2048 is as close as 4096 vs 8192.
+
+    With `num_candidates = 1` the predicted config is used without benchmarking, otherwise only the predicted
+    candidates are benchmarked.
+    """
+
+    def __init__(self, num_candidates: int = 3, num_neighbours: int = 2, max_distance: float = 2) -> None:
+        assert num_candidates > 0, "num_candidates should be positive"
+        assert num_neighbours > 0, "num_neighbours should be positive"
+
+        self.num_candidates = num_candidates
+        self.num_neighbours = num_neighbours
+        self.max_distance = max_distance
+
+    def predict(self, lookup_key: str, timed_configs: dict[str, list[tuple[dict, float]]]) -> list[dict] | None:
+        """predicts the best configs for a lookup key
+
+        Args:
+            lookup_key (str): lookup key to predict for
+            timed_configs (dict[str, list[tuple[dict, float]]]): lookup key -> list of key values of the config and
+                its time for the lookup keys that were already tuned
+
+        Returns:
+            list[dict] | None: key values of the candidate configs ordered from the best to the worst, None if there
+                are no tuned lookup keys close enough
+        """
+
+        neighbours = self._get_neighbours(lookup_key, timed_configs)
+        if len(neighbours) == 0:
+            return None
+
+        # every config is scored by its slowdown relative to the fastest config of each neighbour, configs that were
+        # not timed for a neighbour count as infinitely slow for it
+        scores = {}
+        for neighbour_lookup_key in neighbours:
+            neighbour_timed_configs = timed_configs[neighbour_lookup_key]
+            best_time = min(time for _, time in neighbour_timed_configs)
+
+            for key_values, time in neighbour_timed_configs:
+                key = _get_hashable_key_values(key_values)
+                slowdown = _get_slowdown(time, best_time)
+
+                if key not in scores:
+                    scores[key] = (key_values, [])
+
+                scores[key][1].append(slowdown)
+
+        candidates = sorted(scores.values(), key=lambda x: (len(x[1]) < len(neighbours), sum(x[1]) / len(x[1])))
+
+        return [key_values for key_values, _ in candidates[: self.num_candidates]]
+
+    def evaluate(self, timed_configs: dict[str, list[tuple[dict, float]]]) -> dict:
+        """leave-one-out evaluation of the predictor on the timings of a function, every tuned lookup key is
+        predicted from the remaining ones
+
+        Args:
+            timed_configs (dict[str, list[tuple[dict, float]]]): lookup key -> list of key values of the config and
+                its time
+
+        Returns:
+            dict: `num_lookup_keys`, `coverage` (fraction of keys with a prediction) and, over the predicted keys,
+                `top_1_accuracy` (the predicted config is the fastest), `top_k_recall` (the fastest config is a
+                candidate), `mean_slowdown` and `max_slowdown` of the best candidate relative to the fastest config
+        """
+
+        num_predicted = 0
+        num_top_1 = 0
+        num_top_k = 0
+        slowdowns = []
+
+        for lookup_key, lookup_key_timed_configs in timed_configs.items():
+            remaining = {key: value for key, value in timed_configs.items() if key != lookup_key}
+            candidates = self.predict(lookup_key, remaining)
+            if candidates is None:
+                continue
+
+            num_predicted += 1
+
+            times = {_get_hashable_key_values(key_values): time for key_values, time in lookup_key_timed_configs}
+            best_key = min(times, key=times.get)
+            candidate_keys = [_get_hashable_key_values(key_values) for key_values in candidates]
+
+            num_top_1 += candidate_keys[0] == best_key
+            num_top_k += best_key in candidate_keys
+
+            # benchmarking the candidates would pick the fastest among them
+            candidate_time = min((times[key] for key in candidate_keys if key in times), default=math.inf)
+            slowdowns.append(_get_slowdown(candidate_time, times[best_key]))
+
+        num_lookup_keys = len(timed_configs)
+
+        return {
+            "num_lookup_keys": num_lookup_keys,
+            "coverage": num_predicted / num_lookup_keys if num_lookup_keys > 0 else 0,
+            "top_1_accuracy": num_top_1 / num_predicted if num_predicted > 0 else 0,
+            "top_k_recall": num_top_k / num_predicted if num_predicted > 0 else 0,
+            "mean_slowdown": sum(slowdowns) / num_predicted if num_predicted > 0 else math.nan,
+            "max_slowdown": max(slowdowns, default=math.nan),
+        }
+
+    def _get_neighbours(self, lookup_key: str, timed_configs: dict[str, list[tuple[dict, float]]]) -> list[str]:
+        signature, features = get_lookup_key_features(lookup_key)
+        distances = []
+
+        for neighbour_lookup_key, neighbour_timed_configs in timed_configs.items():
+            if len(neighbour_timed_configs) == 0:
+                continue
+
+            neighbour_signature, neighbour_features = get_lookup_key_features(neighbour_lookup_key)
+            if neighbour_signature != signature:
+                continue
+
+            distance = sum(
+                abs(_log2(feature) - _log2(neighbour_feature))
+                for feature, neighbour_feature in zip(features, neighbour_features)
+            )
+
+            if distance <= self.max_distance:
+                distances.append((distance, neighbour_lookup_key))
+
+        distances.sort()
+        return [neighbour_lookup_key for _, neighbour_lookup_key in distances[: self.num_neighbours]]
+
+
+def _log2(value: int) -> float:
+    return math.copysign(math.log2(abs(value) + 1), value)
+
+
+def _get_hashable_key_values(key_values: dict) -> tuple:
+    return tuple(sorted(key_values.items(), key=lambda x: x[0]))
+
+
+def _get_slowdown(time: float, best_time: float) -> float:
+    # a config that is slower than a best time of 0 is infinitely slower
+    if best_time > 0:
+        return time / best_time
+
+    return 1.0 if time == best_time else math.inf
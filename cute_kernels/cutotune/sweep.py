@@ -0,0 +1,252 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import importlib
+import json
+import os
+from argparse import ArgumentParser, Namespace
+from itertools import product
+from typing import Any, Callable
+
+import torch
+
+from ..utils import file_lock
+from . import cache
+from .budget import ignore_cutotune_budgets
+from .cache import _CutoTuneCache
+from .parameter import CutoTuneParameter
+from .timer import get_default_device
+from .tuner import _CutoTune
+
+
+# manifest format:
+#
+# device: cuda                                  # optional, defaults to the default accelerator
+# sweeps:
+#   - name: add_tensor                          # unique name, used to track progress
+#     function: cute_kernels.add_tensor_cute    # import path of a @cutotune function or a function that calls them
+#     backward: false                           # also run the backward of the outputs
+#     grid:                                     # symbols, the sweep runs over their cartesian product
+#       num_tokens: [1024, 2048]
+#       dtype: [float32, bfloat16]
+#     arguments:
+#       x: {shape: [num_tokens, 4096], dtype: dtype}    # tensors, shapes can be expressions of the symbols
+#       y: {shape: [num_tokens, 4096], dtype: dtype}
+#       labels: {shape: [num_tokens], dtype: int64, high: 50304}    # integer tensors are sampled from [0, high)
+#       eps: 1.0e-5                                                 # everything else is passed as is
+
+
+def _import_object(path: str) -> Any:
+    module_name, *attributes = path.split(".")
+    module = importlib.import_module(module_name)
+
+    # resolve the longest importable module prefix, the rest are attributes
+    for i, attribute in enumerate(attributes):
+        module_name = f"{module.__name__}.{attribute}"
+
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as error:
+            # a missing dependency of the module is a real import error, only a missing module means the rest of the
+            # path are attributes
+            if error.name != module_name:
+                raise
+
+            attributes = attributes[i:]
+            break
+    else:
+        return module
+
+    result = module
+    for attribute in attributes:
+        result = getattr(result, attribute)
+
+    return result
+
+
+def _resolve_value(value: Any, point: dict) -> Any:
+    if isinstance(value, str) and value in point:
+        return point[value]
+
+    return value
+
+
+def _resolve_dtype(dtype: Any, point: dict) -> torch.dtype:
+    dtype = _resolve_value(dtype, point)
+    return dtype if isinstance(dtype, torch.dtype) else getattr(torch, dtype)
+
+
+def _resolve_size(size: Any, point: dict) -> int:
+    if isinstance(size, int):
+        return size
+
+    # the manifest is trusted input, expressions only see the symbols of the grid
+    return int(eval(str(size), {"__builtins__": {}}, dict(point)))
+
+
+def _make_argument(spec: Any, point: dict, device: torch.device) -> Any:
+    if not isinstance(spec, dict) or "shape" not in spec:
+        return _resolve_value(spec, point)
+
+    shape = [_resolve_size(size, point) for size in spec["shape"]]
+    dtype = _resolve_dtype(spec.get("dtype", "float32"), point)
+
+    if dtype.is_floating_point:
+        tensor = torch.randn(*shape, dtype=dtype, device=device)
+    elif dtype == torch.bool:
+        tensor = torch.randint(0, 2, shape, device=device).to(dtype)
+    else:
+        tensor = torch.randint(0, _resolve_size(spec.get("high", 2), point), shape, dtype=dtype, device=device)
+
+    if spec.get("requires_grad", False):
+        tensor.requires_grad_()
+
+    return tensor
+
+
+def _get_grid_points(grid: dict) -> list[dict]:
+    return [dict(zip(grid.keys(), values)) for values in product(*grid.values())]
+
+
+def _get_progress_key(sweep_name: str, point: dict) -> str:
+    return json.dumps({"sweep": sweep_name, "point": point}, sort_keys=True)
+
+
+def _load_progress(filename: str) -> set[str]:
+    if not os.path.exists(filename):
+        return set()
+
+    with open(filename, "r") as f:
+        # an incomplete last line is from an interrupted write and is ignored
+        return {line[:-1] for line in f if line.endswith("\n")}
+
+
+def _mark_done(filename: str, progress_key: str) -> None:
+    with file_lock(filename), open(filename, "a") as f:
+        f.write(progress_key + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _run_backward(output: Any) -> None:
+    outputs = output if isinstance(output, (tuple, list)) else [output]
+    outputs = [output for output in outputs if isinstance(output, torch.Tensor) and output.requires_grad]
+
+    if len(outputs) > 0:
+        torch.autograd.backward(outputs, [torch.ones_like(output) for output in outputs])
+
+
+def _run_point(function: Callable, sweep: dict, point: dict, device: torch.device) -> None:
+    kwargs = {
+        variable_name: _make_argument(spec, point, device)
+        for variable_name, spec in sweep.get("arguments", {}).items()
+    }
+
+    # tunable arguments of a @cutotune function that are not in the manifest are tuned
+    if isinstance(function, _CutoTune):
+        for variable_name in function.cutotuneable_parameters:
+            kwargs.setdefault(variable_name, CutoTuneParameter())
+
+    output = function(**kwargs)
+
+    if sweep.get("backward", False):
+        _run_backward(output)
+
+
+def run_sweep(manifest: dict, progress_filename: str, device: torch.device | None = None) -> int:
+    """runs every sweep of the manifest over its grid so that the tuned configs end up in the persistent cutotune
+    cache, points that are recorded in the progress file are skipped. Tuning budgets are ignored and provisional
+    configs are tuned again.
+
+    Args:
+        manifest (dict): the parsed manifest
+        progress_filename (str): file that records the finished points, used to resume an interrupted sweep
+        device (torch.device | None, optional): device to run on, None uses the device in the manifest or the default
+            accelerator. Defaults to None.
+
+    Returns:
+        int: number of points that were run
+    """
+
+    if device is None:
+        device = torch.device(manifest["device"]) if "device" in manifest else get_default_device()
+
+    sweeps = manifest["sweeps"]
+    sweep_names = [sweep["name"] for sweep in sweeps]
+    assert len(set(sweep_names)) == len(sweep_names), "sweep names should be unique"
+
+    done = _load_progress(progress_filename)
+    num_points = 0
+
+    for sweep in sweeps:
+        function = _import_object(sweep["function"])
+
+        for point in _get_grid_points(sweep.get("grid", {})):
+            progress_key = _get_progress_key(sweep["name"], point)
+            if progress_key in done:
+                continue
+
+            print(f"tuning {sweep['name']} for {point}")
+            with ignore_cutotune_budgets():
+                _run_point(function, sweep, point, device)
+
+            # the configs are persisted before the point is marked as done so that an interruption never loses them
+            cache.get_cutotune_cache().save()
+            _mark_done(progress_filename, progress_key)
+
+            num_points += 1
+
+    return num_points
+
+
+def get_args() -> Namespace:
+    parser = ArgumentParser(description="tune @cutotune functions ahead of time for the shapes in a manifest")
+    parser.add_argument("manifest", type=str, help="YAML manifest of the functions and shapes to tune")
+    parser.add_argument("--device", type=str, default=None, help="device to tune on")
+    parser.add_argument("--cache-dir", type=str, default=None, help="directory of the persistent cutotune cache")
+    parser.add_argument("--namespace", type=str, default=None, help="namespace inside the cache directory")
+    parser.add_argument(
+        "--progress-file",
+        type=str,
+        default=None,
+        help="file that records the finished points, defaults to a file inside the cache namespace",
+    )
+    parser.add_argument("--restart", action="store_true", help="ignore the progress of a previous run")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    # yaml is only needed by the command line interface
+    import yaml
+
+    args = get_args()
+
+    with open(args.manifest, "r") as f:
+        manifest = yaml.safe_load(f)
+
+    # tuned configs are written to disk as soon as they are tuned so that an interrupted sweep loses nothing
+    cache._CUTOTUNE_CACHE = _CutoTuneCache(
+        directory=args.cache_dir, namespace=args.namespace, load=True, autosave=True, save_interval=0
+    )
+
+    progress_filename = args.progress_file
+    if progress_filename is None:
+        manifest_name = os.path.splitext(os.path.basename(args.manifest))[0]
+        progress_filename = os.path.join(cache._CUTOTUNE_CACHE.directory, "sweeps", f"{manifest_name}.progress")
+
+    if args.restart and os.path.exists(progress_filename):
+        os.remove(progress_filename)
+
+    num_points = run_sweep(
+        manifest,
+        progress_filename=progress_filename,
+        device=None if args.device is None else torch.device(args.device),
+    )
+
+    print(f"tuned {num_points} points, progress is recorded in {progress_filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import csv
+import json
+import os
+import threading
+from enum import Enum
+from typing import Any
+
+from .benchmark import TimingStatistics
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return str(value)
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    return str(value)
+
+
+def _to_json_config(key_values: dict) -> dict:
+    return {key: _to_json_value(value) for key, value in key_values.items()}
+
+
+class TuningRecord:
+    """timings of a single tuning of a lookup key, times are in milliseconds and timestamps are in seconds"""
+
+    def __init__(
+        self,
+        function_hash: str,
+        function_name: str,
+        lookup_key: str,
+        best_config: dict,
+        best_time: float | None,
+        timed_configs: list[tuple[dict, TimingStatistics, float]],
+        num_configs: int,
+        num_pruned_by_condition: int,
+        predicted: bool,
+        start_time: float,
+        wall_time: float,
+        benchmark_spans: list[tuple[dict, float, float]],
+        failed_configs: list[tuple[dict, str]],
+        provisional: bool,
+    ) -> None:
+        self.function_hash = function_hash
+        self.function_name = function_name
+        self.lookup_key = lookup_key
+        self.best_config = best_config
+        self.best_time = best_time
+        # key values of the config, its timing statistics and the time that was compared
+        self.timed_configs = timed_configs
+        self.num_configs = num_configs
+        self.num_pruned_by_condition = num_pruned_by_condition
+        # the config was predicted without benchmarking
+        self.predicted = predicted
+        self.start_time = start_time
+        self.wall_time = wall_time
+        # key values of the config, start timestamp and duration of every benchmark of a config
+        self.benchmark_spans = benchmark_spans
+        # key values of the configs that raised and their errors, including the ones blacklisted by earlier tunings
+        self.failed_configs = failed_configs
+        # the tuning budget ran out before all the configs were benchmarked
+        self.provisional = provisional
+        self.process_id = os.getpid()
+        self.thread_id = threading.get_ident()
+
+    @property
+    def num_pruned_by_benchmark(self) -> int:
+        return sum(statistics.pruned for _, statistics, _ in self.timed_configs)
+
+    def to_dict(self) -> dict:
+        return {
+            "function_hash": self.function_hash,
+            "function_name": self.function_name,
+            "lookup_key": self.lookup_key,
+            "best_config": _to_json_config(self.best_config),
+            "best_time": self.best_time,
+            "num_configs": self.num_configs,
+            "num_pruned_by_condition": self.num_pruned_by_condition,
+            "num_pruned_by_benchmark": self.num_pruned_by_benchmark,
+            "predicted": self.predicted,
+            "provisional": self.provisional,
+            "start_time": self.start_time,
+            "wall_time": self.wall_time,
+            "timed_configs": [
+                {
+                    "config": _to_json_config(key_values),
+                    "time": time,
+                    "relative_time": time / self.best_time if self.best_time else None,
+                    "median": statistics.median,
+                    "mean": statistics.mean,
+                    "trimmed_mean": statistics.trimmed_mean,
+                    "num_samples": statistics.num_samples,
+                    "pruned": statistics.pruned,
+                }
+                for key_values, statistics, time in self.timed_configs
+            ],
+            "failed_configs": [
+                {"config": _to_json_config(key_values), "error": error} for key_values, error in self.failed_configs
+            ],
+        }
+
+
+class _CutoTuneTelemetry:
+    """records every tuning that happens in this process"""
+
+    def __init__(self) -> None:
+        self.records = []
+        self.lock = threading.Lock()
+
+    def add_record(self, record: TuningRecord) -> None:
+        with self.lock:
+            self.records.append(record)
+
+    def get_records(self, function_hash: str | None = None, lookup_key: str | None = None) -> list[TuningRecord]:
+        with self.lock:
+            records = list(self.records)
+
+        return [
+            record
+            for record in records
+            if (function_hash is None or record.function_hash == function_hash)
+            and (lookup_key is None or record.lookup_key == lookup_key)
+        ]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.records = []
+
+    def to_json(self, filename: str) -> None:
+        with open(filename, "w") as f:
+            json.dump([record.to_dict() for record in self.get_records()], f, indent=4)
+
+    def to_csv(self, filename: str) -> None:
+        # one row per benchmarked config
+        columns = [
+            "function_hash",
+            "lookup_key",
+            "config",
+            "time",
+            "relative_time",
+            "median",
+            "mean",
+            "trimmed_mean",
+            "num_samples",
+            "pruned",
+            "is_best",
+            "error",
+            "num_configs",
+            "num_pruned_by_condition",
+            "tuning_wall_time",
+        ]
+
+        with open(filename, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+
+            for record in self.get_records():
+                record_dict = record.to_dict()
+
+                for timed_config in record_dict["timed_configs"]:
+                    writer.writerow(
+                        {
+                            "function_hash": record.function_hash,
+                            "lookup_key": record.lookup_key,
+                            "config": json.dumps(timed_config["config"]),
+                            "time": timed_config["time"],
+                            "relative_time": timed_config["relative_time"],
+                            "median": timed_config["median"],
+                            "mean": timed_config["mean"],
+                            "trimmed_mean": timed_config["trimmed_mean"],
+                            "num_samples": timed_config["num_samples"],
+                            "pruned": timed_config["pruned"],
+                            "is_best": timed_config["config"] == record_dict["best_config"],
+                            "num_configs": record.num_configs,
+                            "num_pruned_by_condition": record.num_pruned_by_condition,
+                            "tuning_wall_time": record.wall_time,
+                        }
+                    )
+
+                for failed_config in record_dict["failed_configs"]:
+                    writer.writerow(
+                        {
+                            "function_hash": record.function_hash,
+                            "lookup_key": record.lookup_key,
+                            "config": json.dumps(failed_config["config"]),
+                            "is_best": False,
+                            "error": failed_config["error"],
+                            "num_configs": record.num_configs,
+                            "num_pruned_by_condition": record.num_pruned_by_condition,
+                            "tuning_wall_time": record.wall_time,
+                        }
+                    )
+
+    def to_chrome_trace(self, filename: str) -> None:
+        # complete events that can be opened in chrome://tracing or perfetto, every tuning is a span with the
+        # benchmarks of its configs nested inside
+        events = []
+
+        for record in self.get_records():
+            events.append(
+                {
+                    "name": f"cutotune {record.function_name}",
+                    "cat": "cutotune",
+                    "ph": "X",
+                    "ts": record.start_time * 1e6,
+                    "dur": record.wall_time * 1e6,
+                    "pid": record.process_id,
+                    "tid": record.thread_id,
+                    "args": {
+                        "function_hash": record.function_hash,
+                        "lookup_key": record.lookup_key,
+                        "best_config": _to_json_config(record.best_config),
+                        "best_time": record.best_time,
+                        "num_configs": record.num_configs,
+                        "num_pruned_by_condition": record.num_pruned_by_condition,
+                        "num_pruned_by_benchmark": record.num_pruned_by_benchmark,
+                        "num_failed": len(record.failed_configs),
+                        "provisional": record.provisional,
+                    },
+                }
+            )
+
+            for key_values, start_time, duration in record.benchmark_spans:
+                events.append(
+                    {
+                        "name": json.dumps(_to_json_config(key_values)),
+                        "cat": "cutotune_benchmark",
+                        "ph": "X",
+                        "ts": start_time * 1e6,
+                        "dur": duration * 1e6,
+                        "pid": record.process_id,
+                        "tid": record.thread_id,
+                    }
+                )
+
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+_CUTOTUNE_TELEMETRY = _CutoTuneTelemetry()
+
+
+def get_cutotune_telemetry() -> _CutoTuneTelemetry:
+    return _CUTOTUNE_TELEMETRY
@@ -0,0 +1,117 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import time
+from abc import ABC, abstractmethod
+
+import torch
+
+from ..utils import device_synchronize
+
+
+class _Timer(ABC):
+    def __init__(self, device: torch.device) -> None:
+        self.device = device
+
+    @abstractmethod
+    def start(self) -> None: ...
+
+    @abstractmethod
+    def stop(self) -> None: ...
+
+    @abstractmethod
+    def get_elapsed_time(self) -> float:
+        """returns the time between the last `start` and `stop` calls in milliseconds, waits for the device to finish
+
+        Returns:
+            float: elapsed time in milliseconds
+        """
+
+
+class _EventTimer(_Timer):
+    event_class: type
+
+    def __init__(self, device: torch.device) -> None:
+        super().__init__(device)
+
+        self.start_event = self.event_class(enable_timing=True)
+        self.end_event = self.event_class(enable_timing=True)
+
+    def start(self) -> None:
+        self.start_event.record()
+
+    def stop(self) -> None:
+        self.end_event.record()
+
+    def get_elapsed_time(self) -> float:
+        device_synchronize(self.device)
+        return self.start_event.elapsed_time(self.end_event)
+
+
+class CUDATimer(_EventTimer):
+    event_class = torch.cuda.Event
+
+
+class XPUTimer(_EventTimer):
+    event_class = torch.xpu.Event if hasattr(torch, "xpu") else None
+
+
+class CPUTimer(_Timer):
+    def __init__(self, device: torch.device) -> None:
+        super().__init__(device)
+
+        self.start_time = None
+        self.end_time = None
+
+    def start(self) -> None:
+        device_synchronize(self.device)
+        self.start_time = time.perf_counter_ns()
+
+    def stop(self) -> None:
+        device_synchronize(self.device)
+        self.end_time = time.perf_counter_ns()
+
+    def get_elapsed_time(self) -> float:
+        return (self.end_time - self.start_time) / 1e6
+
+
+_TIMERS = {"cuda": CUDATimer, "xpu": XPUTimer, "cpu": CPUTimer}
+
+
+def get_default_device() -> torch.device:
+    if torch.cuda.is_available():
+        device = torch.device("cuda")
+    elif hasattr(torch, "xpu") and torch.xpu.is_available():
+        device = torch.device("xpu")
+    else:
+        device = torch.device("cpu")
+
+    return device
+
+
+def get_device_from_arguments(**kwargs) -> torch.device:
+    # the first tensor argument decides the device, falls back to the default accelerator if there is none
+    for variable_name in kwargs:
+        value = kwargs.get(variable_name)
+
+        if isinstance(value, torch.Tensor):
+            return value.device
+
+    return get_default_device()
+
+
+def get_timer(device: torch.device) -> _Timer:
+    """returns a timer that measures the execution time of work queued on `device`
+
+    Args:
+        device (torch.device): device on which the timed work runs
+
+    Returns:
+        _Timer: timer for the device
+    """
+
+    timer_class = _TIMERS.get(device.type, None)
+    assert timer_class is not None, f"unsupported device type ({device.type}) for timing"
+
+    return timer_class(device)
@@ -3,22 +3,91 @@
 # **************************************************
 
 import inspect
+import os
+import sys
+import time
+import weakref
 from collections import defaultdict
+from functools import cache
 from typing import Any, Callable
 
 import torch
 from tqdm import tqdm
 
 from ..utils import device_synchronize, get_boolean_env_variable
+from .background import ASYNC_TUNING_MODES, BACKGROUND, _TuningJob, clone_arguments, run_swap_hooks, submit_tuning_job
+from .benchmark import FixedIterationsBenchmark, TimingStatistics, _BenchmarkStrategy
+from .bucket import apply_bucket, get_bucket_name
+from .budget import _BudgetTracker, _TuningBudget, are_budgets_ignored
 from .cache import get_cutotune_cache
 from .config import CutoTuneConfig
+from .fingerprint import get_cutotune_fingerprint
 from .parameter import CutoTuneParameter
+from .predictor import NearestNeighbourPredictor
+from .telemetry import TuningRecord, get_cutotune_telemetry
+from .timer import get_device_from_arguments, get_timer
 
 
 _DEBUG_CUTOTUNE = get_boolean_env_variable("DEBUG_CUTOTUNE", False)
+_DISTRIBUTED_CUTOTUNE = get_boolean_env_variable("DISTRIBUTED_CUTOTUNE", False)
+# process-wide switch, it changes the default of every @cutotune function including the kernels of this package
+_ASYNC_CUTOTUNE = os.getenv("ASYNC_CUTOTUNE", "") or None
 _SEPARATOR = "."
 _DEFAULT_WARMUP_ITERATIONS = 5
 _BENCHMARK_ITERATIONS = 10
+_MAX_ERROR_LENGTH = 256
+
+assert (
+    _ASYNC_CUTOTUNE is None or _ASYNC_CUTOTUNE in ASYNC_TUNING_MODES
+), f"ASYNC_CUTOTUNE should be unset or one of {ASYNC_TUNING_MODES}, found ({_ASYNC_CUTOTUNE})"
+assert not (
+    _DISTRIBUTED_CUTOTUNE and _ASYNC_CUTOTUNE == BACKGROUND
+), "ASYNC_CUTOTUNE=background can't be used with DISTRIBUTED_CUTOTUNE, use ASYNC_CUTOTUNE=deferred instead"
+
+
+def _get_tensor_info(tensor: torch.Tensor) -> tuple:
+    return tensor.dtype, tensor.size(), tensor.stride()
+
+
+def _get_untyped_value(value: Any) -> Any:
+    # scalar triggers are (type, value) pairs in the dispatch key, values derived from tensors never start with a type
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], type):
+        return value[1]
+
+    return value
+
+
+# every @cutotune function, used to find the stale entries of the persistent cache
+_ALL_CUTOTUNE_FUNCTIONS = weakref.WeakSet()
+
+
+def _format_error(error: Exception) -> str:
+    # compile errors can span many lines, the first one is enough to identify the failure
+    lines = str(error).strip().splitlines()
+    message = lines[0] if len(lines) > 0 else ""
+    return f"{error.__class__.__name__}: {message[:_MAX_ERROR_LENGTH]}"
+
+
+@cache
+def _get_config_errors() -> tuple[type[Exception], ...]:
+    # errors that only invalidate the config that raised them: out of memory or out of resources at large block sizes
+    # and compile errors for unsupported dtypes. Anything else is a bug or a sticky CUDA error that would poison every
+    # config after it and is raised to the caller. triton is only imported when a function is tuned.
+    config_errors = [torch.OutOfMemoryError]
+
+    try:
+        from triton.compiler.errors import CompilationError
+        from triton.runtime import errors
+    except ImportError:
+        pass
+    else:
+        config_errors += [CompilationError, errors.OutOfResources]
+
+        # ptxas failures are reported separately by newer versions of triton
+        if hasattr(errors, "PTXASError"):
+            config_errors.append(errors.PTXASError)
+
+    return tuple(config_errors)
 
 
 class _CutoTune:
@@ -26,22 +95,48 @@ class _CutoTune:
         self,
         function: Callable,
         configs: list[CutoTuneConfig],
-        triggers: set[str],
+        triggers: set[str | tuple[str, Callable]],
         warmup_iterations: int,
         benchmark_iterations: int,
         functional_triggers: dict[str, Callable] = {},
         reset_to_zero: dict = {},
+        benchmark_strategy: _BenchmarkStrategy | None = None,
+        distributed: bool = False,
+        process_group: torch.distributed.ProcessGroup | None = None,
+        predictor: NearestNeighbourPredictor | None = None,
+        async_tuning: str | None = None,
+        default_config: CutoTuneConfig | None = None,
+        max_tuning_time: float | None = None,
+        max_configs: int | None = None,
+        max_iterations: int | None = None,
     ) -> None:
         assert len(configs) > 0, "no cutotune config is passed"
+        assert (
+            async_tuning is None or async_tuning in ASYNC_TUNING_MODES
+        ), f"async_tuning should be None or one of {ASYNC_TUNING_MODES}"
+        # collectives issued from the background thread can deadlock with the collectives of the main thread
+        assert not (
+            distributed and async_tuning == BACKGROUND
+        ), "background tuning can't be used with distributed tuning, use deferred tuning instead"
 
         self.function = function
         self.configs = configs
-        self.warmup_iterations = warmup_iterations
-        self.benchmark_iterations = benchmark_iterations
+        self.benchmark_strategy = (
+            FixedIterationsBenchmark(warmup_iterations=warmup_iterations, benchmark_iterations=benchmark_iterations)
+            if benchmark_strategy is None
+            else benchmark_strategy
+        )
+        self.distributed = distributed
+        self.process_group = process_group
+        self.predictor = predictor
+        self.async_tuning = async_tuning
+        self.default_config = default_config
+        self.budget = _TuningBudget(max_time=max_tuning_time, max_configs=max_configs, max_iterations=max_iterations)
 
         self.signature = inspect.getfullargspec(function)
         self.cutotuneable_parameters = set(self.configs[0].get_key_values().keys())
 
+        self.functional_triggers = functional_triggers
         self._setup_trigger_map(triggers)
 
         for config in self.configs:
@@ -49,65 +144,313 @@ class _CutoTune:
                 set(config.get_key_values().keys()) == self.cutotuneable_parameters
             ), "cutotune configs don't match the expected function signature"
 
-        self.functional_triggers = functional_triggers
         self.reset_to_zero = reset_to_zero
 
-        self.filename = inspect.stack()[2].filename.split("cute_kernels")[1][1:]
+        # inspect.stack() reads the source of every frame, walking the frames directly is much cheaper
+        filename = sys._getframe(2).f_code.co_filename
+        self.filename = filename.split("cute_kernels")[1][1:] if "cute_kernels" in filename else filename
         self.function_hash = f"{self.filename}->{function.__name__}"
 
         self.function_cache = {}
+        self._fingerprint = None
+
+        _ALL_CUTOTUNE_FUNCTIONS.add(self)
+
+    @property
+    def fingerprint(self) -> str:
+        # computed on the first miss, reading the sources of every kernel at import time would slow down the import
+        if self._fingerprint is None:
+            self._fingerprint = get_cutotune_fingerprint(self.function, self.configs)
+
+        return self._fingerprint
 
     def __call__(self, *args, **kwargs) -> Any:
-        override_cutotune_parameters = self._check_all_or_no_args_are_cutotune_parameters(*args, **kwargs)
-        lookup_key = self._get_lookup_key(*args, **kwargs)
+        override_allowed = self._check_all_or_no_args_are_cutotune_parameters(args, kwargs)
+        dispatch_key = self._get_dispatch_key(args, kwargs)
 
-        best_config = self.function_cache.get(lookup_key, None)
+        try:
+            best_config = self.function_cache.get(dispatch_key, None)
+        except TypeError:
+            # unhashable trigger values fall back to the string lookup key
+            dispatch_key = self._get_lookup_key(dispatch_key)
+            best_config = self.function_cache.get(dispatch_key, None)
 
         if best_config is None:
-            # bypass cutotune for single config
-            if len(self.configs) == 1:
-                best_config = self.configs[0]
-                best_time = 0
+            best_config = self._get_best_config(dispatch_key, args, kwargs)
+
+        return self.function(
+            **self._get_function_arguments(
+                config=best_config, args=args, kwargs=kwargs, override_allowed=override_allowed
+            )
+        )
+
+    def _get_best_config(self, dispatch_key: tuple | str, args: tuple, kwargs: dict) -> CutoTuneConfig:
+        lookup_key = self._get_lookup_key(dispatch_key)
+        best_config = self._get_config_from_persistent_cache(lookup_key)
+        provisional = best_config is not None and get_cutotune_cache().is_provisional(self.function_hash, lookup_key)
+
+        # the persistent cache can differ across ranks (node-local caches or a rank that reads the file while another
+        # rank appends to it), a rank that misses would wait forever in the collectives of tuning if the other ranks
+        # used their cached config
+        if self._is_distributed():
+            best_config, provisional = self._all_gather_cached_config(lookup_key, best_config, provisional)
+
+        # configs that were picked when the budget ran out are refined by offline sweeps or in the background
+        if provisional:
+            if are_budgets_ignored():
+                best_config = None
+            elif self.async_tuning is not None:
+                self.function_cache[dispatch_key] = best_config
+                self._submit_tuning_job(dispatch_key, lookup_key, args, kwargs)
+
+                return best_config
+
+        if best_config is None:
+            if self.async_tuning is None or len(self.configs) == 1:
+                best_config = self._tune(lookup_key, args, kwargs, use_budget=True)
             else:
-                best_config, best_time, _ = self._cutotune(*args, **kwargs)
+                # the default config is served until the tuned config is swapped in, it has to be in the cache before
+                # the job is submitted so that it can't overwrite the tuned config
+                best_config = self._get_default_config(args, kwargs)
+                self.function_cache[dispatch_key] = best_config
+                self._submit_tuning_job(dispatch_key, lookup_key, args, kwargs)
+
+                return best_config
+
+        self.function_cache[dispatch_key] = best_config
 
-            self.function_cache[lookup_key] = best_config
+        return best_config
+
+    def _tune(
+        self, lookup_key: str, args: tuple, kwargs: dict, use_budget: bool, force_eager: bool = True
+    ) -> CutoTuneConfig:
+        # bypass cutotune for single config
+        if len(self.configs) == 1:
+            best_config = self.configs[0]
             get_cutotune_cache().add_config(
-                function_hash=self.function_hash, lookup_key=lookup_key, config=best_config
+                function_hash=self.function_hash,
+                lookup_key=lookup_key,
+                config=best_config,
+                fingerprint=self.fingerprint,
             )
+            return best_config
+
+        start_time = time.time()
+        start = time.perf_counter()
+
+        # asynchronous tuning doesn't block the caller so it always tunes all the configs
+        is_limited = use_budget and not are_budgets_ignored()
+        budget_tracker = _BudgetTracker(self.budget if is_limited and not self.budget.is_unlimited() else None)
+
+        # predictions stand in for benchmarks on the critical path, refining a provisional config benchmarks them
+        candidate_configs = self._get_predicted_configs(lookup_key, args, kwargs) if is_limited else None
+        predicted = candidate_configs is not None and len(candidate_configs) == 1
+        # an untimed guess is refined later like a config that was picked when the budget ran out
+        provisional = predicted
 
-            if _DEBUG_CUTOTUNE and (not torch.distributed.is_initialized() or torch.distributed.get_rank() == 0):
-                print(
-                    f"config {best_config} achieved the best time ({best_time} sec) for {lookup_key} for "
-                    f"function {self.function.__name__}"
+        timed_configs = []
+        benchmark_spans = []
+        num_pruned_by_condition = 0
+        failed_configs = self._get_failed_configs(lookup_key)
+
+        if predicted:
+            best_config = candidate_configs[0]
+            best_time = None
+        else:
+            configs = self.configs if candidate_configs is None else candidate_configs
+            valid_configs = self._get_valid_configs(configs, args, kwargs)
+            num_pruned_by_condition = len(configs) - len(valid_configs)
+
+            # configs that raised for this lookup key before are never retried
+            failed_config_ids = {id(config) for config, _ in failed_configs}
+            valid_configs = [config for config in valid_configs if id(config) not in failed_config_ids]
+
+            cutotune_kwargs = {
+                "lookup_key": lookup_key,
+                "args": args,
+                "kwargs": kwargs,
+                "configs": valid_configs,
+                "benchmark_spans": benchmark_spans,
+                "budget_tracker": budget_tracker,
+            }
+
+            # set_stance is process-global so it is only entered when the thread that tunes is the one that waits for
+            # the result, in the background it would silently run the compiled regions of every other thread eagerly.
+            # Both are entered here rather than used as decorators so that importing the tuner doesn't import
+            # torch._dynamo.
+            if force_eager:
+                with torch.compiler.set_stance("force_eager"):
+                    best_config, best_time, timed_configs, new_failed_configs = self._cutotune(**cutotune_kwargs)
+            else:
+                best_config, best_time, timed_configs, new_failed_configs = torch.compiler.disable(self._cutotune)(
+                    **cutotune_kwargs
                 )
 
-        output = self.function(
-            **self._get_function_arguments(
-                config=best_config,
-                args=args,
-                kwargs=kwargs,
-                override_allowed=override_cutotune_parameters,
+            failed_configs = failed_configs + new_failed_configs
+            provisional = budget_tracker.exhausted
+
+        timed_configs = [
+            (config, statistics, self.benchmark_strategy.get_time(statistics)) for config, statistics in timed_configs
+        ]
+
+        get_cutotune_cache().add_config(
+            function_hash=self.function_hash,
+            lookup_key=lookup_key,
+            config=best_config,
+            timed_configs=None if predicted else [(config, elapsed_time) for config, _, elapsed_time in timed_configs],
+            fingerprint=self.fingerprint,
+            failed_configs=failed_configs if len(failed_configs) > 0 else None,
+            provisional=provisional,
+        )
+
+        get_cutotune_telemetry().add_record(
+            TuningRecord(
+                function_hash=self.function_hash,
+                function_name=self.function.__name__,
+                lookup_key=lookup_key,
+                best_config=best_config.get_key_values(),
+                best_time=best_time,
+                timed_configs=[
+                    (config.get_key_values(), statistics, elapsed_time)
+                    for config, statistics, elapsed_time in timed_configs
+                ],
+                failed_configs=[(config.get_key_values(), error) for config, error in failed_configs],
+                provisional=provisional,
+                num_configs=len(self.configs),
+                num_pruned_by_condition=num_pruned_by_condition,
+                predicted=predicted,
+                start_time=start_time,
+                wall_time=time.perf_counter() - start,
+                benchmark_spans=benchmark_spans,
             )
         )
 
-        return output
+        if _DEBUG_CUTOTUNE and (not torch.distributed.is_initialized() or torch.distributed.get_rank() == 0):
+            print(
+                f"config {best_config} achieved the best time ({best_time} ms) for {lookup_key} for "
+                f"function {self.function.__name__}"
+                + (f", provisional since {self.budget} ran out" if budget_tracker.exhausted else "")
+                + (", provisional since it was predicted" if predicted else "")
+            )
 
-    def _check_all_or_no_args_are_cutotune_parameters(self, *args, **kwargs) -> bool:
-        num_cutotune_overrideables = 0
+        return best_config
 
-        for i in range(len(args)):
-            variable_name = self.signature.args[i]
+    def _get_failed_configs(self, lookup_key: str) -> list[tuple[CutoTuneConfig, str]]:
+        # the blacklist comes from the local cache which can differ across ranks, every rank has to shard the same list
+        # of configs so distributed tuning tries all of them again
+        if self._is_distributed():
+            return []
 
-            if isinstance(args[i], CutoTuneParameter) and variable_name in self.cutotuneable_parameters:
-                num_cutotune_overrideables += 1
+        failed_configs = []
 
-        # accessing kwargs.items() breaks torch.compile in backwards of a custom autograd function
-        for variable_name in kwargs:
-            if (
-                isinstance(kwargs.get(variable_name), CutoTuneParameter)
-                and variable_name in self.cutotuneable_parameters
-            ):
+        for key_values, error in get_cutotune_cache().get_failed_configs(self.function_hash, lookup_key):
+            for config in self.configs:
+                if config.get_key_values() == key_values:
+                    failed_configs.append((config, error))
+                    break
+
+        return failed_configs
+
+    def _get_valid_configs(self, configs: list[CutoTuneConfig], args: tuple, kwargs: dict) -> list[CutoTuneConfig]:
+        return [
+            config
+            for config in configs
+            if config.is_condition_valid(
+                **self._get_function_arguments(
+                    config=CutoTuneConfig({}), args=args, kwargs=kwargs, override_allowed=False
+                )
+            )
+        ]
+
+    def _get_default_config(self, args: tuple, kwargs: dict) -> CutoTuneConfig:
+        if self.default_config is not None:
+            return self.default_config
+
+        arguments = self._get_function_arguments(
+            config=CutoTuneConfig({}), args=args, kwargs=kwargs, override_allowed=False
+        )
+
+        for config in self.configs:
+            if config.is_condition_valid(**arguments):
+                return config
+
+        return self.configs[0]
+
+    def _submit_tuning_job(self, dispatch_key: tuple | str, lookup_key: str, args: tuple, kwargs: dict) -> None:
+        args = clone_arguments(args)
+        kwargs = clone_arguments(kwargs)
+
+        async_tuning = self.async_tuning
+
+        def _run() -> None:
+            best_config = self._tune(
+                lookup_key, args, kwargs, use_budget=False, force_eager=async_tuning != BACKGROUND
+            )
+
+            old_config = self.function_cache.get(dispatch_key, None)
+            self.function_cache[dispatch_key] = best_config
+
+            run_swap_hooks(self.function_hash, lookup_key, old_config, best_config)
+
+        device = get_device_from_arguments(
+            **self._get_function_arguments(config=CutoTuneConfig({}), args=args, kwargs=kwargs, override_allowed=False)
+        )
+
+        submit_tuning_job(_TuningJob(_run, device), async_tuning)
+
+    def _get_predicted_configs(self, lookup_key: str, args: tuple, kwargs: dict) -> list[CutoTuneConfig] | None:
+        # predictions depend on the local cache which can differ across ranks, so distributed tuning always benchmarks
+        # all the configs to keep the shards consistent
+        if self.predictor is None or len(self.configs) == 1 or self._is_distributed():
+            return None
+
+        predicted_key_values = self.predictor.predict(
+            lookup_key, get_cutotune_cache().get_timed_configs(self.function_hash, fingerprint=self.fingerprint)
+        )
+        if predicted_key_values is None:
+            return None
+
+        arguments = self._get_function_arguments(
+            config=CutoTuneConfig({}), args=args, kwargs=kwargs, override_allowed=False
+        )
+
+        candidate_configs = [
+            config
+            for key_values in predicted_key_values
+            for config in self.configs
+            if config.get_key_values() == key_values and config.is_condition_valid(**arguments)
+        ]
+
+        if _DEBUG_CUTOTUNE:
+            print(f"predicted configs {candidate_configs} for {lookup_key} for function {self.function.__name__}")
+
+        return candidate_configs if len(candidate_configs) > 0 else None
+
+    def _get_config_from_persistent_cache(self, lookup_key: str) -> CutoTuneConfig | None:
+        cached_config = get_cutotune_cache().get_config(
+            function_hash=self.function_hash, lookup_key=lookup_key, fingerprint=self.fingerprint
+        )
+        if cached_config is None:
+            return None
+
+        # map back to the config object of this function so that its condition is preserved, configs that are no
+        # longer in the config list are ignored
+        for config in self.configs:
+            if config.get_key_values() == cached_config.get_key_values():
+                return config
+
+        return None
+
+    def _check_all_or_no_args_are_cutotune_parameters(self, args: tuple, kwargs: dict) -> bool:
+        num_args = len(args)
+        num_cutotune_overrideables = 0
+
+        # only the tunable arguments are inspected, their positions are resolved once at decoration time
+        for position, variable_name in self.cutotuneable_parameter_positions:
+            # accessing kwargs.items() breaks torch.compile in backwards of a custom autograd function
+            value = args[position] if position < num_args else kwargs.get(variable_name, None)
+
+            if isinstance(value, CutoTuneParameter):
                 num_cutotune_overrideables += 1
 
         assert num_cutotune_overrideables in [
@@ -118,118 +461,278 @@ class _CutoTune:
         return num_cutotune_overrideables == 0
 
     def _get_function_arguments(
-        self, config: CutoTuneConfig, args: list, kwargs: dict, override_allowed: bool
+        self, config: CutoTuneConfig, args: tuple, kwargs: dict, override_allowed: bool
     ) -> dict:
-        # copy the best_config first so we can override with args or kwargs
-        result = {variable_name: value for variable_name, value in config.get_key_values().items()}
-
-        for i in range(len(args)):
-            variable_name = self.signature.args[i]
+        # the key values of the config act as the template of the arguments, explicitly passed arguments override
+        # them unless the tunable arguments are passed as CutoTuneParameter
+        if override_allowed:
+            result = config.get_key_values().copy()
 
-            if override_allowed or variable_name not in result:
-                result[variable_name] = args[i]
+            for variable_name, value in zip(self.signature.args, args):
+                result[variable_name] = value
+        else:
+            result = dict(zip(self.signature.args, args))
 
         # accessing kwargs.items() breaks torch.compile in backwards of a custom autograd function
         for variable_name in kwargs:
-            if override_allowed or variable_name not in result:
-                result[variable_name] = kwargs.get(variable_name)
+            result[variable_name] = kwargs.get(variable_name)
+
+        if not override_allowed:
+            result.update(config.get_key_values())
 
         return result
 
-    @torch.compiler.set_stance("force_eager")
     @torch.inference_mode()
-    def _cutotune(self, *args, **kwargs) -> tuple[CutoTuneConfig, float, list[tuple[CutoTuneConfig, float]]]:
-        best_config = None
-        best_time = float("inf")
+    def _cutotune(
+        self,
+        lookup_key: str,
+        args: tuple,
+        kwargs: dict,
+        configs: list[CutoTuneConfig],
+        benchmark_spans: list[tuple[dict, float, float]] | None = None,
+        budget_tracker: _BudgetTracker | None = None,
+    ) -> tuple[CutoTuneConfig, float, list[tuple[CutoTuneConfig, TimingStatistics]], list[tuple[CutoTuneConfig, str]]]:
+        is_distributed = self._is_distributed()
+
+        # in distributed mode every rank only benchmarks its shard of the valid configs
+        if is_distributed:
+            rank = torch.distributed.get_rank(self.process_group)
+            world_size = torch.distributed.get_world_size(self.process_group)
+            config_indices = list(range(rank, len(configs), world_size))
+        else:
+            config_indices = list(range(len(configs)))
 
-        configs = tqdm(self.configs) if _DEBUG_CUTOTUNE else self.configs
-        timed_configs = []
+        progress_bar = tqdm(total=len(config_indices)) if _DEBUG_CUTOTUNE else None
+        measured_indices = set()
+        # index into config_indices -> error of the configs that raised
+        errors = {}
 
-        for config in configs:
-            if not config.is_condition_valid(
-                **self._get_function_arguments(
-                    config=CutoTuneConfig({}), args=args, kwargs=kwargs, override_allowed=False
+        if budget_tracker is None:
+            budget_tracker = _BudgetTracker(None)
+
+        def _measure(i: int, warmup_iterations: int, benchmark_iterations: int, per_iteration: bool) -> list[float]:
+            if i not in errors:
+                benchmark_iterations = budget_tracker.acquire(i, warmup_iterations, benchmark_iterations)
+
+                # no samples tell the benchmark strategy to stop
+                if benchmark_iterations is None:
+                    return []
+
+            if progress_bar is not None and i not in measured_indices:
+                progress_bar.update()
+
+            measured_indices.add(i)
+
+            # a failed config is never run again, infinite times get it pruned by the benchmark strategy
+            if i in errors:
+                return [float("inf")] * max(benchmark_iterations, 1)
+
+            config = configs[config_indices[i]]
+            start_time = time.time()
+
+            try:
+                elapsed_times = self._run_benchmark(
+                    warmup_iterations=warmup_iterations,
+                    benchmark_iterations=benchmark_iterations,
+                    per_iteration=per_iteration,
+                    **self._get_function_arguments(config=config, args=args, kwargs=kwargs, override_allowed=False),
                 )
-            ):
-                continue
+            except _get_config_errors() as error:
+                errors[i] = _format_error(error)
+                elapsed_times = [float("inf")] * max(benchmark_iterations, 1)
+
+                if isinstance(error, torch.OutOfMemoryError):
+                    torch.cuda.empty_cache()
+
+                if _DEBUG_CUTOTUNE:
+                    print(
+                        f"config {config} failed for {lookup_key} for function {self.function.__name__}: {errors[i]}"
+                    )
+
+            if benchmark_spans is not None:
+                benchmark_spans.append((config.get_key_values(), start_time, time.time() - start_time))
+
+            return elapsed_times
+
+        timed_config_indices = [
+            (config_indices[i], statistics)
+            for i, statistics in self.benchmark_strategy.run(len(config_indices), _measure)
+            if i not in errors
+        ]
+        failed_config_indices = [(config_indices[i], error) for i, error in sorted(errors.items())]
 
-            elapsed_time = self._run_benchmark(
-                **self._get_function_arguments(config=config, args=args, kwargs=kwargs, override_allowed=False),
+        if progress_bar is not None:
+            progress_bar.close()
+
+        if is_distributed:
+            timed_config_indices, failed_config_indices, budget_tracker.exhausted = (
+                self._all_gather_timed_config_indices(
+                    lookup_key, timed_config_indices, failed_config_indices, budget_tracker.exhausted
+                )
             )
 
-            timed_configs.append((config, elapsed_time))
+        failed_configs = [
+            (configs[index], error) for index, error in sorted(failed_config_indices, key=lambda x: x[0])
+        ]
 
-            if elapsed_time < best_time:
+        best_config = None
+        best_time = float("inf")
+        best_pruned = True
+        timed_configs = []
+
+        # configs are visited in the same order on every rank so ties are broken identically, configs that were
+        # pruned early by the benchmark strategy only win if every config was pruned
+        for index, statistics in sorted(timed_config_indices, key=lambda x: x[0]):
+            config = configs[index]
+            elapsed_time = self.benchmark_strategy.get_time(statistics)
+            timed_configs.append((config, statistics))
+
+            if (statistics.pruned, elapsed_time) < (best_pruned, best_time):
                 best_config = config
                 best_time = elapsed_time
+                best_pruned = statistics.pruned
 
-        assert best_config is not None, "no best_config found, check that at least 1 cutotune config is valid"
+        assert best_config is not None, (
+            "no best_config found, check that at least 1 cutotune config is valid, failed configs: "
+            f"{[(config, error) for config, error in failed_configs]}"
+        )
 
-        return best_config, best_time, timed_configs
+        return best_config, best_time, timed_configs, failed_configs
 
-    def _get_lookup_key(self, *args, **kwargs) -> Any:
-        lookup_key = []
+    def _is_distributed(self) -> bool:
+        return (
+            self.distributed
+            and torch.distributed.is_initialized()
+            and torch.distributed.get_world_size(self.process_group) > 1
+        )
 
-        def _maybe_add_key(variable_name: str, value) -> None:
-            if variable_name not in self.variable_name_trigger_map:
-                return
+    def _all_gather_cached_config(
+        self, lookup_key: str, cached_config: CutoTuneConfig | None, provisional: bool
+    ) -> tuple[CutoTuneConfig | None, bool]:
+        cached_config_index = None
+        if cached_config is not None:
+            cached_config_index = next(i for i, config in enumerate(self.configs) if config is cached_config)
 
-            triggers = self.variable_name_trigger_map[variable_name]
+        gathered = [None] * torch.distributed.get_world_size(self.process_group)
+        torch.distributed.all_gather_object(
+            gathered, (lookup_key, cached_config_index, provisional), group=self.process_group
+        )
 
-            if isinstance(value, torch.Tensor):
-                for func_name, func in triggers:
-                    if func is None:
-                        assert len(triggers) == 1
-                        func = lambda tensor: (tensor.dtype, tensor.size(), tensor.stride())
+        self._check_lookup_keys_match(lookup_key, [rank_lookup_key for rank_lookup_key, _, _ in gathered])
+
+        # every rank tunes if any rank missed, otherwise all ranks use the config cached by the first rank
+        if any(rank_cached_config_index is None for _, rank_cached_config_index, _ in gathered):
+            return None, False
 
-                    lookup_key.append(f"{variable_name}.{func_name} = {func(value)}")
+        _, cached_config_index, _ = gathered[0]
+        return self.configs[cached_config_index], any(rank_provisional for _, _, rank_provisional in gathered)
+
+    def _all_gather_timed_config_indices(
+        self,
+        lookup_key: str,
+        timed_config_indices: list[tuple[int, TimingStatistics]],
+        failed_config_indices: list[tuple[int, str]],
+        budget_exhausted: bool,
+    ) -> tuple[list[tuple[int, TimingStatistics]], list[tuple[int, str]], bool]:
+        # configs can't be pickled (their conditions are lambdas) so only the indices are exchanged, the lookup key is
+        # exchanged as well to catch ranks that are tuning different keys at the same time
+        gathered = [None] * torch.distributed.get_world_size(self.process_group)
+        torch.distributed.all_gather_object(
+            gathered,
+            (lookup_key, timed_config_indices, failed_config_indices, budget_exhausted),
+            group=self.process_group,
+        )
+
+        self._check_lookup_keys_match(lookup_key, [rank_lookup_key for rank_lookup_key, _, _, _ in gathered])
+
+        result = []
+        failed_result = []
+        # the result is provisional if the budget ran out on any rank
+        budget_exhausted = False
+
+        for _, rank_timed_config_indices, rank_failed_config_indices, rank_budget_exhausted in gathered:
+            result.extend(rank_timed_config_indices)
+            failed_result.extend(rank_failed_config_indices)
+            budget_exhausted = budget_exhausted or rank_budget_exhausted
+
+        return result, failed_result, budget_exhausted
+
+    def _check_lookup_keys_match(self, lookup_key: str, rank_lookup_keys: list[str]) -> None:
+        for rank_lookup_key in rank_lookup_keys:
+            assert rank_lookup_key == lookup_key, (
+                f"distributed cutotune requires all ranks to tune the same lookup key for function "
+                f"{self.function.__name__}, found ({lookup_key}) and ({rank_lookup_key})"
+            )
+
+    def _get_dispatch_key(self, args: tuple, kwargs: dict) -> tuple:
+        num_args = len(args)
+        dispatch_key = []
+
+        for position, variable_name, default, triggers in self.trigger_extractors:
+            if position < num_args:
+                value = args[position]
             else:
-                assert len(triggers) == 1
-                func_name, func = triggers[0]
+                # accessing kwargs.items() breaks torch.compile in backwards of a custom autograd function
+                value = kwargs.get(variable_name, default)
+
+            if isinstance(value, torch.Tensor):
+                for _, func, bucket in triggers:
+                    value_key = func(value)
+                    dispatch_key.append(value_key if bucket is None else apply_bucket(bucket, value_key))
+            else:
+                _, func, bucket = triggers[0]
                 assert (
-                    func is None
+                    func is _get_tensor_info
                 ), f"trigger ({variable_name}) is not a tensor and shouldn't have a functional trigger"
 
-                lookup_key.append(f"{variable_name} = {value}")
-
-        for i, value in enumerate(args):
-            variable_name = self.signature.args[i]
-            _maybe_add_key(variable_name, value)
+                if bucket is not None:
+                    value = apply_bucket(bucket, value)
 
-        for variable_name in kwargs:
-            _maybe_add_key(variable_name, kwargs[variable_name])
+                # values that compare equal across types (True == 1 == 1.0) also hash the same, the type keeps their
+                # configs apart like the string lookup key does
+                dispatch_key.append((type(value), value))
 
-        # now run the functional triggers
         if len(self.functional_triggers) > 0:
             kwargs = self._get_function_arguments(
                 config=CutoTuneConfig({}), args=args, kwargs=kwargs, override_allowed=False
             )
 
-            for variable_name, func in self.functional_triggers.items():
-                lookup_key.append(f"{variable_name} = {func(**kwargs)}")
+            for func in self.functional_triggers.values():
+                value = func(**kwargs)
+                dispatch_key.append((type(value), value))
+
+        return tuple(dispatch_key)
+
+    def _get_lookup_key(self, dispatch_key: tuple | str) -> str:
+        # string form of the dispatch key that is used for the persistent cache
+        if isinstance(dispatch_key, str):
+            return dispatch_key
 
+        lookup_key = [
+            f"{label} = {_get_untyped_value(value)}" for label, value in zip(self.trigger_labels, dispatch_key)
+        ]
         return str(lookup_key)[1:-1]
 
-    def _run_benchmark(self, **kwargs: dict) -> float:
-        device_synchronize()
+    def _run_benchmark(
+        self, warmup_iterations: int, benchmark_iterations: int, per_iteration: bool, **kwargs: dict
+    ) -> list[float]:
+        device = get_device_from_arguments(**kwargs)
+        device_synchronize(device)
 
-        for _ in range(self.warmup_iterations):
+        for _ in range(warmup_iterations):
             self.function(**kwargs)
 
-        # TODO generalize to device Event
-        start = torch.cuda.Event(enable_timing=True)
-        end = torch.cuda.Event(enable_timing=True)
+        timer = get_timer(device)
 
-        if len(self.reset_to_zero) > 0:
-            elapsed_time = 0
+        if per_iteration or len(self.reset_to_zero) > 0:
+            elapsed_times = []
 
-            for _ in range(self.benchmark_iterations):
-                start.record()
+            for _ in range(benchmark_iterations):
+                timer.start()
                 self.function(**kwargs)
-                end.record()
+                timer.stop()
 
-                device_synchronize()
-                elapsed_time += start.elapsed_time(end)
+                elapsed_times.append(timer.get_elapsed_time())
 
                 for variable_name, function in self.reset_to_zero.items():
                     if function is None or function(**kwargs):
@@ -237,30 +740,41 @@ class _CutoTune:
                         assert isinstance(variable, torch.Tensor)
 
                         variable.zero_()
+
+            if not per_iteration:
+                elapsed_times = [sum(elapsed_times) / benchmark_iterations]
         else:
-            start.record()
-            for _ in range(self.benchmark_iterations):
+            timer.start()
+            for _ in range(benchmark_iterations):
                 self.function(**kwargs)
-            end.record()
+            timer.stop()
 
-            device_synchronize()
-            elapsed_time = start.elapsed_time(end)
+            elapsed_times = [timer.get_elapsed_time() / benchmark_iterations]
 
-        return elapsed_time / self.benchmark_iterations
+        return elapsed_times
 
-    def _setup_trigger_map(self, triggers: set[str]) -> None:
+    def _setup_trigger_map(self, triggers: set[str | tuple[str, Callable]]) -> None:
         assert isinstance(triggers, set), "triggers should be a set"
 
         self.variable_name_trigger_map = defaultdict(list)
 
         for trigger in triggers:
+            # a trigger can be paired with a bucket policy as (trigger, bucket)
+            if isinstance(trigger, tuple):
+                trigger, bucket = trigger
+                assert callable(bucket), f"bucket for trigger ({trigger}) should be callable"
+            else:
+                bucket = None
+
             variable_name, func_name, func = self._parse_trigger(trigger)
-            self.variable_name_trigger_map[variable_name].append((func_name, func))
+            self.variable_name_trigger_map[variable_name].append((func_name, func, bucket))
 
         # filter to remove all triggers if None, this is useful for Tensor based triggers
         for variable_name in self.variable_name_trigger_map:
-            if ("info", None) in self.variable_name_trigger_map[variable_name]:
-                self.variable_name_trigger_map[variable_name] = [("info", None)]
+            for func_name, func, bucket in self.variable_name_trigger_map[variable_name]:
+                if func is None:
+                    self.variable_name_trigger_map[variable_name] = [(func_name, func, bucket)]
+                    break
 
             assert (
                 variable_name in self.signature.args
@@ -271,6 +785,46 @@ class _CutoTune:
                 variable_name not in self.variable_name_trigger_map
             ), "trigger can't be an instance of CutoTuneParameter"
 
+        self._setup_dispatch()
+
+    def _setup_dispatch(self) -> None:
+        # everything that doesn't depend on the arguments of a call is resolved here so that a call with a cached
+        # config is only a few attribute accesses and a dict lookup
+        defaults = self.signature.defaults or ()
+        defaults = dict(zip(self.signature.args[len(self.signature.args) - len(defaults) :], defaults))
+
+        # tunable arguments that can't be passed positionally are only looked up in kwargs
+        self.cutotuneable_parameter_positions = [
+            (
+                self.signature.args.index(variable_name) if variable_name in self.signature.args else sys.maxsize,
+                variable_name,
+            )
+            for variable_name in sorted(self.cutotuneable_parameters)
+        ]
+
+        # triggers are extracted in the order of the signature so that the key doesn't depend on the order of kwargs
+        self.trigger_extractors = []
+        self.trigger_labels = []
+
+        for position, variable_name in enumerate(self.signature.args):
+            if variable_name not in self.variable_name_trigger_map:
+                continue
+
+            triggers = []
+            for func_name, func, bucket in sorted(self.variable_name_trigger_map[variable_name], key=lambda x: x[0]):
+                label = variable_name if func is None else f"{variable_name}.{func_name}"
+                if bucket is not None:
+                    label = f"{label} @ {get_bucket_name(bucket)}"
+
+                triggers.append((func_name, _get_tensor_info if func is None else func, bucket))
+                self.trigger_labels.append(label)
+
+            self.trigger_extractors.append(
+                (position, variable_name, defaults.get(variable_name, inspect.Parameter.empty), triggers)
+            )
+
+        self.trigger_labels.extend(self.functional_triggers.keys())
+
     def _parse_trigger(self, trigger: str) -> tuple[str, str, Callable]:
         split_trigger = trigger.split(_SEPARATOR)
         variable_name = split_trigger[0]
@@ -305,14 +859,98 @@ class _CutoTune:
         return self.function_cache
 
 
+def prune_stale_cutotune_cache_entries(dry_run: bool = False) -> dict[str, list[str]]:
+    """removes the entries of the persistent cutotune cache that were tuned with a different version of the code or
+    config space of their function, only the functions that are already imported are checked
+
+    Args:
+        dry_run (bool, optional): only report the stale entries without removing them. Defaults to False.
+
+    Returns:
+        dict[str, list[str]]: function hash -> stale lookup keys for the functions that have stale entries
+    """
+
+    cache = get_cutotune_cache()
+    result = {}
+
+    for function in sorted(_ALL_CUTOTUNE_FUNCTIONS, key=lambda function: function.function_hash):
+        if dry_run:
+            stale_lookup_keys = cache.get_stale_lookup_keys(function.function_hash, function.fingerprint)
+        else:
+            stale_lookup_keys = cache.prune(function.function_hash, function.fingerprint)
+
+        if len(stale_lookup_keys) > 0:
+            result[function.function_hash] = stale_lookup_keys
+
+    return result
+
+
 def cutotune(
     configs: list[CutoTuneConfig],
-    triggers: set[str] = set(),
+    triggers: set[str | tuple[str, Callable]] = set(),
     functional_triggers: dict[str, Callable] = {},
     warmup_iterations: int = _DEFAULT_WARMUP_ITERATIONS,
     benchmark_iterations: int = _BENCHMARK_ITERATIONS,
     reset_to_zero: dict = {},
+    benchmark_strategy: _BenchmarkStrategy | None = None,
+    distributed: bool = _DISTRIBUTED_CUTOTUNE,
+    process_group: torch.distributed.ProcessGroup | None = None,
+    predictor: NearestNeighbourPredictor | None = None,
+    async_tuning: str | None = _ASYNC_CUTOTUNE,
+    default_config: CutoTuneConfig | None = None,
+    max_tuning_time: float | None = None,
+    max_configs: int | None = None,
+    max_iterations: int | None = None,
 ) -> _CutoTune:
+    """decorator to tune the parameters of a function that are passed as `CutoTuneParameter`
+
+    Args:
+        configs (list[CutoTuneConfig]): candidate configs
+        triggers (set[str | tuple[str, Callable]], optional): arguments (or properties of tensor arguments) that make
+            up the lookup key. A trigger can be paired with a bucket policy, for example
+            `("x.size(0)", NextPowerOf2Bucket())`, so that all values in a bucket share the tuned config. Integer
+            values (and every dimension of sizes and strides) are bucketed. Defaults to set().
+        functional_triggers (dict[str, Callable], optional): functions of the arguments that are added to the lookup
+            key. Defaults to {}.
+        warmup_iterations (int, optional): number of warmup iterations per config, only used when
+            `benchmark_strategy` is None. Defaults to 5.
+        benchmark_iterations (int, optional): number of timed iterations per config, only used when
+            `benchmark_strategy` is None. Defaults to 10.
+        reset_to_zero (dict, optional): tensor arguments that need to be zeroed after every iteration. Defaults to {}.
+        benchmark_strategy (_BenchmarkStrategy | None, optional): strategy used to benchmark the candidate configs,
+            for example `SuccessiveHalvingBenchmark()`. None uses `FixedIterationsBenchmark` with
+            `warmup_iterations` and `benchmark_iterations`. Defaults to None.
+        distributed (bool, optional): splits the candidate configs across the ranks of `process_group` and picks the
+            same winner on all ranks, all ranks need to call the function with the same lookup key. Defaults to the
+            `DISTRIBUTED_CUTOTUNE` environment variable.
+        process_group (torch.distributed.ProcessGroup | None, optional): process group to use for distributed tuning,
+            None uses the default process group. Defaults to None.
+        predictor (NearestNeighbourPredictor | None, optional): predicts the configs for a new lookup key from the
+            timings of close lookup keys that were already tuned, only the predicted configs are benchmarked. A single
+            predicted config is used directly and marked as provisional so that it is refined like a config that was
+            picked when the tuning budget ran out. Not used with distributed tuning. Defaults to None.
+        async_tuning (str | None, optional): None tunes a new lookup key on the first call. "background" serves the
+            default config and tunes in a background thread on a separate stream, "deferred" serves the default
+            config until `flush_cutotune()` is called. The tuned config replaces the default config for later calls,
+            see `register_cutotune_swap_hook`. Defaults to the `ASYNC_CUTOTUNE` environment variable which is a
+            process-wide switch, it applies to every @cutotune function that doesn't pass `async_tuning` (including
+            the kernels of this package), pass `async_tuning=None` to always tune a function synchronously.
+        default_config (CutoTuneConfig | None, optional): config to serve while a lookup key is being tuned
+            asynchronously, None uses the first config whose condition is valid. Defaults to None.
+        max_tuning_time (float | None, optional): wall-clock budget in seconds for tuning a lookup key, checked before
+            every config is benchmarked. Once any budget runs out the best config so far is used and marked as
+            provisional, it is tuned again by `python -m cute_kernels.cutotune.sweep`, inside
+            `ignore_cutotune_budgets()` or in the background when `async_tuning` is set. The tighter of this and the
+            `MAX_CUTOTUNE_TIME` environment variable is used. Asynchronous tuning is never limited. Defaults to None.
+        max_configs (int | None, optional): maximum number of configs benchmarked for a lookup key, configs are
+            benchmarked in order. The tighter of this and `MAX_CUTOTUNE_CONFIGS` is used. Defaults to None.
+        max_iterations (int | None, optional): maximum number of calls (warmup and timed) made while tuning a lookup
+            key. The tighter of this and `MAX_CUTOTUNE_ITERATIONS` is used. Defaults to None.
+
+    Returns:
+        _CutoTune: the tuned function
+    """
+
     def inner(function: Callable) -> Callable:
         return _CutoTune(
             function=function,
@@ -322,6 +960,15 @@ def cutotune(
             benchmark_iterations=benchmark_iterations,
             functional_triggers=functional_triggers,
             reset_to_zero=reset_to_zero,
+            benchmark_strategy=benchmark_strategy,
+            distributed=distributed,
+            process_group=process_group,
+            predictor=predictor,
+            async_tuning=async_tuning,
+            default_config=default_config,
+            max_tuning_time=max_tuning_time,
+            max_configs=max_configs,
+            max_iterations=max_iterations,
         )
 
     return inner
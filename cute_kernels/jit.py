@@ -2,25 +2,143 @@
 # Copyright (c) 2025, Mayank Mishra
 # **************************************************
 
+import hashlib
+import importlib.util
 import inspect
 import os
-from shutil import rmtree
+import re
+import subprocess
+import sys
+from functools import cache
+from types import ModuleType
 from typing import Callable
-from uuid import uuid4
 
 import torch
-from torch.utils.cpp_extension import load as load_cpp_extension
+
+from .utils import atomic_write, file_lock
 
 
 _CPP_MODULE_PREFIX = "cute_kernels"
-_GLOBAL_RANK = int(os.getenv("RANK", 0))
-_WORLD_SIZE = int(os.getenv("WORLD_SIZE", 1))
+_PACKAGE_DIRECTORY = os.path.realpath(os.path.dirname(__file__))
+_CPP_JIT_CACHE_DIRECTORY = os.getenv(
+    "CPP_JIT_CACHE_DIR",
+    os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "cute_kernels", "cpp_jit"
+    ),
+)
+_INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
 
 _ALL_COMPILED_MODULES = {}
+# module name -> (source files, build directory) of every cpp_jit function, used for ahead-of-time compilation
+_ALL_CPP_JIT_MODULES = {}
 
 
-@torch.compiler.disable
-def _get_cpp_function(function_name: str, module_name: str, source_files: list[str], build_directory: str) -> Callable:
+def _load_cpp_extension(*args, **kwargs) -> ModuleType:
+    # torch.utils.cpp_extension takes seconds to import and is only needed when a module is compiled
+    from torch.utils.cpp_extension import load
+
+    return load(*args, **kwargs)
+
+
+@cache
+def _get_toolchain_info() -> str:
+    from torch.utils.cpp_extension import CUDA_HOME
+
+    nvcc_version = None
+    if CUDA_HOME is not None:
+        try:
+            nvcc_version = subprocess.check_output(
+                [os.path.join(CUDA_HOME, "bin", "nvcc"), "--version"], stderr=subprocess.DEVNULL, text=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            pass
+
+    # torch compiles for the visible GPUs unless TORCH_CUDA_ARCH_LIST is set
+    device_capabilities = (
+        [torch.cuda.get_device_capability(i) for i in range(torch.cuda.device_count())]
+        if torch.cuda.is_available()
+        else []
+    )
+
+    return repr(
+        [
+            torch.__version__,
+            torch.version.cuda,
+            torch._C._GLIBCXX_USE_CXX11_ABI,
+            sys.version,
+            nvcc_version,
+            os.getenv("CXX", None),
+            os.getenv("TORCH_CUDA_ARCH_LIST", None),
+            sorted(set(device_capabilities)),
+        ]
+    )
+
+
+def _get_included_files(filename: str, include_paths: list[str], visited: set[str]) -> None:
+    # only headers inside the package are followed, the rest (cutlass, CUDA, torch) are covered by the toolchain
+    # information and the cutlass version
+    with open(filename, "r") as f:
+        includes = _INCLUDE_PATTERN.findall(f.read())
+
+    for include in includes:
+        for directory in [os.path.dirname(filename)] + include_paths:
+            header = os.path.realpath(os.path.join(directory, include))
+
+            if os.path.isfile(header):
+                if header.startswith(_PACKAGE_DIRECTORY + os.sep) and header not in visited:
+                    visited.add(header)
+                    _get_included_files(header, include_paths, visited)
+
+                break
+
+
+def _get_build_hash(
+    source_files: list[str], extra_cflags: list[str], extra_cuda_cflags: list[str], extra_include_paths: list[str]
+) -> str:
+    files = set(os.path.realpath(filename) for filename in source_files)
+    for filename in list(files):
+        _get_included_files(filename, extra_include_paths, files)
+
+    digest = hashlib.sha256()
+
+    for filename in sorted(files):
+        digest.update(os.path.relpath(filename, _PACKAGE_DIRECTORY).encode())
+
+        with open(filename, "rb") as f:
+            digest.update(f.read())
+
+    for include_path in extra_include_paths:
+        cutlass_version = os.path.join(include_path, "cutlass", "version.h")
+        if os.path.isfile(cutlass_version):
+            with open(cutlass_version, "rb") as f:
+                digest.update(f.read())
+
+    digest.update(repr([extra_cflags, extra_cuda_cflags]).encode())
+    digest.update(_get_toolchain_info().encode())
+
+    return digest.hexdigest()[:32]
+
+
+def _get_cached_library_filename(module_name: str, build_hash: str) -> str:
+    return os.path.join(_CPP_JIT_CACHE_DIRECTORY, f"{module_name}-{build_hash}", f"{module_name}.so")
+
+
+def _load_library(module_name: str, filename: str) -> ModuleType:
+    # the prebuilt library is imported directly, torch's loader would invoke ninja and the compiler toolchain again
+    spec = importlib.util.spec_from_file_location(module_name, filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def _add_library_to_cache(module: ModuleType, filename: str) -> None:
+    # readers never see a partially copied library, concurrent writers publish identical content
+    with open(module.__file__, "rb") as source, atomic_write(filename, mode="wb") as destination:
+        destination.write(source.read())
+
+
+def _get_cpp_module(module_name: str, source_files: list[str], build_directory: str) -> ModuleType:
     module_name = f"{_CPP_MODULE_PREFIX}_{module_name}"
 
     extra_cflags = ["-O3", "-Wall", "-shared", "-fPIC", "-fdiagnostics-color"]
@@ -34,59 +152,70 @@ def _get_cpp_function(function_name: str, module_name: str, source_files: list[s
     module = _ALL_COMPILED_MODULES.get(module_name, None)
 
     if module is None:
-        if torch.distributed.is_initialized():
-            os.makedirs(build_directory, exist_ok=True)
-
-            if _GLOBAL_RANK == 0:
-                module = load_cpp_extension(
-                    module_name,
-                    sources=source_files,
-                    with_cuda=True,
-                    extra_cflags=extra_cflags,
-                    extra_cuda_cflags=extra_cuda_cflags,
-                    extra_include_paths=extra_include_paths,
-                    build_directory=build_directory,
-                    verbose=True,
-                )
-
-            torch.distributed.barrier()
-
-            if _GLOBAL_RANK != 0:
-                module = load_cpp_extension(
-                    module_name,
-                    sources=source_files,
-                    with_cuda=True,
-                    extra_cflags=extra_cflags,
-                    extra_cuda_cflags=extra_cuda_cflags,
-                    extra_include_paths=extra_include_paths,
-                    build_directory=build_directory,
-                    verbose=False,
-                )
-        else:
-            if _WORLD_SIZE > 1:
-                build_directory = os.path.join(build_directory, str(uuid4()))
-
-            os.makedirs(build_directory, exist_ok=True)
-
-            module = load_cpp_extension(
-                module_name,
-                sources=source_files,
-                with_cuda=True,
-                extra_cflags=extra_cflags,
-                extra_cuda_cflags=extra_cuda_cflags,
-                extra_include_paths=extra_include_paths,
-                build_directory=build_directory,
-                verbose=True,
-            )
-
-            if _WORLD_SIZE > 1:
-                rmtree(build_directory, ignore_errors=True)
+        # artifacts are shared across ranks and jobs through a cache keyed on everything that goes into the build
+        build_hash = _get_build_hash(
+            source_files=source_files,
+            extra_cflags=extra_cflags,
+            extra_cuda_cflags=extra_cuda_cflags,
+            extra_include_paths=extra_include_paths,
+        )
+        cached_library_filename = _get_cached_library_filename(module_name, build_hash)
+
+        if not os.path.isfile(cached_library_filename):
+            # exactly one process on the machine (or on the shared filesystem of the cache) compiles, the others wait
+            # for the lock and load the library it published. The lock is per module so that builds of the same
+            # module with different flags don't race in the build directory.
+            with file_lock(os.path.join(_CPP_JIT_CACHE_DIRECTORY, f"{module_name}.lock")):
+                if not os.path.isfile(cached_library_filename):
+                    os.makedirs(build_directory, exist_ok=True)
+
+                    module = _load_cpp_extension(
+                        module_name,
+                        sources=source_files,
+                        with_cuda=any(os.path.splitext(filename)[1] == ".cu" for filename in source_files),
+                        extra_cflags=extra_cflags,
+                        extra_cuda_cflags=extra_cuda_cflags,
+                        extra_include_paths=extra_include_paths,
+                        build_directory=build_directory,
+                        verbose=True,
+                    )
+
+                    _add_library_to_cache(module, cached_library_filename)
+
+        if module is None:
+            module = _load_library(module_name, cached_library_filename)
 
         _ALL_COMPILED_MODULES[module_name] = module
 
+    return module
+
+
+def _get_cpp_function(function_name: str, module_name: str, source_files: list[str], build_directory: str) -> Callable:
+    module = _get_cpp_module(module_name=module_name, source_files=source_files, build_directory=build_directory)
     return getattr(module, function_name)
 
 
+def get_cpp_jit_module_names() -> list[str]:
+    """returns the names of the C++/CUDA modules of all the cpp_jit functions that are imported
+
+    Returns:
+        list[str]: module names
+    """
+
+    return sorted(_ALL_CPP_JIT_MODULES.keys())
+
+
+def compile_cpp_jit_module(module_name: str) -> None:
+    """compiles a cpp_jit module (or loads it from the build cache) without calling any of its functions
+
+    Args:
+        module_name (str): name of the module, see `get_cpp_jit_module_names`
+    """
+
+    source_files, build_directory = _ALL_CPP_JIT_MODULES[module_name]
+    _get_cpp_module(module_name=module_name, source_files=source_files, build_directory=build_directory)
+
+
 def cpp_jit(
     function_name: str | None = None,
     extra_source_files: list[str] = [],
@@ -106,13 +235,11 @@ def cpp_jit(
     Returns:
         Callable: returns the wrapped function that can be used to call the C++ functions from python
     """
-    cpp_function = None
-    args_spec = None
-
     source_files = []
     source_files.extend(extra_source_files)
 
-    calling_filename = inspect.stack()[1].filename
+    # inspect.stack() reads the source of every frame, walking the frames directly is much cheaper
+    calling_filename = sys._getframe(1).f_code.co_filename
     calling_directory = os.path.dirname(calling_filename)
 
     for dirname, _, filenames in os.walk(calling_directory):
@@ -120,39 +247,59 @@ def cpp_jit(
         filenames = filter(lambda f: os.path.splitext(f)[1] in [".cu", ".cpp"], filenames)
         source_files.extend(filenames)
 
-    if build_directory is None:
-        module_name = calling_directory
-        for _ in range(depth):
-            module_name = os.path.dirname(module_name)
-        module_name = os.path.basename(module_name)
+    module_name = calling_directory
+    for _ in range(depth):
+        module_name = os.path.dirname(module_name)
+    module_name = os.path.basename(module_name)
 
+    if build_directory is None:
         build_directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), "build", module_name)
 
-    def _run(*args, **kwargs):
-        nonlocal cpp_function
-
-        if cpp_function is None:
-            cpp_function = _get_cpp_function(
-                function_name=_run.__name__,
+    def _wrapper(function: Callable) -> Callable:
+        args_spec = inspect.getfullargspec(function)
+        assert (
+            args_spec.varargs is None and args_spec.varkw is None and len(args_spec.kwonlyargs) == 0
+        ), "cpp_jit functions can only have positional or keyword arguments"
+
+        name = function.__name__ if function_name is None else function_name
+        namespace = {}
+
+        # the generated function reads the C++ function from its globals, so an argument of that name would shadow it
+        cpp_function_name = "cpp_function"
+        while cpp_function_name in args_spec.args:
+            cpp_function_name = f"_{cpp_function_name}"
+
+        def _load_cpp_function(*args):
+            # the first call compiles (or loads) the module and replaces itself with the C++ function. The compiler is
+            # disabled here instead of with a decorator since torch.compiler.disable imports torch._dynamo
+            cpp_function = torch.compiler.disable(_get_cpp_function)(
+                function_name=name,
                 module_name=module_name,
                 source_files=source_files,
                 build_directory=build_directory,
             )
+            namespace[cpp_function_name] = cpp_function
 
-        full_args = []
-        full_args.extend(args)
-        for variable_name in args_spec.args[len(args) :]:
-            full_args.append(kwargs[variable_name])
+            return cpp_function(*args)
 
-        return cpp_function(*full_args)
+        namespace[cpp_function_name] = _load_cpp_function
 
-    def _wrapper(function: Callable) -> Callable:
-        nonlocal args_spec
-        args_spec = inspect.getfullargspec(function)
+        # python binds the positional and keyword arguments to the generated signature, the body forwards them to C++
+        # in order without any per call bookkeeping
+        arguments = ", ".join(args_spec.args)
+        exec(f"def _run({arguments}):\n    return {cpp_function_name}({arguments})", namespace)
 
+        _run = namespace["_run"]
+        _run.__defaults__ = args_spec.defaults
         _run.__doc__ = function.__doc__
-        _run.__name__ = function.__name__ if function_name is None else function_name
+        _run.__name__ = name
+        _run.__qualname__ = name
+        _run.__module__ = function.__module__
         _run.__signature__ = inspect.signature(function)
+        _run.__wrapped__ = function
+        _run.source_files = source_files
+
+        _ALL_CPP_JIT_MODULES[module_name] = (source_files, build_directory)
 
         return _run
 
@@ -2,20 +2,90 @@
 # Copyright (c) 2025, Mayank Mishra
 # **************************************************
 
-from .add_scalar import add_scalar_cute, add_scalar_torch
-from .add_tensor import add_tensor_cute, add_tensor_torch
-from .bmm import bmm_cute, bmm_torch
-from .continuous_count import continuous_count_cute, continuous_count_torch
-from .cross_entropy import cross_entropy_cute, cross_entropy_torch
-from .fused_linear_cross_entropy import fused_linear_cross_entropy_cute, fused_linear_cross_entropy_torch
-from .fused_residual_add_rmsnorm import fused_residual_add_rmsnorm_cute, fused_residual_add_rmsnorm_torch
-from .gemm import gemm_cute, gemm_torch
-from .gru import gru_cute, gru_torch
-from .linear import linear_cute, linear_torch
-from .matrix_transpose import matrix_transpose_cute, matrix_transpose_torch
-from .rmsnorm import rmsnorm_cute, rmsnorm_torch
-from .rnn import rnn_cute, rnn_torch
-from .scattermoe import MoE_Torch, MoE_Triton
-from .sequence_packing import pack_sequence_cute, pack_sequence_torch, unpack_sequence_cute, unpack_sequence_torch
-from .softmax import softmax_cute, softmax_torch
-from .swiglu import swiglu_cute, swiglu_packed_cute, swiglu_packed_torch, swiglu_torch
+import importlib
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from .add_scalar import add_scalar_cute, add_scalar_torch
+    from .add_tensor import add_tensor_cute, add_tensor_torch
+    from .bmm import bmm_cute, bmm_torch
+    from .continuous_count import continuous_count_cute, continuous_count_torch
+    from .cross_entropy import cross_entropy_cute, cross_entropy_torch
+    from .fused_linear_cross_entropy import fused_linear_cross_entropy_cute, fused_linear_cross_entropy_torch
+    from .fused_residual_add_rmsnorm import fused_residual_add_rmsnorm_cute, fused_residual_add_rmsnorm_torch
+    from .gemm import gemm_cute, gemm_torch
+    from .gru import gru_cute, gru_torch
+    from .linear import linear_cute, linear_torch
+    from .matrix_transpose import matrix_transpose_cute, matrix_transpose_torch
+    from .rmsnorm import rmsnorm_cute, rmsnorm_torch
+    from .rnn import rnn_cute, rnn_torch
+    from .scattermoe import MoE_Torch, MoE_Triton
+    from .sequence_packing import pack_sequence_cute, pack_sequence_torch, unpack_sequence_cute, unpack_sequence_torch
+    from .softmax import softmax_cute, softmax_torch
+    from .swiglu import swiglu_cute, swiglu_packed_cute, swiglu_packed_torch, swiglu_torch
+
+
+# every kernel package is imported on first use of one of its ops
+_LAZY_IMPORTS = {
+    "add_scalar_cute": ".add_scalar",
+    "add_scalar_torch": ".add_scalar",
+    "add_tensor_cute": ".add_tensor",
+    "add_tensor_torch": ".add_tensor",
+    "bmm_cute": ".bmm",
+    "bmm_torch": ".bmm",
+    "continuous_count_cute": ".continuous_count",
+    "continuous_count_torch": ".continuous_count",
+    "cross_entropy_cute": ".cross_entropy",
+    "cross_entropy_torch": ".cross_entropy",
+    "fused_linear_cross_entropy_cute": ".fused_linear_cross_entropy",
+    "fused_linear_cross_entropy_torch": ".fused_linear_cross_entropy",
+    "fused_residual_add_rmsnorm_cute": ".fused_residual_add_rmsnorm",
+    "fused_residual_add_rmsnorm_torch": ".fused_residual_add_rmsnorm",
+    "gemm_cute": ".gemm",
+    "gemm_torch": ".gemm",
+    "gru_cute": ".gru",
+    "gru_torch": ".gru",
+    "linear_cute": ".linear",
+    "linear_torch": ".linear",
+    "matrix_transpose_cute": ".matrix_transpose",
+    "matrix_transpose_torch": ".matrix_transpose",
+    "rmsnorm_cute": ".rmsnorm",
+    "rmsnorm_torch": ".rmsnorm",
+    "rnn_cute": ".rnn",
+    "rnn_torch": ".rnn",
+    "MoE_Torch": ".scattermoe",
+    "MoE_Triton": ".scattermoe",
+    "pack_sequence_cute": ".sequence_packing",
+    "pack_sequence_torch": ".sequence_packing",
+    "unpack_sequence_cute": ".sequence_packing",
+    "unpack_sequence_torch": ".sequence_packing",
+    "softmax_cute": ".softmax",
+    "softmax_torch": ".softmax",
+    "swiglu_cute": ".swiglu",
+    "swiglu_packed_cute": ".swiglu",
+    "swiglu_packed_torch": ".swiglu",
+    "swiglu_torch": ".swiglu",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name, None)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+def import_all_kernels() -> None:
+    """imports every kernel package, this defines all the triton kernels, cutotune functions and cpp_jit modules"""
+
+    for module_name in sorted(set(_LAZY_IMPORTS.values())):
+        importlib.import_module(module_name, __name__)
@@ -3,4 +3,6 @@
 # **************************************************
 
 from .gru import GRU
-from .rnn import RNN
+from .patch import patch_model
+from .rmsnorm import RMSNorm
+from .rnn import RNN, TorchCompatibleRNN
@@ -0,0 +1,135 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from typing import Any, Callable
+
+import torch.nn as nn
+
+from ..kernels import MoE_Torch, MoE_Triton
+from ..kernels.scattermoe.torch_implementation import Experts_Torch
+from ..kernels.scattermoe.triton_implementation import Experts_Triton
+from .rmsnorm import RMSNorm
+from .rnn import TorchCompatibleRNN
+
+
+class _ModuleSwap:
+    def __init__(
+        self,
+        name: str,
+        original_class: type[nn.Module],
+        replacement_class: type[nn.Module] | None,
+        get_unsupported_reason: Callable[[nn.Module], str | None],
+        submodule_classes: dict[str, type[nn.Module]] | None = None,
+    ) -> None:
+        self.name = name
+        self.original_class = original_class
+        self.replacement_class = replacement_class
+        self.get_unsupported_reason = get_unsupported_reason
+        self.submodule_classes = {} if submodule_classes is None else submodule_classes
+
+
+def _get_rmsnorm_unsupported_reason(module: nn.RMSNorm) -> str | None:
+    if len(module.normalized_shape) != 1:
+        return "only normalization over the last dimension is supported"
+
+    return None
+
+
+def _get_rnn_unsupported_reason(module: nn.RNN) -> str | None:
+    if module.num_layers != 1:
+        return "only single layer RNNs are supported"
+
+    if module.bidirectional:
+        return "bidirectional RNNs aren't supported"
+
+    return None
+
+
+def _get_gru_unsupported_reason(module: nn.GRU) -> str | None:
+    return (
+        "torch applies the reset gate after the matmul with the state while the cute GRU applies it before, the "
+        "weights of one can't be loaded into the other"
+    )
+
+
+def _get_moe_unsupported_reason(module: MoE_Torch) -> str | None:
+    if any(type(experts) is not Experts_Torch for experts in [module.c_fc, module.c_proj]):
+        return "the experts aren't Experts_Torch"
+
+    if module.c_fc.bias is not None or module.c_proj.bias is not None:
+        return "the triton experts don't support bias"
+
+    return None
+
+
+_MODULE_SWAPS = {
+    swap.name: swap
+    for swap in [
+        _ModuleSwap("rmsnorm", nn.RMSNorm, RMSNorm, _get_rmsnorm_unsupported_reason),
+        _ModuleSwap("rnn", nn.RNN, TorchCompatibleRNN, _get_rnn_unsupported_reason),
+        _ModuleSwap("gru", nn.GRU, None, _get_gru_unsupported_reason),
+        _ModuleSwap(
+            "moe",
+            MoE_Torch,
+            MoE_Triton,
+            _get_moe_unsupported_reason,
+            submodule_classes={"c_fc": Experts_Triton, "c_proj": Experts_Triton},
+        ),
+    ]
+}
+
+
+def patch_model(model: nn.Module, modules: list[str] | None = None) -> list[dict[str, Any]]:
+    """swaps the known torch modules of a model with the cute modules in eager mode, the modules are converted in
+    place by changing their class to a subclass that only overrides the forward so parameters, buffers, hooks and the
+    state_dict are untouched. Calls to functional ops inside a forward can't be swapped, use CuteInductor for those.
+
+    Args:
+        model (nn.Module): model to patch, a model that is one of the known modules is patched as well
+        modules (list[str] | None, optional): names of the swaps to apply out of "rmsnorm", "rnn", "gru" and "moe",
+            None applies all of them. Defaults to None.
+
+    Returns:
+        list[dict[str, Any]]: one entry for every module that matched a swap with the name of the module, the name of
+            the swap, the original and the new class, whether the module was swapped and the reason if it wasn't
+    """
+
+    if modules is None:
+        modules = list(_MODULE_SWAPS)
+
+    for name in modules:
+        assert name in _MODULE_SWAPS, f"unexpected module ({name}), expected one of {list(_MODULE_SWAPS)}"
+
+    swaps = [_MODULE_SWAPS[name] for name in modules]
+    report = []
+
+    # the modules are listed before any of them is swapped so that every module is visited once
+    for module_name, module in list(model.named_modules()):
+        for swap in swaps:
+            # subclasses can override the forward and are left alone
+            if type(module) is not swap.original_class:
+                continue
+
+            reason = swap.get_unsupported_reason(module)
+            swapped = swap.replacement_class is not None and reason is None
+
+            report.append(
+                {
+                    "name": module_name,
+                    "module": swap.name,
+                    "original": swap.original_class.__name__,
+                    "replacement": swap.replacement_class.__name__ if swapped else None,
+                    "swapped": swapped,
+                    "reason": reason,
+                }
+            )
+
+            if swapped:
+                module.__class__ = swap.replacement_class
+                for submodule_name, submodule_class in swap.submodule_classes.items():
+                    module.get_submodule(submodule_name).__class__ = submodule_class
+
+            break
+
+    return report
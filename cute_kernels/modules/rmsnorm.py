@@ -0,0 +1,35 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import torch
+import torch.nn as nn
+
+from ..kernels import rmsnorm_cute
+
+
+class RMSNorm(nn.RMSNorm):
+    def __init__(
+        self,
+        normalized_shape: int | list[int] | torch.Size,
+        eps: float | None = None,
+        elementwise_affine: bool = True,
+        device: torch.device | None = None,
+        dtype: torch.dtype | None = None,
+    ) -> None:
+        super().__init__(
+            normalized_shape=normalized_shape,
+            eps=eps,
+            elementwise_affine=elementwise_affine,
+            device=device,
+            dtype=dtype,
+        )
+
+        assert len(self.normalized_shape) == 1, "only normalization over the last dimension is supported"
+
+    def forward(self, x: torch.Tensor, use_kernel: bool = True) -> torch.Tensor:
+        # the kernel needs the weight in the dtype of the input, mixed dtypes fall back to torch
+        if not use_kernel or (self.weight is not None and self.weight.dtype != x.dtype):
+            return super().forward(x)
+
+        return rmsnorm_cute(x=x, weight=self.weight, eps=self.eps)
@@ -4,6 +4,7 @@
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 from ..kernels import rnn_cute, rnn_torch
 from ..math import divide_if_divisible
@@ -75,3 +76,44 @@ class RNN(nn.Module):
     @torch.no_grad()
     def reset_parameters(self) -> None:
         nn.init.normal_(self.state_weight)
+
+
+class TorchCompatibleRNN(nn.RNN):
+    def forward(
+        self, input: torch.Tensor | nn.utils.rnn.PackedSequence, hx: torch.Tensor | None = None
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        # packed sequences, unbatched inputs and stacked or bidirectional RNNs run the torch implementation
+        if (
+            isinstance(input, nn.utils.rnn.PackedSequence)
+            or input.dim() != 3
+            or self.num_layers != 1
+            or self.bidirectional
+            or self.proj_size != 0
+        ):
+            return super().forward(input, hx)
+
+        if not self.batch_first:
+            input = input.transpose(0, 1)
+
+        # both biases are added to the projected input since the kernel computes act(h @ W + x)
+        bias = self.bias_ih_l0 + self.bias_hh_l0 if self.bias else None
+        input = F.linear(input, self.weight_ih_l0, bias)
+
+        if hx is not None:
+            hx = hx.squeeze(0).unsqueeze(1)
+
+        # torch multiplies the state with the transpose of weight_hh, the kernel treats the RNN as a single head
+        input = rnn_cute(
+            input=input.unsqueeze(2),
+            weight=self.weight_hh_l0.T.unsqueeze(0),
+            input_state=hx,
+            activation_function="tanh" if self.nonlinearity == "tanh" else "leaky_relu",
+            relu_negative_slope=None if self.nonlinearity == "tanh" else 0,
+        ).squeeze(2)
+
+        hx = input[:, -1].unsqueeze(0)
+
+        if not self.batch_first:
+            input = input.transpose(0, 1)
+
+        return input, hx
@@ -0,0 +1,112 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import torch
+
+from ..cutotune import cache
+from ..cutotune.cache import _CutoTuneCache
+from ..cutotune.sweep import _get_grid_points, _import_object, _run_point
+from ..cutotune.timer import get_default_device
+from ..jit import compile_cpp_jit_module, get_cpp_jit_module_names
+from ..kernels import import_all_kernels
+
+
+# manifest format of `python -m cute_kernels.precompile`, every op follows the format of the sweeps of `cute_kernels.cutotune.sweep`:
+#
+# device: cuda                                  # optional, defaults to the default accelerator
+# ops:
+#   - name: swiglu
+#     function: cute_kernels.swiglu_cute
+#     backward: true
+#     grid:
+#       dtype: [float32, bfloat16]
+#     arguments:
+#       gate: {shape: [16, 4096], dtype: dtype, requires_grad: true}
+#       up: {shape: [16, 4096], dtype: dtype, requires_grad: true}
+
+_DEFAULT_NUM_WORKERS = 8
+
+
+def _initialize_worker() -> None:
+    # the worker processes share the device so their timings are noisy, configs are tuned (which compiles every
+    # variant) but never persisted. Configs that are already in the cache are reused so only the variants that will
+    # actually run get compiled.
+    cache._CUTOTUNE_CACHE = _CutoTuneCache(autosave=False)
+
+
+def _compile_cpp_extension(module_name: str) -> None:
+    # kernel packages are imported lazily, the cpp_jit modules are only registered once their package is imported
+    import_all_kernels()
+    compile_cpp_jit_module(module_name)
+
+
+def _run_op(op: dict, point: dict, device: str) -> None:
+    _run_point(_import_object(op["function"]), op, point, torch.device(device))
+
+
+def precompile(
+    ops: list[dict] = [],
+    cpp_extensions: bool | list[str] = True,
+    device: torch.device | None = None,
+    num_workers: int | None = None,
+) -> None:
+    """compiles the C++/CUDA extensions and warms the on-disk Triton cache ahead of time so that the first training
+    steps or inference requests don't stall on JIT compilation. Every op is called once for every point of its grid
+    (and its backward is run if requested), so all the constexpr variants that are needed for these dtypes and shapes
+    get compiled.
+
+    Args:
+        ops (list[dict], optional): ops to run, in the format of the sweeps of `cute_kernels.cutotune.sweep`.
+            Defaults to [].
+        cpp_extensions (bool | list[str], optional): True compiles every cpp_jit module, a list only compiles the
+            listed modules. Defaults to True.
+        device (torch.device | None, optional): device to run the ops on, None uses the default accelerator. Defaults
+            to None.
+        num_workers (int | None, optional): size of the process pool, 0 compiles in the calling process. Defaults to
+            min(8, number of CPUs).
+    """
+
+    if device is None:
+        device = get_default_device()
+
+    if num_workers is None:
+        num_workers = min(_DEFAULT_NUM_WORKERS, os.cpu_count())
+
+    if cpp_extensions is True:
+        import_all_kernels()
+        cpp_extensions = get_cpp_jit_module_names()
+    elif cpp_extensions is False:
+        cpp_extensions = []
+
+    op_names = [op["name"] for op in ops]
+    assert len(set(op_names)) == len(op_names), "op names should be unique"
+
+    points = [(op, point) for op in ops for point in _get_grid_points(op.get("grid", {}))]
+
+    if num_workers == 0:
+        for module_name in cpp_extensions:
+            _compile_cpp_extension(module_name)
+
+        for op, point in points:
+            _run_op(op, point, str(device))
+
+        return
+
+    # spawned workers don't inherit the CUDA context of the caller
+    with ProcessPoolExecutor(
+        max_workers=num_workers, mp_context=multiprocessing.get_context("spawn"), initializer=_initialize_worker
+    ) as executor:
+        # extensions are compiled first since ops can depend on them, every module is compiled by a single worker and
+        # the build cache makes them available to all the other workers
+        futures = [executor.submit(_compile_cpp_extension, module_name) for module_name in cpp_extensions]
+        for future in futures:
+            future.result()
+
+        futures = [executor.submit(_run_op, op, point, str(device)) for op, point in points]
+        for future in futures:
+            future.result()
@@ -0,0 +1,59 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from argparse import ArgumentParser, Namespace
+
+import torch
+
+from . import precompile
+
+
+def get_args() -> Namespace:
+    parser = ArgumentParser(description="compile the C++/CUDA extensions and Triton kernels ahead of time")
+    parser.add_argument("manifest", type=str, nargs="?", default=None, help="YAML manifest of the ops to compile")
+    parser.add_argument("--device", type=str, default=None, help="device to compile for")
+    parser.add_argument("--num-workers", type=int, default=None, help="size of the process pool")
+    parser.add_argument(
+        "--cpp-extensions",
+        type=str,
+        nargs="*",
+        default=None,
+        help="cpp_jit modules to compile, all of them are compiled if not passed",
+    )
+    parser.add_argument("--no-cpp-extensions", action="store_true", help="don't compile the cpp_jit modules")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    # yaml is only needed by the command line interface
+    import yaml
+
+    args = get_args()
+
+    manifest = {}
+    if args.manifest is not None:
+        with open(args.manifest, "r") as f:
+            manifest = yaml.safe_load(f)
+
+    device = args.device
+    if device is None and "device" in manifest:
+        device = manifest["device"]
+
+    cpp_extensions = True
+    if args.no_cpp_extensions:
+        cpp_extensions = False
+    elif args.cpp_extensions is not None:
+        cpp_extensions = args.cpp_extensions
+
+    precompile(
+        ops=manifest.get("ops", []),
+        cpp_extensions=cpp_extensions,
+        device=None if device is None else torch.device(device),
+        num_workers=args.num_workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from .contiguous import ensure_contiguous, ensure_same_strides
 from .custom_op import cute_op, enable_cute_tracing
 from .device import device_synchronize, get_sm_count, is_hip, is_nvidia_gpu
 from .env import get_boolean_env_variable
+from .filesystem import atomic_write, file_lock
 from .ptx import get_ptx_from_triton_kernel
 from .random import set_seed
 from .settings import get_triton_num_warps
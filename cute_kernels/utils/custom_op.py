@@ -51,6 +51,7 @@ def cute_op(
 
         _run.__signature__ = inspect.signature(func)
         _run.__name__ = func.__name__
+        _run.__wrapped__ = func
 
         return _run
 
@@ -5,9 +5,14 @@
 import torch
 
 
-def device_synchronize() -> None:
-    if torch.cuda.is_available():
-        torch.cuda.synchronize()
+def device_synchronize(device: torch.device | None = None) -> None:
+    if device is None:
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+    elif device.type == "cuda":
+        torch.cuda.synchronize(device)
+    elif device.type == "xpu":
+        torch.xpu.synchronize(device)
 
 
 def get_sm_count(device: torch.device) -> int:
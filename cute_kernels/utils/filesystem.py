@@ -0,0 +1,44 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import fcntl
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def file_lock(filename: str):
+    # exclusive advisory lock, shared across all processes that can see the same filesystem
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+
+    with open(filename, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def atomic_write(filename: str, mode: str = "w"):
+    # write to a temporary file in the same directory and rename, readers never see a partially written file
+    directory = os.path.dirname(filename)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temporary_filename = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filename)}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        if os.path.exists(temporary_filename):
+            os.remove(temporary_filename)
+
+        raise
@@ -4,15 +4,15 @@
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 from cute_kernels import CuteInductor
-from cute_kernels.cute_inductor.rmsnorm import replace_rmsnorm
-from cute_kernels.cute_inductor.swiglu_packed import replace_swiglu_unchunked
+from cute_kernels.cute_inductor import get_cute_patterns
 
 
-# NOTE swiglu unchunked computes:
+# NOTE swiglu packed computes:
 # ------------------------------------------------------------------------------
-# def swiglu_unchunked_torch(x: torch.Tensor) -> torch.Tensor:
+# def swiglu_packed_torch(x: torch.Tensor) -> torch.Tensor:
 #     x = x.chunk(2, dim=-1)
 #     return x[0] * F.silu(x[1])
 # ------------------------------------------------------------------------------
@@ -23,12 +23,14 @@ class Model(nn.Module):
         super().__init__()
 
         self.norm1 = nn.RMSNorm(4)
-        self.linear = nn.Linear(4, 4)
+        self.linear = nn.Linear(4, 8)
         self.norm2 = nn.RMSNorm(4)
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         x = self.norm1(x)
         x = self.linear(x)
+        x = x.chunk(2, dim=-1)
+        x = x[0] * F.silu(x[1])
         x = self.norm2(x)
         return x
 
@@ -36,10 +38,17 @@ class Model(nn.Module):
 model = Model().to(torch.cuda.current_device())
 
 use_torch_inductor_after_cute_inductor = True  # to use torch's compiler optimizations as well
-replace_functions = [replace_rmsnorm]  # add other replacing functions
+# names of the registered patterns to apply, these are the ones applied by default (patterns=None)
+patterns = [name for name, pattern in get_cute_patterns().items() if pattern.enabled_by_default]
+# patterns that are disabled by default have known limitations and are only opted into explicitly, for example
+# fused_linear_cross_entropy doesn't support ignore_index and is only safe when the labels are never masked with -100
+# patterns.append("fused_linear_cross_entropy")
+benchmark_replacements = True  # only keep the replacements that are faster than the original subgraphs
 
 cute_inductor = CuteInductor(
-    use_torch_inductor_after_cute_inductor=use_torch_inductor_after_cute_inductor, replace_functions=replace_functions
+    use_torch_inductor_after_cute_inductor=use_torch_inductor_after_cute_inductor,
+    patterns=patterns,
+    benchmark_replacements=benchmark_replacements,
 )
 
 compiled_model = torch.compile(model, backend=cute_inductor.compiler)
@@ -47,3 +56,10 @@ compiled_model = torch.compile(model, backend=cute_inductor.compiler)
 # trigger JIT compilation
 x = torch.randn(4, 4, device=torch.cuda.current_device())
 y = compiled_model(x)
+
+# number of times every pattern was replaced
+print(cute_inductor.pattern_hits)
+
+# timings of every match and whether it was replaced
+for report in cute_inductor.compile_report:
+    print(report)
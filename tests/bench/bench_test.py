@@ -0,0 +1,98 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import inspect
+import os
+import tempfile
+from unittest.mock import patch
+
+import torch
+
+from cute_kernels.bench import (
+    Benchmark,
+    compare_results,
+    get_benchmarks,
+    load_results,
+    register_benchmark,
+    registry,
+    run_benchmarks,
+    save_results,
+)
+from cute_kernels.cutotune.sweep import _import_object
+
+from ..test_commons import TestCommons
+
+
+def _add_cute(x: torch.Tensor, y: torch.Tensor, fail: bool = False) -> torch.Tensor:
+    if fail:
+        raise RuntimeError("unsupported")
+
+    return x + y
+
+
+def _add_torch(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return torch.add(x, y)
+
+
+class BenchTest(TestCommons):
+    def test_registered_benchmarks_match_the_signatures(self) -> None:
+        for benchmark in get_benchmarks().values():
+            for function_path, extra_arguments in benchmark.get_implementations().values():
+                signature = inspect.signature(_import_object(function_path))
+                signature.bind(**{**benchmark.arguments, **extra_arguments})
+
+    def test_run_save_and_compare(self) -> None:
+        with patch.dict(registry._ALL_BENCHMARKS, clear=True):
+            register_benchmark(
+                Benchmark(
+                    name="add",
+                    cute_function=f"{__name__}._add_cute",
+                    torch_function=f"{__name__}._add_torch",
+                    grid={"num_elements": [16, 32], "dtype": ["float32"]},
+                    arguments={
+                        "x": {"shape": ["num_elements"], "dtype": "dtype", "requires_grad": True},
+                        "y": {"shape": ["num_elements"], "dtype": "dtype"},
+                    },
+                    cute_arguments={"default": {}, "failing": {"fail": True}},
+                    backward=True,
+                    flops=lambda point: point["num_elements"],
+                )
+            )
+
+            with self.assertRaises(AssertionError):
+                register_benchmark(Benchmark("add", "torch.add", "torch.add", grid={}, arguments={}))
+
+            results = run_benchmarks(
+                device=torch.device("cpu"), grid={"num_elements": [8]}, warmup_iterations=1, benchmark_iterations=3
+            )
+
+        assert [(result["implementation"], result["point"]) for result in results] == [
+            ("torch", {"num_elements": 8, "dtype": "float32"}),
+            ("cute:default", {"num_elements": 8, "dtype": "float32"}),
+            ("cute:failing", {"num_elements": 8, "dtype": "float32"}),
+        ]
+
+        torch_result, cute_result, failing_result = results
+        assert torch_result["num_samples"] == 3 and torch_result["median_ms"] > 0
+        assert torch_result["tflops"] > 0 and torch_result["error"] is None
+        assert cute_result["error"] is None
+        assert failing_result["median_ms"] is None and failing_result["error"] == "RuntimeError: unsupported"
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "results.json")
+            save_results(filename, results)
+            assert load_results(filename) == results
+
+        baseline = [dict(result) for result in results]
+        baseline[0]["median_ms"] = torch_result["median_ms"] / 2
+        baseline[1]["median_ms"] = cute_result["median_ms"] * 2
+
+        comparisons = compare_results(results, baseline, threshold=0.1)
+
+        # failed implementations aren't compared
+        assert [(comparison["implementation"], comparison["regression"]) for comparison in comparisons] == [
+            ("torch", True),
+            ("cute:default", False),
+        ]
+        assert comparisons[0]["ratio"] == 2
@@ -0,0 +1,151 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import time
+from unittest.mock import patch
+
+import torch
+import torch.nn.functional as F
+from torch.fx.passes.shape_prop import ShapeProp
+from triton.runtime.errors import OutOfResources
+
+from cute_kernels import CuteInductor
+from cute_kernels.cute_inductor import CutePattern, benchmark_replacement, pattern, replace_cute_patterns
+from cute_kernels.cutotune import cache
+
+from ..test_commons import CutoTuneCacheTestCommons
+
+
+def _slow_identity(x: torch.Tensor) -> torch.Tensor:
+    time.sleep(2e-3)
+    return x
+
+
+# kept as a single node when tracing so that the original subgraph is the slow one
+torch.fx.wrap("_slow_identity")
+
+
+def _slow_add(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return _slow_identity(x) + y
+
+
+def _add(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return x + y
+
+
+def _add_relu(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return F.relu(x + y)
+
+
+def _slow_add_relu(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    time.sleep(2e-3)
+    return (x + y).clamp(min=0)
+
+
+def _forward(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return _slow_add(x, y) * 2 + _add_relu(x, y)
+
+
+def _should_replace(*args) -> bool:
+    return benchmark_replacement(*args)["replaced"]
+
+
+class BenchmarkReplacementTest(CutoTuneCacheTestCommons):
+    def test_only_faster_replacements_are_kept(self) -> None:
+        patterns = [
+            CutePattern(name="add", pattern=_slow_add, replacement=_add),
+            CutePattern(name="add_relu", pattern=_add_relu, replacement=_slow_add_relu),
+        ]
+
+        x, y = torch.randn(2, 4, 4).unbind(0)
+
+        gm = torch.fx.symbolic_trace(_forward)
+        ShapeProp(gm).propagate(x, y)
+
+        assert replace_cute_patterns(gm, patterns, should_replace=_should_replace) == {"add": 1}
+
+        targets = [node.target for node in gm.graph.nodes if node.op == "call_function"]
+        assert _add in targets and _slow_add_relu not in targets and _slow_identity not in targets
+        torch.testing.assert_close(gm(x, y), _forward(x, y))
+
+        # inputs without shapes can't be timed so the graph is left unchanged
+        report = benchmark_replacement(patterns[0], 0, *self._get_subgraph(patterns[0]))
+        assert not report["replaced"] and report["error"] is not None
+
+    def test_cute_inductor(self) -> None:
+        def _forward(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+            return F.relu(x + y) * 2
+
+        with patch.dict(pattern._ALL_CUTE_PATTERNS, clear=True):
+            pattern._ALL_CUTE_PATTERNS["add_relu"] = CutePattern(
+                name="add_relu", pattern=_add_relu, replacement=_slow_add_relu
+            )
+
+            cute_inductor = CuteInductor(use_torch_inductor_after_cute_inductor=False, benchmark_replacements=True)
+
+        x, y = torch.randn(2, 4, 4).unbind(0)
+
+        for i in range(2):
+            torch._dynamo.reset()
+
+            compiled = torch.compile(_forward, backend=cute_inductor.compiler)
+            torch.testing.assert_close(compiled(x, y), _forward(x, y))
+
+            report = cute_inductor.compile_report[i]
+            assert report["pattern"] == "add_relu" and not report["replaced"]
+            assert report["replacement_ms"] > report["original_ms"]
+            # the decision of the second compilation comes from the cutotune cache
+            assert report["cached"] == (i == 1)
+
+        assert cute_inductor.pattern_hits == {}
+
+    def test_failed_replacements(self) -> None:
+        errors = []
+
+        def _failing_add_relu(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+            raise errors[0]
+
+        cute_pattern = CutePattern(name="add_relu", pattern=_add_relu, replacement=_failing_add_relu)
+        x, y = torch.randn(2, 4, 4).unbind(0)
+
+        def _get_report() -> dict:
+            reports = []
+
+            def _benchmark(*args) -> bool:
+                reports.append(benchmark_replacement(*args))
+                return reports[-1]["replaced"]
+
+            gm = torch.fx.symbolic_trace(_add_relu)
+            ShapeProp(gm).propagate(x, y)
+            replace_cute_patterns(gm, [cute_pattern], should_replace=_benchmark)
+
+            return reports[0]
+
+        # a bug is reported but the decision isn't cached so that the next compilation benchmarks it again
+        errors.append(RuntimeError("CUDA error: an illegal memory access was encountered"))
+        report = _get_report()
+        assert not report["replaced"] and not report["cached"]
+        assert report["error"] == "RuntimeError: CUDA error: an illegal memory access was encountered"
+        assert cache._CUTOTUNE_CACHE.get_config("cute_inductor->add_relu", report["lookup_key"]) is None
+
+        # a replacement that runs out of resources for these shapes is never tried again
+        errors[0] = OutOfResources(required=262144, limit=232448, name="shared memory")
+        report = _get_report()
+        assert not report["replaced"] and not report["cached"]
+        assert report["error"].startswith("OutOfResources: out of resource: shared memory")
+
+        report = _get_report()
+        assert not report["replaced"] and report["cached"]
+        assert report["error"].startswith("OutOfResources: out of resource: shared memory")
+
+    def _get_subgraph(self, cute_pattern: CutePattern) -> tuple[torch.fx.GraphModule, dict]:
+        subgraphs = []
+
+        def _capture(pattern: CutePattern, variant_index: int, subgraph: torch.fx.GraphModule, kwargs: dict) -> bool:
+            subgraphs.append((subgraph, kwargs))
+            return False
+
+        replace_cute_patterns(torch.fx.symbolic_trace(_forward), [cute_pattern], should_replace=_capture)
+
+        return subgraphs[0]
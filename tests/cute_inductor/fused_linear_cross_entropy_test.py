@@ -0,0 +1,140 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from unittest.mock import patch
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from parameterized import parameterized
+from torch.fx.passes.shape_prop import ShapeProp
+
+from cute_kernels import CuteInductor, fused_linear_cross_entropy_torch
+from cute_kernels.cute_inductor import CutePattern, get_cute_patterns, pattern, replace_cute_patterns
+from cute_kernels.cute_inductor.fused_linear_cross_entropy import _fused_linear_cross_entropy
+
+from ..test_commons import TestCommons
+
+
+class _LMHead(nn.Module):
+    def __init__(self, hidden_size: int, vocab_size: int, flatten: str, logits_multiplier: float | None) -> None:
+        super().__init__()
+
+        self.lm_head = nn.Linear(hidden_size, vocab_size, bias=False)
+        self.flatten = flatten
+        self.logits_multiplier = logits_multiplier
+
+    def forward(self, x: torch.Tensor, labels: torch.Tensor) -> torch.Tensor:
+        logits = F.linear(x, self.lm_head.weight)
+        if self.logits_multiplier is not None:
+            logits = logits * self.logits_multiplier
+
+        logits = logits.float()
+
+        if self.flatten == "view":
+            logits = logits.view(-1, logits.size(-1))
+        elif self.flatten == "flatten":
+            logits = logits.flatten(0, -2)
+
+        return F.cross_entropy(logits, labels.view(-1), reduction="sum")
+
+
+def _fused_linear_cross_entropy_reference(
+    x: torch.Tensor,
+    weight: torch.Tensor,
+    labels: torch.Tensor,
+    reduction: str,
+    logits_multiplier: float | None = None,
+) -> torch.Tensor:
+    return fused_linear_cross_entropy_torch(x.reshape(-1, x.size(-1)), weight, labels, reduction, logits_multiplier)
+
+
+def _with_torch_replacement(pattern: CutePattern) -> CutePattern:
+    return CutePattern(
+        name=pattern.name,
+        pattern=pattern.pattern,
+        replacement=_fused_linear_cross_entropy_reference,
+        arguments=pattern.arguments,
+        condition=pattern.condition,
+        enabled_by_default=pattern.enabled_by_default,
+    )
+
+
+def _get_graph_module(module: nn.Module, *args) -> torch.fx.GraphModule:
+    gm = torch.fx.symbolic_trace(module)
+    # the pattern checks the shape of the labels
+    ShapeProp(gm).propagate(*args)
+    return gm
+
+
+def _get_inputs(x_shape: tuple[int], vocab_size: int) -> tuple[torch.Tensor, torch.Tensor]:
+    return torch.randn(*x_shape), torch.randint(0, vocab_size, x_shape[:-1])
+
+
+class FusedLinearCrossEntropyPatternTest(TestCommons):
+    @parameterized.expand([("view", (2, 3, 8), 0.5), ("flatten", (2, 3, 8), None), (None, (6, 8), 2)])
+    def test_linear_and_cross_entropy_are_fused(
+        self, flatten: str | None, x_shape: tuple[int], logits_multiplier: float | None
+    ) -> None:
+        module = _LMHead(8, 16, flatten, logits_multiplier)
+        x, labels = _get_inputs(x_shape, 16)
+
+        # labels equal to ignore_index aren't supported by the fused op so the pattern is only applied on request
+        gm = _get_graph_module(module, x, labels)
+        assert replace_cute_patterns(gm) == {}
+
+        pattern = get_cute_patterns()["fused_linear_cross_entropy"]
+        assert replace_cute_patterns(gm, [pattern]) == {"fused_linear_cross_entropy": 1}
+
+        targets = [node.target for node in gm.graph.nodes if node.op == "call_function"]
+        assert _fused_linear_cross_entropy in targets and F.cross_entropy not in targets
+
+        gm = _get_graph_module(module, x, labels)
+        assert replace_cute_patterns(gm, [_with_torch_replacement(pattern)]) == {"fused_linear_cross_entropy": 1}
+        torch.testing.assert_close(gm(x, labels), module(x, labels))
+
+    def test_unsupported_graphs(self) -> None:
+        def _forward(x: torch.Tensor, weight: torch.Tensor, labels: torch.Tensor) -> tuple[torch.Tensor]:
+            logits = F.linear(x, weight)
+            # the logits are used outside of the loss
+            loss = F.cross_entropy(logits, labels)
+            return loss, logits.argmax(dim=-1)
+
+        def _forward_without_reduction(x: torch.Tensor, weight: torch.Tensor, labels: torch.Tensor) -> torch.Tensor:
+            return F.cross_entropy(F.linear(x, weight), labels, reduction="none")
+
+        def _forward_with_probabilities(x: torch.Tensor, weight: torch.Tensor, labels: torch.Tensor) -> torch.Tensor:
+            return F.cross_entropy(F.linear(x, weight), labels.softmax(dim=-1))
+
+        patterns = [get_cute_patterns()["fused_linear_cross_entropy"]]
+        x, weight = torch.randn(2, 6, 8).unbind(0)
+        labels = torch.randint(0, 6, (6,))
+
+        for function, function_labels in [
+            (_forward, labels),
+            (_forward_without_reduction, labels),
+            (_forward_with_probabilities, torch.randn(6, 6)),
+        ]:
+            assert replace_cute_patterns(_get_graph_module(function, x, weight, function_labels), patterns) == {}
+
+        # the shape of the labels is unknown without the metadata of the graph
+        assert replace_cute_patterns(torch.fx.symbolic_trace(_forward_without_reduction), patterns) == {}
+
+    def test_cute_inductor(self) -> None:
+        module = _LMHead(8, 16, "view", 0.5)
+        x, labels = _get_inputs((2, 3, 8), 16)
+
+        with patch.dict(pattern._ALL_CUTE_PATTERNS):
+            pattern._ALL_CUTE_PATTERNS["fused_linear_cross_entropy"] = _with_torch_replacement(
+                pattern._ALL_CUTE_PATTERNS["fused_linear_cross_entropy"]
+            )
+
+            cute_inductor = CuteInductor(
+                use_torch_inductor_after_cute_inductor=False, patterns=["fused_linear_cross_entropy"]
+            )
+
+        compiled = torch.compile(module, backend=cute_inductor.compiler)
+        torch.testing.assert_close(compiled(x, labels), module(x, labels))
+
+        assert cute_inductor.pattern_hits == {"fused_linear_cross_entropy": 1}
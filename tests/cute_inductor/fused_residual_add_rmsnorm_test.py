@@ -0,0 +1,105 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from cute_kernels import fused_residual_add_rmsnorm_cute, fused_residual_add_rmsnorm_torch
+from cute_kernels.cute_inductor import CutePattern, get_cute_patterns, replace_cute_patterns
+
+from ..test_commons import TestCommons
+
+
+class _Block(nn.Module):
+    def __init__(self, hidden_size: int) -> None:
+        super().__init__()
+
+        self.norm1 = nn.Parameter(torch.randn(hidden_size))
+        self.linear1 = nn.Linear(hidden_size, hidden_size)
+        self.norm2 = nn.Parameter(torch.randn(hidden_size))
+        self.linear2 = nn.Linear(hidden_size, hidden_size)
+        self.norm3 = nn.Parameter(torch.randn(hidden_size))
+
+    def forward(self, x: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        hidden_size = x.size(-1)
+
+        residual = x
+        x = F.rms_norm(residual, (hidden_size,), self.norm1, 1e-5)
+        x = self.linear1(x)
+
+        residual = residual + x * 0.5
+        x = F.rms_norm(residual, (hidden_size,), self.norm2, 1e-5)
+        x = self.linear2(x)
+
+        residual = x + residual
+        return torch.rms_norm(residual, [hidden_size], self.norm3, 1e-5), residual
+
+
+class _ResidualUsedFirst(nn.Module):
+    def __init__(self, hidden_size: int) -> None:
+        super().__init__()
+        self.norm = nn.Parameter(torch.randn(hidden_size))
+
+    def forward(self, x: torch.Tensor, residual: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        residual = residual + x
+        # used before the weight of the norm is read
+        y = residual * 2
+        return F.rms_norm(residual, (x.size(-1),), self.norm, 1e-5), y
+
+
+def _with_torch_replacement(pattern: CutePattern) -> CutePattern:
+    return CutePattern(
+        name=pattern.name,
+        pattern=pattern.pattern,
+        replacement=fused_residual_add_rmsnorm_torch,
+        arguments=pattern.arguments,
+        condition=pattern.condition,
+    )
+
+
+class FusedResidualAddRMSNormPatternTest(TestCommons):
+    def test_both_outputs_are_rewired(self) -> None:
+        block = _Block(8)
+        x = torch.randn(4, 8)
+
+        gm = torch.fx.symbolic_trace(block)
+        assert replace_cute_patterns(gm) == {
+            "fused_residual_add_rmsnorm": 1,
+            "fused_residual_add_rmsnorm_with_multiplier": 1,
+            "rmsnorm": 1,
+        }
+
+        targets = [node.target for node in gm.graph.nodes if node.op == "call_function"]
+        assert targets.count(fused_residual_add_rmsnorm_cute) == 2
+
+        # the rewritten graph computes the same thing with the torch reference of the fused op
+        patterns = get_cute_patterns()
+        patterns = [
+            _with_torch_replacement(patterns["fused_residual_add_rmsnorm"]),
+            _with_torch_replacement(patterns["fused_residual_add_rmsnorm_with_multiplier"]),
+        ]
+
+        gm = torch.fx.symbolic_trace(block)
+        assert replace_cute_patterns(gm, patterns) == {
+            "fused_residual_add_rmsnorm": 1,
+            "fused_residual_add_rmsnorm_with_multiplier": 1,
+        }
+
+        for output, expected in zip(gm(x), block(x)):
+            torch.testing.assert_close(output, expected)
+
+    def test_inputs_not_available_at_first_use(self) -> None:
+        module = _ResidualUsedFirst(8)
+        gm = torch.fx.symbolic_trace(module)
+
+        # the fused op would need the weight before it is read, only the norm is replaced
+        assert replace_cute_patterns(gm) == {"rmsnorm": 1}
+
+        x, residual = torch.randn(2, 4, 8).unbind(0)
+        gm = torch.fx.symbolic_trace(module)
+        replace_cute_patterns(gm, [_with_torch_replacement(get_cute_patterns()["fused_residual_add_rmsnorm"])])
+
+        for output, expected in zip(gm(x, residual), module(x, residual)):
+            torch.testing.assert_close(output, expected)
@@ -0,0 +1,103 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+from unittest.mock import patch
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from cute_kernels import CuteInductor, rmsnorm_cute, swiglu_packed_cute
+from cute_kernels.cute_inductor import CutePattern, pattern, register_cute_pattern, replace_cute_patterns
+
+from ..test_commons import TestCommons
+
+
+def _add_relu(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return F.relu(x + y)
+
+
+def _fused_add_relu(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return (x + y).clamp(min=0)
+
+
+class _Model(nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.weight = nn.Parameter(torch.ones(8))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        x = F.rms_norm(x, (8,), self.weight, eps=1e-5)
+        x = x.chunk(2, dim=-1)
+        # operands of the multiply are swapped
+        x = F.silu(x[1]) * x[0]
+        return torch.rms_norm(x, [4], None)
+
+
+class _UnsupportedModel(nn.Module):
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        # rmsnorm over 2 dimensions
+        x = F.rms_norm(x, (2, 8))
+        # chunk along the first dimension
+        y = x.chunk(2, dim=0)
+        y = y[0] * F.silu(y[1])
+        # the chunks are used outside of the swiglu
+        z = x.chunk(2, dim=-1)
+        return y, z[0] * F.silu(z[1]) + z[0]
+
+
+def _get_targets(gm: torch.fx.GraphModule) -> list:
+    return [node.target for node in gm.graph.nodes if node.op == "call_function"]
+
+
+class PatternTest(TestCommons):
+    def test_registered_patterns(self) -> None:
+        gm = torch.fx.symbolic_trace(_Model())
+        hits = replace_cute_patterns(gm)
+
+        assert hits == {"rmsnorm": 2, "swiglu_packed": 1}
+        assert _get_targets(gm) == [rmsnorm_cute, swiglu_packed_cute, rmsnorm_cute]
+
+        gm = torch.fx.symbolic_trace(_UnsupportedModel())
+        assert replace_cute_patterns(gm) == {}
+        assert rmsnorm_cute not in _get_targets(gm) and swiglu_packed_cute not in _get_targets(gm)
+
+    def test_custom_pattern(self) -> None:
+        def _forward(x: torch.Tensor, y: torch.Tensor, z: torch.Tensor) -> torch.Tensor:
+            return F.relu(y + x) * F.relu(x + z) - F.relu(x * z)
+
+        x, y, z = torch.randn(3, 4, 4).unbind(0)
+        expected = _forward(x, y, z)
+
+        custom_pattern = CutePattern(
+            name="add_relu",
+            pattern=_add_relu,
+            replacement=_fused_add_relu,
+            condition=lambda bindings: bindings["y"].name != "z",
+        )
+
+        gm = torch.fx.symbolic_trace(_forward)
+        assert replace_cute_patterns(gm, [custom_pattern]) == {"add_relu": 1}
+        assert _get_targets(gm).count(_fused_add_relu) == 1
+
+        torch.testing.assert_close(gm(x, y, z), expected)
+
+    def test_cute_inductor(self) -> None:
+        def _forward(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+            return F.relu(x + y) + F.relu(y + 1)
+
+        with patch.dict(pattern._ALL_CUTE_PATTERNS, clear=True):
+            register_cute_pattern(CutePattern(name="add_relu", pattern=_add_relu, replacement=_fused_add_relu))
+
+            with self.assertRaises(AssertionError):
+                register_cute_pattern(CutePattern(name="add_relu", pattern=_add_relu, replacement=_fused_add_relu))
+
+            cute_inductor = CuteInductor(use_torch_inductor_after_cute_inductor=False)
+
+        x, y = torch.randn(2, 4, 4).unbind(0)
+        compiled = torch.compile(_forward, backend=cute_inductor.compiler)
+        torch.testing.assert_close(compiled(x, y), _forward(x, y))
+
+        # the constant operand matches the pattern as well
+        assert cute_inductor.pattern_hits == {"add_relu": 2}
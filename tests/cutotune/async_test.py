@@ -0,0 +1,158 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable
+
+import torch
+from parameterized import parameterized
+
+from cute_kernels import CutoTuneConfig, CutoTuneParameter, cutotune, flush_cutotune, register_cutotune_swap_hook
+
+from ..test_commons import CutoTuneCacheTestCommons, TestCommons
+
+
+class AsyncCutoTuneTest(CutoTuneCacheTestCommons):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.swaps = []
+        self.remove_hook = register_cutotune_swap_hook(self._record_swap)
+
+    def tearDown(self) -> None:
+        self.remove_hook()
+        super().tearDown()
+
+    def _record_swap(
+        self, function_hash: str, lookup_key: str, old_config: CutoTuneConfig, new_config: CutoTuneConfig
+    ) -> None:
+        self.swaps.append((function_hash, old_config, new_config, threading.current_thread()))
+
+    @parameterized.expand(TestCommons.make_args_matrix(["background", "deferred"]))
+    def test_async_cutotune(self, async_tuning: str) -> None:
+        calls = []
+        default_config = CutoTuneConfig({"SLEEP_FACTOR": 4})
+
+        @cutotune(
+            configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [4, 3, 1, 2]],
+            triggers={"x.dtype"},
+            warmup_iterations=0,
+            benchmark_iterations=2,
+            async_tuning=async_tuning,
+            default_config=default_config,
+        )
+        def _function(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+            calls.append((x.data_ptr(), SLEEP_FACTOR, threading.current_thread()))
+            time.sleep(SLEEP_FACTOR * 1e-3)
+
+        x = torch.randn(16)
+
+        # the first call is served with the default config
+        _function(x, SLEEP_FACTOR=CutoTuneParameter())
+        assert calls[0] == (x.data_ptr(), 4, threading.main_thread())
+
+        flush_cutotune()
+
+        # tuning ran on a copy of the arguments
+        tuning_calls = calls[1:]
+        assert len(tuning_calls) == 8
+        assert all(data_ptr != x.data_ptr() for data_ptr, _, _ in tuning_calls)
+
+        expected_thread = threading.main_thread() if async_tuning == "deferred" else tuning_calls[0][2]
+        assert all(thread is expected_thread for _, _, thread in tuning_calls)
+        if async_tuning == "background":
+            assert expected_thread is not threading.main_thread()
+
+        # the winner is swapped in, the hook observed the swap and the winner is persisted
+        ((function_hash, old_config, new_config, thread),) = self.swaps
+        assert function_hash == _function.function_hash
+        assert old_config is default_config
+        assert new_config.get_key_values() == {"SLEEP_FACTOR": 1}
+        assert thread is expected_thread
+
+        ((dispatch_key, best_config),) = _function.function_cache.items()
+        assert best_config is new_config
+
+        persistent_cache = self.load_cutotune_cache()
+        lookup_key = _function._get_lookup_key(dispatch_key)
+        assert persistent_cache.get_config(_function.function_hash, lookup_key).get_key_values() == {"SLEEP_FACTOR": 1}
+
+        calls.clear()
+        _function(x, SLEEP_FACTOR=CutoTuneParameter())
+        assert calls == [(x.data_ptr(), 1, threading.main_thread())]
+
+    def test_background_tuning_keeps_compiled_regions_compiled(self) -> None:
+        tuning_started = threading.Event()
+        tuning_released = threading.Event()
+
+        @cutotune(
+            configs=[CutoTuneConfig({"BLOCK_SIZE": 1}), CutoTuneConfig({"BLOCK_SIZE": 2})],
+            triggers={"x.dtype"},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+            async_tuning="background",
+        )
+        def _function(x: torch.Tensor, BLOCK_SIZE: int | CutoTuneParameter) -> None:
+            if threading.current_thread() is not threading.main_thread():
+                tuning_started.set()
+                tuning_released.wait(timeout=60)
+
+        compiled_graphs = []
+
+        def _backend(gm: torch.fx.GraphModule, example_inputs: list[torch.Tensor]) -> Callable:
+            compiled_graphs.append(gm)
+            return gm.forward
+
+        @torch.compile(backend=_backend)
+        def _add_one(x: torch.Tensor) -> torch.Tensor:
+            return x + 1
+
+        _function(torch.randn(16), BLOCK_SIZE=CutoTuneParameter())
+        assert tuning_started.wait(timeout=60)
+
+        # the compiled regions of the main thread keep compiling while the background job is tuning
+        try:
+            _add_one(torch.randn(16))
+        finally:
+            tuning_released.set()
+
+        flush_cutotune()
+        assert len(compiled_graphs) == 1
+
+    def test_environment_variable_is_a_global_switch(self) -> None:
+        code = """
+from cute_kernels import CutoTuneConfig, cutotune
+from cute_kernels.kernels.add_tensor import _forward
+
+
+@cutotune(configs=[CutoTuneConfig({"BLOCK_SIZE": 1})])
+def _default(BLOCK_SIZE: int) -> None:
+    return
+
+
+@cutotune(configs=[CutoTuneConfig({"BLOCK_SIZE": 1})], async_tuning=None)
+def _synchronous(BLOCK_SIZE: int) -> None:
+    return
+
+
+# every function that doesn't pass async_tuning follows the switch, including the kernels of the package
+assert _default.async_tuning == "deferred"
+assert _forward.async_tuning == "deferred"
+assert _synchronous.async_tuning is None
+"""
+
+        subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "ASYNC_CUTOTUNE": "deferred"})
+
+        # invalid values fail on import instead of on the first decorated function
+        process = subprocess.run(
+            [sys.executable, "-c", "import cute_kernels.cutotune"],
+            env={**os.environ, "ASYNC_CUTOTUNE": "later"},
+            capture_output=True,
+            text=True,
+        )
+        assert process.returncode != 0 and "ASYNC_CUTOTUNE" in process.stderr
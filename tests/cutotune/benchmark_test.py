@@ -0,0 +1,80 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import random
+
+from parameterized import parameterized
+
+from cute_kernels import FixedIterationsBenchmark, SuccessiveHalvingBenchmark
+from cute_kernels.cutotune import TimingStatistics
+from cute_kernels.cutotune.benchmark import _BenchmarkStrategy
+
+from ..test_commons import TestCommons
+
+
+class _NoisyConfigs:
+    # config i takes 1 + i / 500 ms with noise and occasional large outliers, the number of timed iterations is
+    # recorded
+    def __init__(self, num_configs: int, seed: int) -> None:
+        self.num_configs = num_configs
+        self.random = random.Random(seed)
+        self.num_iterations = 0
+
+    def __call__(self, index: int, warmup_iterations: int, benchmark_iterations: int, per_iteration: bool) -> list:
+        self.num_iterations += warmup_iterations + benchmark_iterations
+
+        samples = []
+        for _ in range(benchmark_iterations):
+            sample = 1 + index / 500 + self.random.uniform(0, 0.01)
+            if self.random.random() < 0.05:
+                sample *= 10
+
+            samples.append(sample)
+
+        return samples if per_iteration else [sum(samples) / len(samples)]
+
+
+class BenchmarkStrategyTest(TestCommons):
+    def test_timing_statistics(self) -> None:
+        statistics = TimingStatistics([5, 1, 2, 3, 4, 100, 3, 2, 4, 1] * 2, trim_fraction=0.1)
+
+        assert statistics.median == 3
+        assert statistics.mean == 12.5
+        assert statistics.trimmed_mean == 3
+
+        lower, upper = statistics.confidence_interval
+        assert lower <= statistics.median <= upper
+        assert upper < 100
+
+    def test_incomplete_strategy_is_rejected(self) -> None:
+        class _IncompleteBenchmark(_BenchmarkStrategy):
+            def get_time(self, statistics: TimingStatistics) -> float:
+                return statistics.mean
+
+        with self.assertRaises(TypeError):
+            _IncompleteBenchmark()
+
+    @parameterized.expand(TestCommons.make_args_matrix([8, 64, 216], [0, 1, 2]))
+    def test_successive_halving(self, num_configs: int, seed: int) -> None:
+        fixed_measure = _NoisyConfigs(num_configs, seed)
+        fixed_results = FixedIterationsBenchmark().run(num_configs, fixed_measure)
+        assert len(fixed_results) == num_configs
+
+        halving_measure = _NoisyConfigs(num_configs, seed)
+        halving = SuccessiveHalvingBenchmark()
+        halving_results = halving.run(num_configs, halving_measure)
+
+        # a single config survives and it is one of the fastest
+        survivors = [index for index, statistics in halving_results if not statistics.pruned]
+        assert len(survivors) == 1
+        assert survivors[0] <= 2
+
+        best_index = min(halving_results, key=lambda x: (x[1].pruned, halving.get_time(x[1])))[0]
+        assert best_index == survivors[0]
+
+        # close contenders get more samples than clearly losing configs
+        statistics = dict(halving_results)
+        assert statistics[best_index].num_samples > statistics[num_configs - 1].num_samples
+
+        assert halving_measure.num_iterations < fixed_measure.num_iterations
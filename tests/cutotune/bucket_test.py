@@ -0,0 +1,99 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import torch
+from parameterized import parameterized
+
+from cute_kernels import (
+    CutoTuneConfig,
+    CutoTuneParameter,
+    LogSpacedBucket,
+    MultipleOfBucket,
+    NextPowerOf2Bucket,
+    cutotune,
+)
+from cute_kernels.cutotune.bucket import _Bucket
+
+from ..test_commons import CutoTuneCacheTestCommons, TestCommons
+
+
+def _round_up_to_1024(value: int) -> int:
+    return (value + 1023) // 1024 * 1024
+
+
+class BucketTest(CutoTuneCacheTestCommons):
+    def test_bucket_policies(self) -> None:
+        assert [NextPowerOf2Bucket()(i) for i in [0, 1, 3, 4, 5, 1000]] == [1, 1, 4, 4, 8, 1024]
+        assert [NextPowerOf2Bucket(minimum=16)(i) for i in [1, 16, 17]] == [16, 16, 32]
+        assert [MultipleOfBucket(128)(i) for i in [1, 128, 129, 1000]] == [128, 128, 256, 1024]
+        assert [LogSpacedBucket(growth_factor=1.5)(i) for i in [1, 2, 3, 4, 6, 9, 13]] == [1, 2, 3, 5, 8, 12, 18]
+
+        # buckets are monotonic and never smaller than the value
+        for bucket in [NextPowerOf2Bucket(), MultipleOfBucket(64), LogSpacedBucket(growth_factor=1.25)]:
+            previous = 0
+            for value in range(1, 5000):
+                bucketed_value = bucket(value)
+                assert value <= bucketed_value
+                assert previous <= bucketed_value
+                previous = bucketed_value
+
+        # a bucket without a stable repr would put the memory address of the object in the lookup key
+        class _IncompleteBucket(_Bucket):
+            def __call__(self, value: int) -> int:
+                return value
+
+        with self.assertRaises(TypeError):
+            _IncompleteBucket()
+
+    @parameterized.expand(
+        TestCommons.make_args_matrix(
+            [
+                ("x.size(0)", NextPowerOf2Bucket()),
+                ("x.size(0)", MultipleOfBucket(1024)),
+                ("x.size()", LogSpacedBucket(growth_factor=2)),
+                ("x.size(0)", _round_up_to_1024),
+            ]
+        )
+    )
+    def test_cutotune_reuses_config_within_bucket(self, trigger: tuple) -> None:
+        num_tokens_per_call = []
+
+        @cutotune(
+            configs=[CutoTuneConfig({"BLOCK_SIZE": 1}), CutoTuneConfig({"BLOCK_SIZE": 2})],
+            triggers={"x.dtype", trigger},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+        )
+        def _function(x: torch.Tensor, BLOCK_SIZE: int | CutoTuneParameter) -> None:
+            num_tokens_per_call.append(x.size(0))
+
+        # all of these sizes fall in the same bucket for every policy
+        for num_tokens in [513, 600, 777, 1000, 1024]:
+            _function(torch.empty(num_tokens, 4), BLOCK_SIZE=CutoTuneParameter())
+
+        assert len(_function.function_cache) == 1
+        # 1 benchmark iteration per config for the first size only, then 1 call per size
+        assert num_tokens_per_call == [513, 513, 513, 600, 777, 1000, 1024]
+
+        _function(torch.empty(1025, 4), BLOCK_SIZE=CutoTuneParameter())
+        assert len(_function.function_cache) == 2
+
+        # the bucket policy is a part of the persistent lookup key
+        lookup_key = _function._get_lookup_key(next(iter(_function.function_cache)))
+        assert "@" in lookup_key
+
+    def test_bucketed_scalar_trigger(self) -> None:
+        @cutotune(
+            configs=[CutoTuneConfig({"BLOCK_SIZE": 1}), CutoTuneConfig({"BLOCK_SIZE": 2})],
+            triggers={("n", MultipleOfBucket(8))},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+        )
+        def _function(n: int, BLOCK_SIZE: int | CutoTuneParameter) -> None:
+            return
+
+        for n in range(1, 17):
+            _function(n, BLOCK_SIZE=CutoTuneParameter())
+
+        assert set(_function.function_cache.keys()) == {((int, 8),), ((int, 16),)}
@@ -0,0 +1,134 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import time
+
+import torch
+
+from cute_kernels import (
+    CutoTuneConfig,
+    CutoTuneParameter,
+    SuccessiveHalvingBenchmark,
+    cutotune,
+    flush_cutotune,
+    get_cutotune_telemetry,
+    ignore_cutotune_budgets,
+)
+from cute_kernels.cutotune import cache
+from cute_kernels.cutotune.background import DEFERRED
+
+from ..test_commons import CutoTuneCacheTestCommons
+
+
+class BudgetTest(CutoTuneCacheTestCommons):
+    def setUp(self) -> None:
+        super().setUp()
+
+        get_cutotune_telemetry().clear()
+
+    def tearDown(self) -> None:
+        get_cutotune_telemetry().clear()
+        super().tearDown()
+
+    def test_max_configs(self) -> None:
+        calls = []
+
+        @cutotune(
+            configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [3, 2, 1, 0]],
+            triggers={"x.size(0)"},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+            max_configs=2,
+        )
+        def _function(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+            calls.append(SLEEP_FACTOR)
+            time.sleep(SLEEP_FACTOR * 1e-3)
+
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        assert calls == [3, 2, 2]
+
+        (record,) = get_cutotune_telemetry().get_records(function_hash=_function.function_hash)
+        assert record.provisional
+        assert record.best_config == {"SLEEP_FACTOR": 2}
+        assert cache._CUTOTUNE_CACHE.is_provisional(_function.function_hash, "'x.size(0) = 4'")
+
+        # the provisional config is reused until it is refined without the budget
+        _function.function_cache = {}
+        calls.clear()
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        assert calls == [2]
+
+        _function.function_cache = {}
+        calls.clear()
+        with ignore_cutotune_budgets():
+            _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+
+        assert calls == [3, 2, 1, 0, 0]
+
+        persistent_cache = self.load_cutotune_cache()
+        config = persistent_cache.get_config(_function.function_hash, "'x.size(0) = 4'")
+        assert config.get_key_values() == {"SLEEP_FACTOR": 0}
+        assert not persistent_cache.is_provisional(_function.function_hash, "'x.size(0) = 4'")
+
+    def test_max_iterations_and_time(self) -> None:
+        calls = []
+
+        @cutotune(
+            configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [3, 2, 1, 0]],
+            triggers={"x.size(0)"},
+            warmup_iterations=1,
+            benchmark_iterations=2,
+            max_iterations=5,
+        )
+        def _function(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+            calls.append(SLEEP_FACTOR)
+            time.sleep(SLEEP_FACTOR * 1e-3)
+
+        # the second config only gets the remaining timed iteration
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        assert calls == [3, 3, 3, 2, 2, 2]
+
+        @cutotune(
+            configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [3, 2, 1, 0]],
+            triggers={"x.size(0)"},
+            benchmark_strategy=SuccessiveHalvingBenchmark(),
+            max_tuning_time=0,
+        )
+        def _time_limited_function(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+            calls.append(SLEEP_FACTOR)
+            time.sleep(SLEEP_FACTOR * 1e-3)
+
+        # the first config is always benchmarked
+        calls.clear()
+        _time_limited_function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        assert set(calls) == {3}
+
+        (record,) = get_cutotune_telemetry().get_records(function_hash=_time_limited_function.function_hash)
+        assert record.provisional
+        assert len(record.timed_configs) == 1
+
+    def test_provisional_config_is_refined_asynchronously(self) -> None:
+        @cutotune(
+            configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [3, 2, 1, 0]],
+            triggers={"x.size(0)"},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+            max_configs=1,
+        )
+        def _function(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+            time.sleep(SLEEP_FACTOR * 1e-3)
+
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        assert _function.function_cache[(4,)].get_key_values() == {"SLEEP_FACTOR": 3}
+
+        # a later process with asynchronous tuning serves the provisional config until it is refined
+        _function.async_tuning = DEFERRED
+        _function.function_cache = {}
+
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        assert _function.function_cache[(4,)].get_key_values() == {"SLEEP_FACTOR": 3}
+
+        flush_cutotune()
+        assert _function.function_cache[(4,)].get_key_values() == {"SLEEP_FACTOR": 0}
+        assert not cache._CUTOTUNE_CACHE.is_provisional(_function.function_hash, "'x.size(0) = 4'")
@@ -0,0 +1,233 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+
+from parameterized import parameterized
+
+from cute_kernels import CutoTuneConfig, KernelBackend
+from cute_kernels.cutotune.cache import _CutoTuneCache
+
+from ..test_commons import TestCommons
+
+
+_NAMESPACE = "test"
+
+
+def _add_configs(directory: str, process_id: int, num_configs: int) -> None:
+    cache = _CutoTuneCache(directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0)
+
+    for i in range(num_configs):
+        cache.add_config(
+            function_hash="function", lookup_key=f"{process_id}-{i}", config=CutoTuneConfig({"BLOCK_SIZE": i})
+        )
+
+
+class CutoTuneCacheTest(TestCommons):
+    def test_cache_is_reused(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+            cache.add_config(
+                function_hash="function",
+                lookup_key="x.dtype = torch.float32",
+                config=CutoTuneConfig({"kernel_backend": KernelBackend.triton, "BLOCK_SIZE": 1024}),
+            )
+
+            cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+            config = cache.get_config(function_hash="function", lookup_key="x.dtype = torch.float32")
+
+            assert config.get_key_values() == {"kernel_backend": KernelBackend.triton, "BLOCK_SIZE": 1024}
+            assert cache.get_config(function_hash="function", lookup_key="x.dtype = torch.float16") is None
+
+    def test_cache_is_namespaced(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = _CutoTuneCache(
+                directory=directory, namespace="device-1", load=True, autosave=True, save_interval=0
+            )
+            cache.add_config(function_hash="function", lookup_key="key", config=CutoTuneConfig({"BLOCK_SIZE": 64}))
+
+            cache = _CutoTuneCache(
+                directory=directory, namespace="device-2", load=True, autosave=True, save_interval=0
+            )
+            assert cache.get_config(function_hash="function", lookup_key="key") is None
+
+    @parameterized.expand(TestCommons.make_args_matrix([2, 8], [16]))
+    def test_concurrent_writes_are_merged(self, num_processes: int, num_configs: int) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            processes = [
+                multiprocessing.Process(target=_add_configs, args=(directory, process_id, num_configs))
+                for process_id in range(num_processes)
+            ]
+
+            for process in processes:
+                process.start()
+
+            for process in processes:
+                process.join()
+                assert process.exitcode == 0
+
+            cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+
+            for process_id in range(num_processes):
+                for i in range(num_configs):
+                    config = cache.get_config(function_hash="function", lookup_key=f"{process_id}-{i}")
+                    assert config.get_key_values() == {"BLOCK_SIZE": i}
+
+            # every entry is appended exactly once
+            filenames = [f for f in os.listdir(os.path.join(directory, _NAMESPACE)) if f.endswith(".jsonl")]
+            assert len(filenames) == 1
+            with open(os.path.join(directory, _NAMESPACE, filenames[0]), "r") as f:
+                assert len(f.readlines()) == num_processes * num_configs
+
+    def test_entries_are_appended_and_compacted(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+            other_cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+
+            cache.add_config(function_hash="function-1", lookup_key="key", config=CutoTuneConfig({"BLOCK_SIZE": 64}))
+            cache.add_config(function_hash="function-2", lookup_key="key", config=CutoTuneConfig({"BLOCK_SIZE": 64}))
+            # same entry from another process is not written again
+            other_cache.add_config(
+                function_hash="function-1", lookup_key="key", config=CutoTuneConfig({"BLOCK_SIZE": 64})
+            )
+            other_cache.add_config(
+                function_hash="function-1", lookup_key="key", config=CutoTuneConfig({"BLOCK_SIZE": 128})
+            )
+
+            # in-memory entries are kept, a fresh cache sees the latest line in the file
+            assert cache.get_config(function_hash="function-1", lookup_key="key").get_key_values() == {
+                "BLOCK_SIZE": 64
+            }
+            cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+            assert cache.get_config(function_hash="function-1", lookup_key="key").get_key_values() == {
+                "BLOCK_SIZE": 128
+            }
+            # only the file of the accessed function is read
+            assert list(cache.cache.keys()) == ["function-1"]
+
+            filename = cache._get_filename("function-1")
+            with open(filename, "r") as f:
+                assert len(f.readlines()) == 2
+
+            cache.compact()
+
+            with open(filename, "r") as f:
+                assert len(f.readlines()) == 1
+
+            assert cache.get_config(function_hash="function-1", lookup_key="key").get_key_values() == {
+                "BLOCK_SIZE": 128
+            }
+
+    def test_autosave_is_batched(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=60
+            )
+            cache.add_config(function_hash="function", lookup_key="key-1", config=CutoTuneConfig({"BLOCK_SIZE": 64}))
+
+            # the entry is only appended once the save interval has passed or the interpreter exits
+            assert not os.path.exists(cache._get_filename("function"))
+
+            cache.last_save_time -= 60
+            cache.add_config(function_hash="function", lookup_key="key-2", config=CutoTuneConfig({"BLOCK_SIZE": 64}))
+
+            cache = _CutoTuneCache(directory=directory, namespace=_NAMESPACE, load=True, autosave=False)
+            assert cache.get_config(function_hash="function", lookup_key="key-1") is not None
+            assert cache.get_config(function_hash="function", lookup_key="key-2") is not None
+
+    def test_unsaved_entries_are_saved_at_exit(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            code = (
+                "from cute_kernels import CutoTuneConfig\n"
+                "from cute_kernels.cutotune.cache import _CutoTuneCache\n"
+                f"cache = _CutoTuneCache(directory={directory!r}, namespace={_NAMESPACE!r}, autosave=True)\n"
+                "cache.add_config(function_hash='function', lookup_key='key', config=CutoTuneConfig({'BLOCK_SIZE': 64}))\n"
+            )
+            subprocess.run([sys.executable, "-c", code], check=True)
+
+            cache = _CutoTuneCache(directory=directory, namespace=_NAMESPACE, load=True, autosave=False)
+            assert cache.get_config(function_hash="function", lookup_key="key").get_key_values() == {"BLOCK_SIZE": 64}
+
+    def test_corrupt_lines_are_skipped(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+            cache.add_config(function_hash="function", lookup_key="key-1", config=CutoTuneConfig({"BLOCK_SIZE": 64}))
+
+            # a torn line left behind by a crash in the middle of an append
+            filename = cache._get_filename("function")
+            with open(filename, "a") as f:
+                f.write('{"lookup_key": "key-2", "con\n')
+
+            # the torn line is read before appending
+            with self.assertWarns(UserWarning):
+                cache.add_config(
+                    function_hash="function", lookup_key="key-3", config=CutoTuneConfig({"BLOCK_SIZE": 64})
+                )
+
+            cache = _CutoTuneCache(directory=directory, namespace=_NAMESPACE, load=True, autosave=False)
+            with self.assertWarns(UserWarning):
+                assert cache.get_config(function_hash="function", lookup_key="key-1") is not None
+
+            assert cache.get_config(function_hash="function", lookup_key="key-2") is None
+            assert cache.get_config(function_hash="function", lookup_key="key-3") is not None
+
+            # compaction drops the corrupt line
+            with self.assertWarns(UserWarning):
+                cache.compact()
+
+            with open(filename, "r") as f:
+                assert len(f.readlines()) == 2
+
+    def test_rewritten_files_are_read_again(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+            other_cache = _CutoTuneCache(
+                directory=directory, namespace=_NAMESPACE, load=True, autosave=True, save_interval=0
+            )
+
+            for i in range(4):
+                cache.add_config(
+                    function_hash="function", lookup_key="key", config=CutoTuneConfig({"BLOCK_SIZE": 2**i})
+                )
+
+            assert other_cache.get_config(function_hash="function", lookup_key="key").get_key_values() == {
+                "BLOCK_SIZE": 8
+            }
+
+            # the compacted file is shorter than what the other cache already read, the new entries push it past the
+            # old offset
+            cache.compact()
+            for i in range(8):
+                cache.add_config(
+                    function_hash="function", lookup_key=f"new-key-{i}", config=CutoTuneConfig({"BLOCK_SIZE": i})
+                )
+
+            for i in range(8):
+                config = other_cache.get_config(function_hash="function", lookup_key=f"new-key-{i}")
+                assert config.get_key_values() == {"BLOCK_SIZE": i}
+
+            # entries that were pruned by another process are dropped once the file is read again
+            cache.prune("function", fingerprint="new")
+            other_cache.get_timed_configs("function")
+            assert list(other_cache.cache["function"]) == []
@@ -0,0 +1,139 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import os
+import tempfile
+
+import torch
+import torch.distributed
+import torch.multiprocessing as mp
+from parameterized import parameterized
+
+from cute_kernels import CutoTuneParameter, get_cartesian_product_cutotune_configs
+from cute_kernels.cutotune import cache
+from cute_kernels.cutotune.cache import _CutoTuneCache
+from cute_kernels.cutotune.tuner import _CutoTune
+
+from ..test_commons import TestCommons
+
+
+_NAMESPACE = "test"
+
+
+def _function(x: torch.Tensor, BLOCK_SIZE_M: int, BLOCK_SIZE_N: int) -> torch.Tensor:
+    return x
+
+
+class _RecordingCutoTune(_CutoTune):
+    # timings are deterministic so that the expected winner is known, the benchmarked configs are recorded
+    def _run_benchmark(
+        self, warmup_iterations: int, benchmark_iterations: int, per_iteration: bool, **kwargs
+    ) -> list[float]:
+        self.benchmarked_configs.append((kwargs["BLOCK_SIZE_M"], kwargs["BLOCK_SIZE_N"]))
+        return [abs(kwargs["BLOCK_SIZE_M"] - 64) + abs(kwargs["BLOCK_SIZE_N"] - 32) + 1]
+
+
+def _get_cache_directory(directory: str, rank: int, node_local: bool) -> str:
+    return os.path.join(directory, f"rank-{rank}") if node_local else directory
+
+
+def _run_worker(
+    rank: int, world_size: int, directory: str, node_local: bool, blacklisted: bool, queue: mp.Queue
+) -> None:
+    torch.distributed.init_process_group(
+        "gloo", init_method=f"file://{os.path.join(directory, 'store')}", rank=rank, world_size=world_size
+    )
+
+    cache._CUTOTUNE_CACHE = _CutoTuneCache(
+        directory=_get_cache_directory(directory, rank, node_local),
+        namespace=_NAMESPACE,
+        load=True,
+        autosave=True,
+        save_interval=0,
+    )
+
+    function = _RecordingCutoTune(
+        function=_function,
+        configs=get_cartesian_product_cutotune_configs(
+            BLOCK_SIZE_M=[16, 32, 64, 128], BLOCK_SIZE_N=[16, 32, 64, 128], condition=lambda **kwargs: True
+        ),
+        triggers={"x.size(0)"},
+        warmup_iterations=0,
+        benchmark_iterations=1,
+        distributed=True,
+    )
+    function.benchmarked_configs = []
+
+    x = torch.randn(4, 4)
+
+    # with node-local caches only the first rank has a tuned config, the other ranks must not be left waiting for it.
+    # A stale entry is tuned again but its blacklist is only known to the first rank.
+    if node_local and rank == 0:
+        cache._CUTOTUNE_CACHE.add_config(
+            function_hash=function.function_hash,
+            lookup_key=function._get_lookup_key(function._get_dispatch_key((x,), {})),
+            config=function.configs[0],
+            fingerprint="old" if blacklisted else function.fingerprint,
+            failed_configs=[(function.configs[1], "OutOfResources: out of resource")] if blacklisted else None,
+        )
+    function(x, BLOCK_SIZE_M=CutoTuneParameter(), BLOCK_SIZE_N=CutoTuneParameter())
+
+    ((dispatch_key, best_config),) = function.function_cache.items()
+    queue.put(
+        (
+            rank,
+            function.benchmarked_configs,
+            function.function_hash,
+            function._get_lookup_key(dispatch_key),
+            best_config.get_key_values(),
+        )
+    )
+
+    torch.distributed.destroy_process_group()
+
+
+class DistributedCutoTuneTest(TestCommons):
+    @parameterized.expand(
+        [(1, False, False), (2, False, False), (3, False, False), (2, True, False), (3, True, False), (2, True, True)]
+    )
+    def test_distributed_cutotune(self, world_size: int, node_local: bool, blacklisted: bool) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            context = mp.get_context("spawn")
+            queue = context.Queue()
+
+            processes = [
+                context.Process(
+                    target=_run_worker,
+                    args=(rank, world_size, directory, node_local, blacklisted, queue),
+                )
+                for rank in range(world_size)
+            ]
+
+            for process in processes:
+                process.start()
+
+            results = [queue.get(timeout=300) for _ in range(world_size)]
+
+            for process in processes:
+                process.join()
+                assert process.exitcode == 0
+
+            # every config is benchmarked exactly once across all the ranks
+            benchmarked_configs = [config for _, rank_configs, _, _, _ in results for config in rank_configs]
+            assert len(benchmarked_configs) == 16
+            assert len(set(benchmarked_configs)) == 16
+
+            # all ranks agree on the winner and it is persisted
+            expected_config = {"BLOCK_SIZE_M": 64, "BLOCK_SIZE_N": 32}
+
+            for rank, _, function_hash, lookup_key, best_config in results:
+                persistent_cache = _CutoTuneCache(
+                    directory=_get_cache_directory(directory, rank, node_local),
+                    namespace=_NAMESPACE,
+                    load=True,
+                    autosave=False,
+                )
+
+                assert best_config == expected_config
+                assert persistent_cache.get_config(function_hash, lookup_key).get_key_values() == expected_config
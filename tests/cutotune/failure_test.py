@@ -0,0 +1,136 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import time
+
+import torch
+from parameterized import parameterized
+from triton.runtime.errors import OutOfResources
+
+from cute_kernels import (
+    CutoTuneConfig,
+    CutoTuneParameter,
+    FixedIterationsBenchmark,
+    SuccessiveHalvingBenchmark,
+    cutotune,
+    get_cutotune_telemetry,
+)
+from cute_kernels.cutotune import cache
+
+from ..test_commons import CutoTuneCacheTestCommons
+
+
+_OUT_OF_RESOURCES_ERROR = (
+    "OutOfResources: out of resource: shared memory, Required: 262144, Hardware limit: 232448. "
+    "Reducing block sizes or `num_stages` may help."
+)
+
+
+class FailureTest(CutoTuneCacheTestCommons):
+    def setUp(self) -> None:
+        super().setUp()
+
+        get_cutotune_telemetry().clear()
+
+    def tearDown(self) -> None:
+        get_cutotune_telemetry().clear()
+        super().tearDown()
+
+    @parameterized.expand(
+        [(FixedIterationsBenchmark(warmup_iterations=0, benchmark_iterations=2),), (SuccessiveHalvingBenchmark(),)]
+    )
+    def test_failed_configs_are_blacklisted(
+        self, benchmark_strategy: FixedIterationsBenchmark | SuccessiveHalvingBenchmark
+    ) -> None:
+        calls = []
+
+        @cutotune(
+            configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [3, 0, 1, 2]],
+            triggers={"x.size(0)"},
+            benchmark_strategy=benchmark_strategy,
+        )
+        def _function(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+            calls.append(SLEEP_FACTOR)
+
+            # the fastest config runs out of resources
+            if SLEEP_FACTOR == 0:
+                raise OutOfResources(required=262144, limit=232448, name="shared memory")
+
+            time.sleep(SLEEP_FACTOR * 1e-3)
+
+        # pretend the entry was tuned with an older version of the function so that it gets retuned below
+        _function._fingerprint = "old"
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+
+        assert calls.count(0) == 1
+        assert calls[-1] == 1
+
+        (record,) = get_cutotune_telemetry().get_records(function_hash=_function.function_hash)
+        assert record.best_config == {"SLEEP_FACTOR": 1}
+        assert record.failed_configs == [({"SLEEP_FACTOR": 0}, _OUT_OF_RESOURCES_ERROR)]
+        assert {"SLEEP_FACTOR": 0} not in [key_values for key_values, _, _ in record.timed_configs]
+        assert record.to_dict()["failed_configs"] == [
+            {"config": {"SLEEP_FACTOR": 0}, "error": _OUT_OF_RESOURCES_ERROR}
+        ]
+
+        # the blacklist survives a restart and the failed config is never retried
+        cache._CUTOTUNE_CACHE = self.load_cutotune_cache(autosave=True)
+        _function._fingerprint = None
+        _function.function_cache = {}
+        calls.clear()
+
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        assert 0 not in calls
+        assert calls[-1] == 1
+
+        _, record = get_cutotune_telemetry().get_records(function_hash=_function.function_hash)
+        assert record.failed_configs == [({"SLEEP_FACTOR": 0}, _OUT_OF_RESOURCES_ERROR)]
+
+        # other lookup keys try the config again
+        calls.clear()
+        _function(torch.empty(8), SLEEP_FACTOR=CutoTuneParameter())
+        assert calls.count(0) == 1
+
+    def test_all_configs_fail(self) -> None:
+        @cutotune(
+            configs=[CutoTuneConfig({"BLOCK_SIZE": block_size}) for block_size in [64, 128]],
+            triggers={"x.size(0)"},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+        )
+        def _function(x: torch.Tensor, BLOCK_SIZE: int | CutoTuneParameter) -> None:
+            raise torch.OutOfMemoryError(f"out of memory at BLOCK_SIZE = {BLOCK_SIZE}")
+
+        with self.assertRaisesRegex(AssertionError, "out of memory at BLOCK_SIZE = 128"):
+            _function(torch.empty(4), BLOCK_SIZE=CutoTuneParameter())
+
+    def test_unexpected_errors_are_raised(self) -> None:
+        calls = []
+        errors = [RuntimeError("CUDA error: an illegal memory access was encountered")]
+
+        @cutotune(
+            configs=[CutoTuneConfig({"BLOCK_SIZE": block_size}) for block_size in [64, 128]],
+            triggers={"x.size(0)"},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+        )
+        def _function(x: torch.Tensor, BLOCK_SIZE: int | CutoTuneParameter) -> None:
+            calls.append(BLOCK_SIZE)
+
+            # a bug is not a property of the config, it is raised instead of blacklisting the config
+            if BLOCK_SIZE == 64 and len(errors) > 0:
+                raise errors.pop()
+
+        with self.assertRaisesRegex(RuntimeError, "illegal memory access"):
+            _function(torch.empty(4), BLOCK_SIZE=CutoTuneParameter())
+
+        assert calls == [64]
+        assert _function.function_cache == {}
+        assert cache._CUTOTUNE_CACHE.get_config(_function.function_hash, "'x.size(0) = 4'") is None
+        assert cache._CUTOTUNE_CACHE.get_failed_configs(_function.function_hash, "'x.size(0) = 4'") == []
+
+        # nothing was recorded so every config is tried again
+        calls.clear()
+        _function(torch.empty(4), BLOCK_SIZE=CutoTuneParameter())
+        assert set(calls) == {64, 128}
@@ -0,0 +1,131 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import time
+
+import torch
+import triton
+import triton.language as tl
+
+from cute_kernels import CutoTuneConfig, CutoTuneParameter, cutotune, prune_stale_cutotune_cache_entries
+from cute_kernels.cutotune.fingerprint import get_cutotune_fingerprint
+
+from ..test_commons import CutoTuneCacheTestCommons
+
+
+def _sleep_1(x: torch.Tensor, SLEEP_FACTOR: int) -> None:
+    time.sleep(SLEEP_FACTOR * 1e-3)
+
+
+def _sleep_2(x: torch.Tensor, SLEEP_FACTOR: int) -> None:
+    time.sleep(SLEEP_FACTOR * 2e-3)
+
+
+@triton.autotune(configs=[triton.Config({"BLOCK_SIZE": 1024})], key=["N"])
+@triton.heuristics({"EVEN": lambda args: args["N"] % args["BLOCK_SIZE"] == 0})
+@triton.jit
+def _add_one_kernel(x_ptr, N, BLOCK_SIZE: tl.constexpr, EVEN: tl.constexpr):
+    indices = tl.program_id(0) * BLOCK_SIZE + tl.arange(0, BLOCK_SIZE)
+    tl.store(x_ptr + indices, tl.load(x_ptr + indices, mask=indices < N) + 1, mask=indices < N)
+
+
+@triton.autotune(configs=[triton.Config({"BLOCK_SIZE": 1024})], key=["N"])
+@triton.heuristics({"EVEN": lambda args: args["N"] % args["BLOCK_SIZE"] == 0})
+@triton.jit
+def _add_two_kernel(x_ptr, N, BLOCK_SIZE: tl.constexpr, EVEN: tl.constexpr):
+    indices = tl.program_id(0) * BLOCK_SIZE + tl.arange(0, BLOCK_SIZE)
+    tl.store(x_ptr + indices, tl.load(x_ptr + indices, mask=indices < N) + 2, mask=indices < N)
+
+
+def _launch_kernel(x: torch.Tensor, SLEEP_FACTOR: int) -> None:
+    _add_one_kernel[(triton.cdiv(x.numel(), 1024),)](x, x.numel())
+
+
+def _calls_sleep_1(x: torch.Tensor, SLEEP_FACTOR: int) -> None:
+    _sleep_1(x, SLEEP_FACTOR)
+
+
+class FingerprintTest(CutoTuneCacheTestCommons):
+    def test_fingerprint(self) -> None:
+        configs = [CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [1, 2]]
+        fingerprint = get_cutotune_fingerprint(_sleep_1, configs)
+
+        assert get_cutotune_fingerprint(_sleep_1, configs) == fingerprint
+        assert get_cutotune_fingerprint(_sleep_2, configs) != fingerprint
+
+        # the config space is part of the fingerprint
+        assert get_cutotune_fingerprint(_sleep_1, configs[:1]) != fingerprint
+        assert (
+            get_cutotune_fingerprint(
+                _sleep_1,
+                [
+                    CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}, condition=lambda **kwargs: True)
+                    for sleep_factor in [1, 2]
+                ],
+            )
+            != fingerprint
+        )
+
+        # functions that are called are part of the fingerprint
+        assert get_cutotune_fingerprint(_calls_sleep_1, configs) != get_cutotune_fingerprint(
+            _calls_sleep_1, configs[:1]
+        )
+
+    def test_fingerprint_of_autotuned_triton_kernel(self) -> None:
+        global _add_one_kernel
+
+        configs = [CutoTuneConfig({"SLEEP_FACTOR": 1})]
+        fingerprint = get_cutotune_fingerprint(_launch_kernel, configs)
+
+        # the python function is behind @triton.autotune, @triton.heuristics and @triton.jit
+        add_one_kernel = _add_one_kernel
+        _add_one_kernel = _add_two_kernel
+
+        try:
+            assert get_cutotune_fingerprint(_launch_kernel, configs) != fingerprint
+        finally:
+            _add_one_kernel = add_one_kernel
+
+        assert get_cutotune_fingerprint(_launch_kernel, configs) == fingerprint
+
+    def test_stale_entries_are_retuned_and_pruned(self) -> None:
+        num_calls = []
+
+        @cutotune(
+            configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [2, 1]],
+            triggers={"x.size(0)"},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+        )
+        def _function(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+            num_calls.append(SLEEP_FACTOR)
+            time.sleep(SLEEP_FACTOR * 1e-3)
+
+        # pretend the entries were tuned with an older version of the function
+        _function._fingerprint = "old"
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        _function(torch.empty(8), SLEEP_FACTOR=CutoTuneParameter())
+        assert len(num_calls) == 6
+
+        _function._fingerprint = None
+        _function.function_cache = {}
+
+        stale_lookup_keys = ["'x.size(0) = 4'", "'x.size(0) = 8'"]
+
+        result = prune_stale_cutotune_cache_entries(dry_run=True)
+        assert result[_function.function_hash] == stale_lookup_keys
+
+        # the stale entry is benchmarked again instead of being reused
+        num_calls.clear()
+        _function(torch.empty(4), SLEEP_FACTOR=CutoTuneParameter())
+        assert len(num_calls) == 3
+
+        result = prune_stale_cutotune_cache_entries()
+        assert result[_function.function_hash] == ["'x.size(0) = 8'"]
+        assert _function.function_hash not in prune_stale_cutotune_cache_entries(dry_run=True)
+
+        # only the fresh entry survives a restart
+        persistent_cache = self.load_cutotune_cache()
+        assert persistent_cache.get_stale_lookup_keys(_function.function_hash, _function.fingerprint) == []
+        assert len(persistent_cache.get_timed_configs(_function.function_hash)) == 1
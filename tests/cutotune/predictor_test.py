@@ -0,0 +1,132 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import math
+import time
+
+import torch
+
+from cute_kernels import (
+    CutoTuneConfig,
+    CutoTuneParameter,
+    NearestNeighbourPredictor,
+    cutotune,
+    ignore_cutotune_budgets,
+)
+from cute_kernels.cutotune import cache
+from cute_kernels.cutotune.predictor import get_lookup_key_features
+
+from ..test_commons import CutoTuneCacheTestCommons
+
+
+def _get_synthetic_timed_configs() -> dict[str, list[tuple[dict, float]]]:
+    # the best BLOCK_SIZE grows with the number of tokens
+    timed_configs = {}
+    for num_tokens in [2**i for i in range(6, 16)]:
+        lookup_key = f"'x.dtype = torch.bfloat16', 'x.size(0) = {num_tokens}'"
+        timed_configs[lookup_key] = [
+            ({"BLOCK_SIZE": block_size}, 1 + abs(block_size - num_tokens // 16) / num_tokens)
+            for block_size in [4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048]
+        ]
+
+    return timed_configs
+
+
+class PredictorTest(CutoTuneCacheTestCommons):
+    def test_lookup_key_features(self) -> None:
+        signature, features = get_lookup_key_features(
+            "'x = (torch.bfloat16, torch.Size([4096, 1024]), (1024, 1))', 'y = -3', 'eps = 1e-05'"
+        )
+
+        assert features == (4096, 1024, 1024, 1, -3)
+        assert signature == "'x = (torch.bfloat16, torch.Size([#, #]), (#, #))', 'y = #', 'eps = 1e-05'"
+
+    def test_predict_and_evaluate(self) -> None:
+        timed_configs = _get_synthetic_timed_configs()
+        predictor = NearestNeighbourPredictor(num_candidates=3, num_neighbours=2)
+
+        # the neighbours are 2048 and 8192, the best BLOCK_SIZE lies between their best configs
+        candidates = predictor.predict("'x.dtype = torch.bfloat16', 'x.size(0) = 4096'", timed_configs)
+        assert {"BLOCK_SIZE": 256} in candidates
+        assert len(candidates) == 3
+
+        # different dtypes are never neighbours
+        assert predictor.predict("'x.dtype = torch.float32', 'x.size(0) = 4096'", timed_configs) is None
+
+        metrics = predictor.evaluate(timed_configs)
+        assert metrics["num_lookup_keys"] == 10
+        assert metrics["coverage"] == 1
+        # only the smallest shape misses the best config, it is outside the range of its neighbours
+        assert metrics["top_k_recall"] == 0.9
+        assert metrics["mean_slowdown"] < 1.01
+
+    def test_zero_time_neighbour(self) -> None:
+        # timers with a coarse resolution can measure 0 for the fastest config
+        timed_configs = {
+            "'x.size(0) = 1024'": [({"BLOCK_SIZE": 64}, 0.5), ({"BLOCK_SIZE": 128}, 0), ({"BLOCK_SIZE": 256}, 1)],
+            "'x.size(0) = 2048'": [({"BLOCK_SIZE": 64}, 2), ({"BLOCK_SIZE": 128}, 1), ({"BLOCK_SIZE": 256}, 3)],
+        }
+        predictor = NearestNeighbourPredictor(num_candidates=1, num_neighbours=1)
+
+        assert predictor.predict("'x.size(0) = 1024'", timed_configs) == [{"BLOCK_SIZE": 128}]
+
+        # the fastest config is predicted for both lookup keys
+        metrics = predictor.evaluate(timed_configs)
+        assert metrics["top_1_accuracy"] == 1
+        assert metrics["mean_slowdown"] == 1
+
+        # a candidate that is slower than a time of 0 is infinitely slower
+        timed_configs["'x.size(0) = 2048'"] = [({"BLOCK_SIZE": 64}, 1), ({"BLOCK_SIZE": 128}, 2)]
+        assert predictor.evaluate(timed_configs)["max_slowdown"] == math.inf
+
+    def test_cutotune_with_predictor(self) -> None:
+        num_benchmarked_calls = []
+
+        @cutotune(
+            configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [3, 0, 2, 1]],
+            triggers={"x.size(0)"},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+            predictor=NearestNeighbourPredictor(num_candidates=1),
+        )
+        def _function(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+            num_benchmarked_calls.append(SLEEP_FACTOR)
+            time.sleep(SLEEP_FACTOR * 1e-3)
+
+        # the first shape is benchmarked
+        _function(torch.empty(1024), SLEEP_FACTOR=CutoTuneParameter())
+        assert num_benchmarked_calls == [3, 0, 2, 1, 0]
+
+        timed_configs = cache._CUTOTUNE_CACHE.get_timed_configs(_function.function_hash)
+        ((lookup_key, key_values_and_times),) = timed_configs.items()
+        assert [key_values for key_values, _ in key_values_and_times] == [
+            {"SLEEP_FACTOR": sleep_factor} for sleep_factor in [3, 0, 2, 1]
+        ]
+
+        # close shapes use the prediction without benchmarking
+        num_benchmarked_calls.clear()
+        _function(torch.empty(2048), SLEEP_FACTOR=CutoTuneParameter())
+        assert num_benchmarked_calls == [0]
+
+        # the untimed guess is provisional, it is benchmarked once budgets are ignored (for example by a sweep)
+        predicted_lookup_key = "'x.size(0) = 2048'"
+        assert cache._CUTOTUNE_CACHE.is_provisional(_function.function_hash, predicted_lookup_key)
+
+        num_benchmarked_calls.clear()
+        _function.function_cache = {}
+        with ignore_cutotune_budgets():
+            _function(torch.empty(2048), SLEEP_FACTOR=CutoTuneParameter())
+
+        assert len(num_benchmarked_calls) == 5
+        assert not cache._CUTOTUNE_CACHE.is_provisional(_function.function_hash, predicted_lookup_key)
+        timed_configs = cache._CUTOTUNE_CACHE.get_timed_configs(_function.function_hash)
+
+        # timings survive a restart
+        persistent_cache = self.load_cutotune_cache()
+        assert persistent_cache.get_timed_configs(_function.function_hash) == timed_configs
+
+        # far away shapes are benchmarked again
+        num_benchmarked_calls.clear()
+        _function(torch.empty(2**20), SLEEP_FACTOR=CutoTuneParameter())
+        assert len(num_benchmarked_calls) == 5
@@ -0,0 +1,136 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import os
+import subprocess
+import sys
+
+import torch
+import yaml
+
+from cute_kernels import CutoTuneConfig, CutoTuneParameter, cutotune
+from cute_kernels.cutotune.sweep import _import_object, run_sweep
+
+from ..test_commons import CutoTuneCacheTestCommons
+
+
+_FAILING_NUM_TOKENS = None
+_CALLS = []
+
+
+@cutotune(
+    configs=[CutoTuneConfig({"BLOCK_SIZE": 1}), CutoTuneConfig({"BLOCK_SIZE": 2})],
+    triggers={"x.dtype", "x.size(0)"},
+    warmup_iterations=0,
+    benchmark_iterations=1,
+)
+def _scale(x: torch.Tensor, alpha: float, BLOCK_SIZE: int | CutoTuneParameter) -> torch.Tensor:
+    # simulates a job that is killed in the middle of the sweep
+    if x.size(0) == _FAILING_NUM_TOKENS:
+        raise KeyboardInterrupt()
+
+    _CALLS.append((x.size(0), x.dtype))
+    return x * alpha
+
+
+_MANIFEST = {
+    "device": "cpu",
+    "sweeps": [
+        {
+            "name": "scale",
+            "function": "tests.cutotune.sweep_test._scale",
+            "grid": {"num_tokens": [4, 8, 16], "dtype": ["float32", "bfloat16"]},
+            "arguments": {"x": {"shape": ["num_tokens", "2 * num_tokens"], "dtype": "dtype"}, "alpha": 2.0},
+        }
+    ],
+}
+
+
+class SweepTest(CutoTuneCacheTestCommons):
+    def setUp(self) -> None:
+        super().setUp()
+
+        global _FAILING_NUM_TOKENS
+        _FAILING_NUM_TOKENS = None
+        _CALLS.clear()
+        _scale.function_cache = {}
+
+    def test_sweep_resumes_after_interruption(self) -> None:
+        global _FAILING_NUM_TOKENS
+        progress_filename = os.path.join(self.directory.name, "sweep.progress")
+
+        _FAILING_NUM_TOKENS = 16
+        with self.assertRaises(KeyboardInterrupt):
+            run_sweep(_MANIFEST, progress_filename=progress_filename)
+
+        # 4 points finished before the interruption
+        assert {num_tokens for num_tokens, _ in _CALLS} == {4, 8}
+
+        _FAILING_NUM_TOKENS = None
+        _CALLS.clear()
+        _scale.function_cache = {}
+
+        assert run_sweep(_MANIFEST, progress_filename=progress_filename) == 2
+        assert {num_tokens for num_tokens, _ in _CALLS} == {16}
+
+        # everything is done now
+        assert run_sweep(_MANIFEST, progress_filename=progress_filename) == 0
+
+        # all the points are in the persistent cache
+        persistent_cache = self.load_cutotune_cache()
+        for num_tokens in [4, 8, 16]:
+            for dtype in [torch.float32, torch.bfloat16]:
+                dispatch_key = _scale._get_dispatch_key((torch.empty(num_tokens, 1, dtype=dtype),), {})
+                lookup_key = _scale._get_lookup_key(dispatch_key)
+                assert persistent_cache.get_config(_scale.function_hash, lookup_key) is not None
+
+    def test_sweep_cli(self) -> None:
+        manifest_filename = os.path.join(self.directory.name, "manifest.yml")
+        with open(manifest_filename, "w") as f:
+            yaml.dump(_MANIFEST, f)
+
+        command = [
+            sys.executable,
+            "-m",
+            "cute_kernels.cutotune.sweep",
+            manifest_filename,
+            "--cache-dir",
+            self.directory.name,
+            "--namespace",
+            self.namespace,
+        ]
+
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        assert "tuned 6 points" in output
+
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        assert "tuned 0 points" in output
+
+        output = subprocess.run(command + ["--restart"], check=True, capture_output=True, text=True).stdout
+        assert "tuned 6 points" in output
+
+    def test_import_errors_are_not_hidden(self) -> None:
+        assert _import_object("tests.cutotune.sweep_test._scale") is _scale
+        assert _import_object("tests.cutotune.sweep_test") is sys.modules[__name__]
+
+        # the module exists but one of its dependencies doesn't
+        package_directory = os.path.join(self.directory.name, "_sweep_test_package")
+        os.makedirs(package_directory)
+
+        with open(os.path.join(package_directory, "__init__.py"), "w") as f:
+            f.write("")
+
+        with open(os.path.join(package_directory, "kernels.py"), "w") as f:
+            f.write("import _missing_sweep_test_dependency\n")
+
+        sys.path.insert(0, self.directory.name)
+
+        try:
+            with self.assertRaises(ModuleNotFoundError) as context:
+                _import_object("_sweep_test_package.kernels.function")
+
+            assert context.exception.name == "_missing_sweep_test_dependency"
+        finally:
+            sys.path.remove(self.directory.name)
+            sys.modules.pop("_sweep_test_package", None)
@@ -0,0 +1,87 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import csv
+import json
+import os
+import time
+
+import torch
+
+from cute_kernels import CutoTuneConfig, CutoTuneParameter, cutotune, get_cutotune_telemetry
+
+from ..test_commons import CutoTuneCacheTestCommons
+
+
+@cutotune(
+    configs=[
+        CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}, condition=lambda **kwargs: kwargs["SLEEP_FACTOR"] < 4)
+        for sleep_factor in [5, 4, 3, 1, 2]
+    ],
+    triggers={"x.dtype"},
+    warmup_iterations=0,
+    benchmark_iterations=2,
+)
+def _sleep(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+    time.sleep(SLEEP_FACTOR * 1e-3)
+
+
+class TelemetryTest(CutoTuneCacheTestCommons):
+    def setUp(self) -> None:
+        super().setUp()
+
+        get_cutotune_telemetry().clear()
+        _sleep.function_cache = {}
+
+    def tearDown(self) -> None:
+        get_cutotune_telemetry().clear()
+        super().tearDown()
+
+    def test_telemetry(self) -> None:
+        _sleep(torch.randn(4), SLEEP_FACTOR=CutoTuneParameter())
+        # cached calls are not recorded
+        _sleep(torch.randn(4), SLEEP_FACTOR=CutoTuneParameter())
+
+        telemetry = get_cutotune_telemetry()
+        (record,) = telemetry.get_records(function_hash=_sleep.function_hash)
+
+        assert record.function_name == "_sleep"
+        assert record.best_config == {"SLEEP_FACTOR": 1}
+        assert record.num_configs == 5
+        assert record.num_pruned_by_condition == 2
+        assert [key_values["SLEEP_FACTOR"] for key_values, _, _ in record.timed_configs] == [3, 1, 2]
+        assert [key_values["SLEEP_FACTOR"] for key_values, _, _ in record.benchmark_spans] == [3, 1, 2]
+        assert record.wall_time >= sum(duration for _, _, duration in record.benchmark_spans)
+        assert not record.predicted
+
+        json_filename = os.path.join(self.directory.name, "report.json")
+        telemetry.to_json(json_filename)
+        with open(json_filename) as f:
+            (report,) = json.load(f)
+
+        assert report["lookup_key"] == record.lookup_key
+        assert report["num_pruned_by_condition"] == 2
+        assert [timed_config["relative_time"] >= 1 for timed_config in report["timed_configs"]] == [True] * 3
+
+        csv_filename = os.path.join(self.directory.name, "report.csv")
+        telemetry.to_csv(csv_filename)
+        with open(csv_filename) as f:
+            rows = list(csv.DictReader(f))
+
+        assert len(rows) == 3
+        assert [row["is_best"] for row in rows] == ["False", "True", "False"]
+
+        trace_filename = os.path.join(self.directory.name, "trace.json")
+        telemetry.to_chrome_trace(trace_filename)
+        with open(trace_filename) as f:
+            events = json.load(f)["traceEvents"]
+
+        assert [event["cat"] for event in events] == ["cutotune"] + ["cutotune_benchmark"] * 3
+        assert all(event["ph"] == "X" and event["dur"] > 0 for event in events)
+
+        # benchmark spans are nested inside the tuning span
+        tuning_event = events[0]
+        for event in events[1:]:
+            assert tuning_event["ts"] <= event["ts"]
+            assert event["ts"] + event["dur"] <= tuning_event["ts"] + tuning_event["dur"] + 1e3
@@ -0,0 +1,115 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import time
+
+import torch
+
+from cute_kernels import CutoTuneConfig, CutoTuneParameter, KernelBackend, SuccessiveHalvingBenchmark, cutotune
+from cute_kernels.cutotune import cache
+from cute_kernels.cutotune.timer import CPUTimer, _Timer, get_timer
+
+from ..test_commons import CutoTuneCacheTestCommons
+
+
+_SLEEP_TIME = 2e-3
+
+
+@cutotune(
+    configs=[
+        CutoTuneConfig({"kernel_backend": KernelBackend.cuda}),
+        CutoTuneConfig({"kernel_backend": KernelBackend.triton}),
+    ],
+    triggers={"x.dtype"},
+    warmup_iterations=1,
+    benchmark_iterations=3,
+)
+def _add_one(x: torch.Tensor, output: torch.Tensor, kernel_backend: KernelBackend | CutoTuneParameter) -> None:
+    # cuda is made artificially slower so that the winner is known
+    if kernel_backend == KernelBackend.cuda:
+        time.sleep(_SLEEP_TIME)
+
+    torch.add(x, 1, out=output)
+
+
+@cutotune(
+    configs=[CutoTuneConfig({"SLEEP_FACTOR": sleep_factor}) for sleep_factor in [4, 3, 1, 2]],
+    triggers={"x.dtype"},
+    benchmark_strategy=SuccessiveHalvingBenchmark(),
+)
+def _sleep(x: torch.Tensor, SLEEP_FACTOR: int | CutoTuneParameter) -> None:
+    time.sleep(SLEEP_FACTOR * _SLEEP_TIME)
+
+
+class CutoTuneTest(CutoTuneCacheTestCommons):
+    def test_cpu_timer(self) -> None:
+        timer = get_timer(torch.device("cpu"))
+        assert isinstance(timer, CPUTimer)
+
+        timer.start()
+        time.sleep(_SLEEP_TIME)
+        timer.stop()
+
+        assert timer.get_elapsed_time() >= _SLEEP_TIME * 1e3
+
+        # timers that don't implement every method fail when they are created rather than when they are used
+        class _IncompleteTimer(_Timer):
+            def start(self) -> None:
+                pass
+
+        with self.assertRaises(TypeError):
+            _IncompleteTimer(torch.device("cpu"))
+
+    def test_cutotune_on_cpu(self) -> None:
+        _add_one.function_cache = {}
+
+        x = torch.randn(16, device=torch.device("cpu"))
+        output = torch.empty_like(x)
+
+        _add_one(x, output, kernel_backend=CutoTuneParameter())
+        self.assert_equal_tensors(output, x + 1, True)
+
+        ((dispatch_key, best_config),) = _add_one.function_cache.items()
+        assert dispatch_key == (x.dtype,)
+        assert best_config.get_key_values() == {"kernel_backend": KernelBackend.triton}
+
+        # winner is persisted and reused after a restart without tuning again
+        _add_one.function_cache = {}
+        cache._CUTOTUNE_CACHE = self.load_cutotune_cache(autosave=True)
+
+        lookup_key = _add_one._get_lookup_key(dispatch_key)
+        persisted_config = cache._CUTOTUNE_CACHE.get_config(_add_one.function_hash, lookup_key)
+        assert persisted_config.get_key_values() == {"kernel_backend": KernelBackend.triton}
+
+        _add_one(x, output, kernel_backend=CutoTuneParameter())
+        assert _add_one.function_cache[dispatch_key] is best_config
+
+    def test_cutotune_with_successive_halving(self) -> None:
+        _sleep.function_cache = {}
+
+        _sleep(torch.randn(16), SLEEP_FACTOR=CutoTuneParameter())
+
+        (best_config,) = _sleep.function_cache.values()
+        assert best_config.get_key_values() == {"SLEEP_FACTOR": 1}
+
+    def test_scalar_triggers_of_different_types_are_kept_apart(self) -> None:
+        @cutotune(
+            configs=[CutoTuneConfig({"BLOCK_SIZE": 1}), CutoTuneConfig({"BLOCK_SIZE": 2})],
+            triggers={"n"},
+            warmup_iterations=0,
+            benchmark_iterations=1,
+        )
+        def _function(n: int | float | bool, BLOCK_SIZE: int | CutoTuneParameter) -> None:
+            return
+
+        # True, 1 and 1.0 are equal and hash the same
+        for n in [True, 1, 1.0]:
+            _function(n, BLOCK_SIZE=CutoTuneParameter())
+
+        assert len(_function.function_cache) == 3
+        assert sorted(_function._get_lookup_key(dispatch_key) for dispatch_key in _function.function_cache) == [
+            "'n = 1'",
+            "'n = 1.0'",
+            "'n = True'",
+        ]
@@ -0,0 +1,29 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import subprocess
+import sys
+
+from .test_commons import TestCommons
+
+
+_CODE = """
+import sys
+
+import cute_kernels
+
+assert "triton" not in sys.modules
+assert "torch._dynamo" not in sys.modules
+assert not any(name.startswith("cute_kernels.kernels.") for name in sys.modules)
+
+cute_kernels.rmsnorm_cute
+assert "cute_kernels.kernels.rmsnorm" in sys.modules
+assert "cute_kernels.kernels.gemm" not in sys.modules
+"""
+
+
+class ImportTest(TestCommons):
+    def test_kernels_are_imported_lazily(self) -> None:
+        # a fresh interpreter is needed since the kernels are already imported by the other tests
+        subprocess.run([sys.executable, "-c", _CODE], check=True)
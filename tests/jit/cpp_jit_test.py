@@ -0,0 +1,197 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import inspect
+import multiprocessing
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from torch.utils.cpp_extension import load as load_cpp_extension
+
+from cute_kernels import jit
+
+from ..test_commons import TestCommons
+
+
+_MODULE_NAME = "build_cache_test"
+
+
+_BINDER_SOURCE = """
+#include <pybind11/pybind11.h>
+
+int multiply_add(int x, int y, int z) { return x * y + z; }
+
+PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) { m.def("multiply_add", &multiply_add); }
+"""
+
+
+_SOURCE = """
+#include <pybind11/pybind11.h>
+#include "header.h"
+
+int add_one(int x) { return x + ONE; }
+
+PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) { m.def("add_one", &add_one); }
+"""
+
+
+def _load_add_one(source_file: str, build_directory: str, cache_directory: str, builds_filename: str) -> None:
+    def _load_cpp_extension(*args, **kwargs):
+        with open(builds_filename, "a") as f:
+            f.write(f"{os.getpid()}\n")
+
+        return load_cpp_extension(*args, **kwargs)
+
+    with (
+        patch.object(jit, "_CPP_JIT_CACHE_DIRECTORY", cache_directory),
+        patch.object(jit, "_load_cpp_extension", _load_cpp_extension),
+    ):
+        add_one = jit._get_cpp_function(
+            function_name="add_one",
+            module_name=_MODULE_NAME,
+            source_files=[source_file],
+            build_directory=build_directory,
+        )
+
+    assert add_one(1) == 2
+
+
+class CppJitBuildCacheTest(TestCommons):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.source_file = os.path.join(self.directory.name, "ops.cpp")
+        self.header_file = os.path.join(self.directory.name, "header.h")
+
+        with open(self.source_file, "w") as f:
+            f.write(_SOURCE)
+
+        with open(self.header_file, "w") as f:
+            f.write("#define ONE 1\n")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_build_hash(self) -> None:
+        include_paths = [self.directory.name]
+        build_hash = jit._get_build_hash([self.source_file], ["-O3"], [], include_paths)
+
+        # headers are only followed inside the package
+        with patch.object(jit, "_PACKAGE_DIRECTORY", os.path.realpath(self.directory.name)):
+            package_build_hash = jit._get_build_hash([self.source_file], ["-O3"], [], include_paths)
+            assert package_build_hash != build_hash
+
+            with open(self.header_file, "w") as f:
+                f.write("#define ONE 2\n")
+
+            assert jit._get_build_hash([self.source_file], ["-O3"], [], include_paths) != package_build_hash
+
+        assert jit._get_build_hash([self.source_file], ["-O2"], [], include_paths) != build_hash
+        assert jit._get_build_hash([self.source_file], ["-O3"], ["-lineinfo"], include_paths) != build_hash
+
+    def test_prebuilt_library_is_loaded_without_compiling(self) -> None:
+        module_name = f"{jit._CPP_MODULE_PREFIX}_{_MODULE_NAME}"
+        cache_directory = os.path.join(self.directory.name, "cache")
+        build_directory = os.path.join(self.directory.name, "build")
+        os.makedirs(build_directory)
+
+        module = load_cpp_extension(
+            module_name,
+            sources=[self.source_file],
+            extra_include_paths=[self.directory.name],
+            build_directory=build_directory,
+        )
+
+        with (
+            patch.object(jit, "_CPP_JIT_CACHE_DIRECTORY", cache_directory),
+            patch.object(jit, "_get_build_hash", return_value="hash"),
+            patch.object(jit, "_load_cpp_extension", side_effect=AssertionError("the compiler should not be invoked")),
+        ):
+            jit._add_library_to_cache(module, jit._get_cached_library_filename(module_name, "hash"))
+            shutil.rmtree(build_directory)
+
+            add_one = jit._get_cpp_function(
+                function_name="add_one",
+                module_name=_MODULE_NAME,
+                source_files=[self.source_file],
+                build_directory=build_directory,
+            )
+
+            assert add_one(1) == 2
+            jit._ALL_COMPILED_MODULES.pop(module_name)
+
+    def test_concurrent_builds_compile_once(self) -> None:
+        cache_directory = os.path.join(self.directory.name, "cache")
+        build_directory = os.path.join(self.directory.name, "build")
+        builds_filename = os.path.join(self.directory.name, "builds.txt")
+
+        # no process group is needed, the processes coordinate through the lock in the cache directory
+        processes = [
+            multiprocessing.Process(
+                target=_load_add_one, args=(self.source_file, build_directory, cache_directory, builds_filename)
+            )
+            for _ in range(4)
+        ]
+
+        for process in processes:
+            process.start()
+
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+
+        with open(builds_filename, "r") as f:
+            assert len(f.readlines()) == 1
+
+        # later jobs load the cached library even if the build directory is gone
+        shutil.rmtree(build_directory)
+        process = multiprocessing.Process(
+            target=_load_add_one, args=(self.source_file, build_directory, cache_directory, builds_filename)
+        )
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+
+        with open(builds_filename, "r") as f:
+            assert len(f.readlines()) == 1
+
+    def test_arguments_are_bound_to_the_signature(self) -> None:
+        source_file = os.path.join(self.directory.name, "binder.cpp")
+        with open(source_file, "w") as f:
+            f.write(_BINDER_SOURCE)
+
+        with (
+            patch.object(jit, "_CPP_JIT_CACHE_DIRECTORY", os.path.join(self.directory.name, "cache")),
+            patch.dict(jit._ALL_CPP_JIT_MODULES),
+        ):
+
+            @jit.cpp_jit(
+                extra_source_files=[source_file], build_directory=os.path.join(self.directory.name, "build"), depth=0
+            )
+            def multiply_add(x: int, y: int, z: int = 1) -> int: ...
+
+            assert multiply_add(2, 3, 4) == 10
+            assert multiply_add(2, z=4, y=3) == 10
+            assert multiply_add(x=2, y=3) == 7
+            assert inspect.signature(multiply_add) == inspect.signature(multiply_add.__wrapped__)
+
+            with self.assertRaises(TypeError):
+                multiply_add(2)
+
+            jit._ALL_COMPILED_MODULES.pop(f"{jit._CPP_MODULE_PREFIX}_jit")
+
+    def test_arguments_can_shadow_generated_names(self) -> None:
+        with (
+            patch.object(jit, "_get_cpp_function", return_value=lambda *args: args),
+            patch.dict(jit._ALL_CPP_JIT_MODULES),
+        ):
+
+            @jit.cpp_jit(build_directory=os.path.join(self.directory.name, "build"), depth=0)
+            def shadowing(cpp_function: int, _cpp_function: int, _run: int = 3) -> tuple[int, int, int]: ...
+
+            assert shadowing(1, 2) == (1, 2, 3)
+            assert shadowing(_run=4, _cpp_function=2, cpp_function=1) == (1, 2, 4)
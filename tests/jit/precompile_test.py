@@ -0,0 +1,83 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import os
+import tempfile
+from unittest.mock import patch
+
+import torch
+
+from cute_kernels import jit, precompile
+
+from ..test_commons import TestCommons
+
+
+_SOURCE = """
+#include <pybind11/pybind11.h>
+
+int add_one(int x) { return x + 1; }
+
+PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) { m.def("add_one", &add_one); }
+"""
+
+
+def _record_call(x: torch.Tensor, filename: str) -> torch.Tensor:
+    with open(filename, "a") as f:
+        f.write(f"{os.getpid()} {x.dtype} {x.size(0)}\n")
+
+    return x * 2
+
+
+class PrecompileTest(TestCommons):
+    def test_ops_are_run_for_every_point(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "calls.txt")
+
+            precompile(
+                ops=[
+                    {
+                        "name": "record_call",
+                        "function": f"{__name__}._record_call",
+                        "backward": True,
+                        "grid": {"num_tokens": [1, 2], "dtype": ["float32", "bfloat16"]},
+                        "arguments": {
+                            "x": {"shape": ["num_tokens", 4], "dtype": "dtype", "requires_grad": True},
+                            "filename": filename,
+                        },
+                    }
+                ],
+                cpp_extensions=False,
+                device=torch.device("cpu"),
+                num_workers=2,
+            )
+
+            with open(filename, "r") as f:
+                calls = sorted(line.split(" ", 1)[1] for line in f.readlines())
+
+            assert calls == [
+                "torch.bfloat16 1\n",
+                "torch.bfloat16 2\n",
+                "torch.float32 1\n",
+                "torch.float32 2\n",
+            ]
+
+    def test_cpp_extensions_are_compiled(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            source_file = os.path.join(directory, "ops.cpp")
+            with open(source_file, "w") as f:
+                f.write(_SOURCE)
+
+            module_name = "precompile_test"
+
+            with (
+                patch.object(jit, "_CPP_JIT_CACHE_DIRECTORY", os.path.join(directory, "cache")),
+                patch.dict(jit._ALL_CPP_JIT_MODULES, {module_name: ([source_file], os.path.join(directory, "build"))}),
+            ):
+                assert module_name in jit.get_cpp_jit_module_names()
+
+                precompile(cpp_extensions=[module_name], device=torch.device("cpu"), num_workers=0)
+
+                module = jit._ALL_COMPILED_MODULES.pop(f"{jit._CPP_MODULE_PREFIX}_{module_name}")
+                assert module.add_one(1) == 2
+                assert os.path.isfile(module.__file__)
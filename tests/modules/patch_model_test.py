@@ -0,0 +1,101 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import torch
+import torch.nn as nn
+from parameterized import parameterized
+
+from cute_kernels import MoE_Torch, MoE_Triton, RMSNorm, TorchCompatibleRNN, patch_model, set_seed
+
+from ..test_commons import TestCommons
+
+
+_SEED = 42
+
+
+def _get_model(hidden_size: int) -> nn.Module:
+    return nn.ModuleDict(
+        {
+            "norm": nn.RMSNorm(hidden_size),
+            "norm_2d": nn.RMSNorm((4, hidden_size)),
+            "rnn": nn.RNN(hidden_size, hidden_size, batch_first=True),
+            "bidirectional_rnn": nn.RNN(hidden_size, hidden_size, bidirectional=True),
+            "gru": nn.GRU(hidden_size, hidden_size),
+            "moe": MoE_Torch(4, 2, hidden_size, 16, nn.GELU(), is_glu=False, add_bias=False, std=0.02),
+            "moe_with_bias": MoE_Torch(4, 2, hidden_size, 16, nn.GELU(), is_glu=False, add_bias=True, std=0.02),
+        }
+    )
+
+
+class PatchModelTest(TestCommons):
+    def test_patch_model(self) -> None:
+        model = _get_model(8)
+        state_dict = model.state_dict(keep_vars=True)
+
+        report = patch_model(model)
+
+        assert [(entry["name"], entry["swapped"]) for entry in report] == [
+            ("norm", True),
+            ("norm_2d", False),
+            ("rnn", True),
+            ("bidirectional_rnn", False),
+            ("gru", False),
+            ("moe", True),
+            ("moe_with_bias", False),
+        ]
+        assert all((entry["reason"] is None) == entry["swapped"] for entry in report)
+
+        assert type(model["norm"]) is RMSNorm and type(model["norm_2d"]) is nn.RMSNorm
+        assert type(model["rnn"]) is TorchCompatibleRNN and type(model["bidirectional_rnn"]) is nn.RNN
+        assert type(model["moe"]) is MoE_Triton and type(model["moe_with_bias"]) is MoE_Torch
+
+        # the parameters are the same tensors so optimizers and tied weights are unaffected
+        patched_state_dict = model.state_dict(keep_vars=True)
+        assert list(patched_state_dict) == list(state_dict)
+        for key, value in state_dict.items():
+            assert patched_state_dict[key] is value
+
+        # patching again finds nothing new to swap
+        assert all(not entry["swapped"] for entry in patch_model(model))
+
+        model = _get_model(8)
+        assert [entry["name"] for entry in patch_model(model, ["rmsnorm"])] == ["norm", "norm_2d"]
+        assert type(model["rnn"]) is nn.RNN
+
+    @parameterized.expand(
+        TestCommons.make_args_matrix(
+            [torch.device("cuda")],
+            [torch.float32],
+            [True, False],  # batch_first
+            ["tanh", "relu"],  # nonlinearity
+            [False, True],  # has_input_state
+        )
+    )
+    def test_patched_modules_match_torch(
+        self, device: torch.device, dtype: torch.dtype, batch_first: bool, nonlinearity: str, has_input_state: bool
+    ) -> None:
+        set_seed(_SEED)
+
+        hidden_size = 64
+        model = nn.ModuleDict(
+            {
+                "norm": nn.RMSNorm(hidden_size),
+                "rnn": nn.RNN(hidden_size, hidden_size, nonlinearity=nonlinearity, batch_first=batch_first),
+            }
+        ).to(device=device, dtype=dtype)
+
+        x = torch.randn(4, 32, hidden_size, device=device, dtype=dtype)
+        input_state = torch.randn(1, 4, hidden_size, device=device, dtype=dtype) if has_input_state else None
+
+        y_expected = model["norm"](x)
+        z_expected, state_expected = model["rnn"](y_expected, input_state)
+
+        patch_model(model)
+
+        y_kernel = model["norm"](x)
+        z_kernel, state_kernel = model["rnn"](y_kernel, input_state)
+
+        self.assert_equal_tensors(y_kernel, y_expected, False, atol_float32=1e-5, rtol_float32=0)
+        self.assert_equal_tensors(z_kernel, z_expected, False, atol_float32=4e-5, rtol_float32=0)
+        self.assert_equal_tensors(state_kernel, state_expected, False, atol_float32=4e-5, rtol_float32=0)
@@ -3,6 +3,7 @@
 # **************************************************
 
 import random
+import tempfile
 from itertools import product
 from typing import Any
 from unittest import TestCase
@@ -12,6 +13,8 @@ import torch.nn as nn
 from torch.testing import assert_close
 
 from cute_kernels import init_inductor
+from cute_kernels.cutotune import cache
+from cute_kernels.cutotune.cache import _CutoTuneCache
 
 
 class TestCommons(TestCase):
@@ -93,3 +96,25 @@ class TestCommons(TestCase):
         x_clone = x.clone().detach().requires_grad_()
 
         return x, x_clone
+
+
+class CutoTuneCacheTestCommons(TestCommons):
+    """points the global cutotune cache to a temporary directory for every test"""
+
+    namespace = "test"
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.directory = tempfile.TemporaryDirectory()
+        cache._CUTOTUNE_CACHE = self.load_cutotune_cache(autosave=True)
+
+    def tearDown(self) -> None:
+        cache._CUTOTUNE_CACHE = None
+        self.directory.cleanup()
+
+    def load_cutotune_cache(self, autosave: bool = False) -> _CutoTuneCache:
+        # tuned configs are written to disk right away so that a freshly loaded cache sees them
+        return _CutoTuneCache(
+            directory=self.directory.name, namespace=self.namespace, load=True, autosave=autosave, save_interval=0
+        )
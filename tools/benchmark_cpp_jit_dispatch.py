@@ -0,0 +1,88 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import inspect
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from tabulate import tabulate
+
+from cute_kernels import jit
+
+
+n = 1000000
+
+headers = ["call", "direct call usec", "cpp_jit call usec", "previous cpp_jit call usec"]
+table = []
+
+source = """
+#include <pybind11/pybind11.h>
+
+int add_scalar(int x, int y, int output, int BLOCK_SIZE) { return x + y; }
+
+PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) { m.def("add_scalar", &add_scalar); }
+"""
+
+
+def get_previous_wrapper(function, cpp_function):
+    # this is the previous per call marshalling of cpp_jit
+    args_spec = inspect.getfullargspec(function)
+    state = [None]
+
+    def _run(*args, **kwargs):
+        if state[0] is None:
+            state[0] = cpp_function
+
+        full_args = []
+        full_args.extend(args)
+        for variable_name in args_spec.args[len(args) :]:
+            full_args.append(kwargs[variable_name])
+
+        return state[0](*full_args)
+
+    return _run
+
+
+def time_calls(function, args: tuple, kwargs: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        function(*args, **kwargs)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+with tempfile.TemporaryDirectory() as directory:
+    source_file = os.path.join(directory, "add_scalar.cpp")
+    with open(source_file, "w") as f:
+        f.write(source)
+
+    with patch.object(jit, "_CPP_JIT_CACHE_DIRECTORY", os.path.join(directory, "cache")):
+
+        @jit.cpp_jit(extra_source_files=[source_file], build_directory=os.path.join(directory, "build"), depth=0)
+        def add_scalar(x: int, y: int, output: int, BLOCK_SIZE: int) -> int: ...
+
+        # compile outside of the timed region
+        add_scalar(1, 2, 0, 1024)
+
+    # depth=0 names the module after the directory of this script
+    cpp_function = jit._ALL_COMPILED_MODULES[f"{jit._CPP_MODULE_PREFIX}_tools"].add_scalar
+    previous_add_scalar = get_previous_wrapper(add_scalar.__wrapped__, cpp_function)
+
+    for name, args, kwargs in [
+        ("positional", (1, 2, 0, 1024), {}),
+        ("mixed", (1, 2), {"output": 0, "BLOCK_SIZE": 1024}),
+        ("keyword", (), {"x": 1, "y": 2, "output": 0, "BLOCK_SIZE": 1024}),
+    ]:
+        table.append(
+            [
+                name,
+                time_calls(cpp_function, (1, 2, 0, 1024), {}),
+                time_calls(add_scalar, args, kwargs),
+                time_calls(previous_add_scalar, args, kwargs),
+            ]
+        )
+
+
+print(tabulate(table, headers=headers))
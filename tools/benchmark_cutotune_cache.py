@@ -0,0 +1,79 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import os
+import tempfile
+import time
+
+import yaml
+from tabulate import tabulate
+
+from cute_kernels import CutoTuneConfig, KernelBackend
+from cute_kernels.cutotune.cache import _CutoTuneCache, _decode_value, _encode_value
+
+
+n = 3
+namespace = "benchmark"
+
+headers = ["functions", "entries per function", "yaml (eager) sec", "jsonl (lazy) sec"]
+table = []
+
+
+def load_yaml(filename: str) -> dict:
+    # this is the previous startup path: parse the whole file and build a config for every entry
+    with open(filename, "r") as f:
+        cache = yaml.load(f, yaml.SafeLoader)
+
+    return {
+        function_hash: {
+            lookup_key: CutoTuneConfig({key: _decode_value(value) for key, value in config.items()})
+            for lookup_key, config in function_cache.items()
+        }
+        for function_hash, function_cache in cache.items()
+    }
+
+
+def load_jsonl(directory: str, function_hash: str, lookup_key: str) -> CutoTuneConfig:
+    cache = _CutoTuneCache(directory=directory, namespace=namespace, load=True, autosave=False)
+    return cache.get_config(function_hash=function_hash, lookup_key=lookup_key)
+
+
+for num_functions, num_entries in [(1, 1000), (10, 100), (10, 1000)]:
+    with tempfile.TemporaryDirectory() as directory:
+        cache = _CutoTuneCache(directory=directory, namespace=namespace, load=False, autosave=False)
+        yaml_cache = {}
+
+        for i in range(num_functions):
+            function_hash = f"kernels/function_{i}/__init__.py->_forward"
+            yaml_cache[function_hash] = {}
+
+            for j in range(num_entries):
+                lookup_key = f"'x.info = (torch.bfloat16, torch.Size([{j}, 4096]), (4096, 1))'"
+                config = CutoTuneConfig({"kernel_backend": KernelBackend.triton, "BLOCK_SIZE": 1024})
+
+                cache.add_config(function_hash=function_hash, lookup_key=lookup_key, config=config)
+                yaml_cache[function_hash][lookup_key] = {
+                    key: _encode_value(value) for key, value in config.get_key_values().items()
+                }
+
+        cache.save()
+
+        yaml_filename = os.path.join(directory, "cache.yml")
+        with open(yaml_filename, "w") as f:
+            yaml.dump(yaml_cache, f)
+
+        start = time.perf_counter()
+        for _ in range(n):
+            load_yaml(yaml_filename)
+        yaml_time = (time.perf_counter() - start) / n
+
+        start = time.perf_counter()
+        for _ in range(n):
+            load_jsonl(directory, function_hash, lookup_key)
+        jsonl_time = (time.perf_counter() - start) / n
+
+        table.append([num_functions, num_entries, yaml_time, jsonl_time])
+
+
+print(tabulate(table, headers=headers))
@@ -0,0 +1,52 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import tempfile
+import time
+
+import torch
+from tabulate import tabulate
+
+from cute_kernels import CutoTuneConfig, CutoTuneParameter, KernelBackend, cutotune
+from cute_kernels.cutotune import cache
+from cute_kernels.cutotune.cache import _CutoTuneCache
+
+
+n = 100000
+
+headers = ["triggers", "direct call usec", "cutotune call usec", "overhead usec"]
+table = []
+
+
+def noop(x: torch.Tensor, y: float, output: torch.Tensor, kernel_backend: KernelBackend | CutoTuneParameter) -> None:
+    return
+
+
+configs = [CutoTuneConfig({"kernel_backend": KernelBackend.triton}), CutoTuneConfig({"kernel_backend": "cuda"})]
+
+x = torch.randn(16)
+output = torch.empty_like(x)
+
+with tempfile.TemporaryDirectory() as directory:
+    cache._CUTOTUNE_CACHE = _CutoTuneCache(directory=directory, namespace="benchmark", load=False, autosave=False)
+
+    for triggers in [set(), {"x.dtype"}, {"x.dtype", "y"}, {"x"}, {"x.dtype", "x.size(0)", "output.stride()"}]:
+        function = cutotune(configs=configs, triggers=triggers, warmup_iterations=0, benchmark_iterations=1)(noop)
+        # tune once outside of the timed region
+        function(x, 1, output, kernel_backend=CutoTuneParameter())
+
+        start = time.perf_counter()
+        for _ in range(n):
+            noop(x=x, y=1, output=output, kernel_backend=KernelBackend.triton)
+        direct_time = (time.perf_counter() - start) / n * 1e6
+
+        start = time.perf_counter()
+        for _ in range(n):
+            function(x=x, y=1, output=output, kernel_backend=CutoTuneParameter())
+        cutotune_time = (time.perf_counter() - start) / n * 1e6
+
+        table.append([", ".join(sorted(triggers)), direct_time, cutotune_time, cutotune_time - direct_time])
+
+
+print(tabulate(table, headers=headers))
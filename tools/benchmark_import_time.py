@@ -0,0 +1,36 @@
+# **************************************************
+# Copyright (c) 2025, Mayank Mishra
+# **************************************************
+
+import statistics
+import subprocess
+import sys
+
+from tabulate import tabulate
+
+
+n = 5
+
+# every statement runs in a fresh interpreter so that nothing is already imported
+statements = [
+    ("import torch", "import torch"),
+    ("import cute_kernels", "import cute_kernels"),
+    ("first kernel access", "import cute_kernels; cute_kernels.rmsnorm_cute"),
+    ("all kernels", "from cute_kernels.kernels import import_all_kernels; import_all_kernels()"),
+]
+
+headers = ["statement", "median sec", "min sec"]
+table = []
+
+
+def run(statement: str) -> float:
+    code = f"import time\nstart = time.perf_counter()\n{statement}\nprint(time.perf_counter() - start)"
+    return float(subprocess.check_output([sys.executable, "-c", code], text=True).strip().splitlines()[-1])
+
+
+for name, statement in statements:
+    times = [run(statement) for _ in range(n)]
+    table.append([name, statistics.median(times), min(times)])
+
+
+print(tabulate(table, headers=headers))